@@ -9,6 +9,15 @@ Features:
 - Conditional requests: uses ETag/Last-Modified from ignored local
   `references/refresh-metadata.json`
 - Optional TTL: `--max-age-sec N` skips network refresh when the last refresh is recent
+- Concurrent fetches: the docs page, the gist API call and truncated gist files
+  download in parallel under one `--total-timeout-sec` deadline
+- Cheatsheet freshness: the docs sha256 (re-hashed only when the docs stat
+  changes) and `CHEATSHEET_GENERATOR` are recorded, and an unchanged pair skips
+  extraction and rendering
+- Per-file cache: `examples/_gist-index.json` records each file's gist size,
+  raw_url, sha256 and raw ETag, so only changed truncated files are downloaded
+- Keep-alive connection pool per host with gzip (and br, when `brotli` is
+  importable) response encoding
 - Avoids leaving `__pycache__` artifacts in skill directories
 """
 
@@ -20,24 +29,45 @@ import sys
 sys.dont_write_bytecode = True
 
 import argparse
-import html
+import gzip
+import hashlib
+import html.parser
+import http.client
 import json
 import os
 import re
+import ssl
+import threading
+import time
 import uuid
 import urllib.error
+import urllib.parse
 import urllib.request
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # Optional: br is only advertised when it can be decoded.
+    brotli = None
 
 DEFAULT_DOCS_URL = "https://docs.deckset.com/markdownDocumentation.html"
 DEFAULT_GIST_ID = "69c36bcf40e23f7ef5c82a9c63983a13"
+DEFAULT_GITHUB_API_URL = "https://api.github.com"
+DEFAULT_TOTAL_TIMEOUT_SEC = 60
+FETCH_WORKERS = 8
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
 
 DOCS_CACHE_FILENAME = "deckset-markdownDocumentation.html"
 CHEATSHEET_FILENAME = "deckset-cheatsheet.md"
 METADATA_FILENAME = "refresh-metadata.json"
+# Bump whenever build_cheatsheet output changes for the same docs.
+CHEATSHEET_GENERATOR = "deckset-cheatsheet/2"
 
 USER_AGENT = "deckset-skill-refresh/1.1"
 GITHUB_ACCEPT = "application/vnd.github+json"
@@ -51,6 +81,17 @@ class FetchResult:
     ok: bool
 
 
+@dataclass
+class GistFile:
+    filename: str
+    size: int | None
+    raw_url: str | None
+    etag: str | None = None
+    data: bytes | None = None
+    cached: bytes | None = None
+    future: Future | None = None
+
+
 def now_utc() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
@@ -97,7 +138,7 @@ def header_get(headers: dict[str, str], name: str) -> str | None:
 
 
 def http_get(
-    url: str, timeout_sec: int, headers: dict[str, str]
+    url: str, timeout_sec: float, headers: dict[str, str]
 ) -> tuple[int, bytes, dict[str, str]]:
     req = urllib.request.Request(url, headers=headers)
     try:
@@ -113,6 +154,197 @@ def http_get(
         raise
 
 
+def accept_encoding() -> str:
+    return "gzip, br" if brotli is not None else "gzip"
+
+
+def decode_body(body: bytes, encoding: str | None) -> bytes:
+    encoding = (encoding or "identity").strip().lower()
+    if encoding in ("", "identity"):
+        return body
+    if encoding in ("gzip", "x-gzip"):
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    if encoding == "br" and brotli is not None:
+        return brotli.decompress(body)
+    raise RuntimeError(f"unsupported Content-Encoding: {encoding}")
+
+
+class HTTPPool:
+    """Keep-alive HTTP/1.1 connections reused per (scheme, host, port).
+
+    Concurrent requests to one host each check out their own connection and
+    return it once the response is fully read, so a refresh opens at most one
+    connection per host per concurrent request instead of one per URL.
+    Requests that must go through a configured proxy use `http_get`.
+    """
+
+    def __init__(self) -> None:
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._context = ssl.create_default_context()
+        self.opened = 0
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    def _checkout(
+        self, key: tuple[str, str, int], timeout_sec: float
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+            if conn is None:
+                self.opened += 1
+        if conn is not None:
+            conn.timeout = timeout_sec
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout_sec)
+            return conn, True
+        scheme, host, port = key
+        if scheme == "https":
+            return (
+                http.client.HTTPSConnection(
+                    host, port, timeout=timeout_sec, context=self._context
+                ),
+                False,
+            )
+        return http.client.HTTPConnection(host, port, timeout=timeout_sec), False
+
+    def _checkin(
+        self, key: tuple[str, str, int], conn: http.client.HTTPConnection
+    ) -> None:
+        with self._lock:
+            self._idle.setdefault(key, []).append(conn)
+
+    def _request(
+        self, url: str, timeout_sec: float, headers: dict[str, str]
+    ) -> tuple[int, bytes, dict[str, str]]:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise RuntimeError(f"unsupported URL: {url}")
+        key = (
+            parts.scheme,
+            parts.hostname,
+            parts.port or (443 if parts.scheme == "https" else 80),
+        )
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        request_headers = {"Accept-Encoding": accept_encoding(), **headers}
+        for attempt in range(2):
+            conn, reused = self._checkout(key, timeout_sec)
+            try:
+                conn.request("GET", target, headers=request_headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (
+                http.client.HTTPException,
+                ssl.SSLError,
+                ConnectionResetError,
+                BrokenPipeError,
+            ):
+                conn.close()
+                # The server may drop an idle keep-alive connection, which
+                # surfaces as a reset, a bad status line, an incomplete read,
+                # or a TLS EOF; GET is safe to retry once on a fresh one.
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            resp_headers = {k: v for k, v in resp.getheaders()}
+            if resp.status == 304:
+                return 304, b"", resp_headers
+            return (
+                resp.status,
+                decode_body(body, header_get(resp_headers, "Content-Encoding")),
+                resp_headers,
+            )
+        raise RuntimeError(f"connection failed for {url}")
+
+    def get(
+        self, url: str, timeout_sec: float, headers: dict[str, str]
+    ) -> tuple[int, bytes, dict[str, str]]:
+        request_headers = dict(headers)
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            proxies = urllib.request.getproxies()
+            if parts.scheme in proxies and not urllib.request.proxy_bypass(
+                parts.hostname or ""
+            ):
+                return http_get(url, timeout_sec, request_headers)
+            status, body, resp_headers = self._request(url, timeout_sec, request_headers)
+            location = header_get(resp_headers, "Location")
+            if status not in REDIRECT_STATUSES or not location:
+                return status, body, resp_headers
+            target = urllib.parse.urljoin(url, location)
+            if urllib.parse.urlsplit(target).netloc != parts.netloc:
+                # Like urllib, never forward credentials to another host.
+                request_headers.pop("Authorization", None)
+            url = target
+        raise RuntimeError(f"too many redirects for {url}")
+
+
+class FetchEngine:
+    """Shared thread pool for refresh requests under one overall deadline.
+
+    Each request's socket timeout is capped by the time left, and a request
+    started after the deadline fails at once, so every fetch settles (and
+    falls back to cache) shortly after the deadline.
+    """
+
+    def __init__(self, total_timeout_sec: float, max_workers: int = FETCH_WORKERS):
+        self.deadline = time.monotonic() + total_timeout_sec
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="deckset-fetch"
+        )
+        self.client = HTTPPool()
+
+    def __enter__(self) -> FetchEngine:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.client.close()
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        return self._pool.submit(fn, *args, **kwargs)
+
+    def get(
+        self, url: str, timeout_sec: int, headers: dict[str, str]
+    ) -> tuple[int, bytes, dict[str, str]]:
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise TimeoutError(f"refresh deadline exceeded before {url}")
+        return self.client.get(url, min(timeout_sec, remaining), headers)
+
+    def submit_get(
+        self, url: str, timeout_sec: int, headers: dict[str, str]
+    ) -> Future:
+        return self.submit(self.get, url, timeout_sec, headers)
+
+    def result(self, future: Future) -> Any:
+        remaining = self.remaining()
+        if remaining <= 0 and not future.done():
+            raise TimeoutError("refresh deadline exceeded")
+        return future.result(timeout=max(remaining, 0))
+
+
 def sanitize_filename(name: str) -> str:
     base = name.strip().replace("\\", "/").split("/")[-1]
     base = re.sub(r"[^A-Za-z0-9._-]", "-", base)
@@ -140,6 +372,17 @@ def atomic_write_if_changed(path: Path, data: bytes) -> bool:
     return True
 
 
+def cached_example(path: Path, entry: Any) -> bytes | None:
+    """Return a cached example's bytes if they still hash to its index entry."""
+    if not isinstance(entry, dict) or not isinstance(entry.get("sha256"), str):
+        return None
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    return data if hashlib.sha256(data).hexdigest() == entry["sha256"] else None
+
+
 def nonempty_file(path: Path) -> bool:
     return path.exists() and path.is_file() and path.stat().st_size > 0
 
@@ -191,6 +434,14 @@ def make_headers(
     return headers
 
 
+def prior_validators(prior: dict[str, Any], source: str) -> dict[str, str | None]:
+    validators: dict[str, str | None] = {}
+    for key in ("etag", "last_modified"):
+        value = prior.get(f"{source}_{key}")
+        validators[key] = value if isinstance(value, str) else None
+    return validators
+
+
 def fetch_docs(
     docs_url: str,
     docs_path: Path,
@@ -198,18 +449,9 @@ def fetch_docs(
     errors: list[str],
     prior: dict[str, Any],
     max_age_sec: int,
+    engine: FetchEngine,
 ) -> tuple[FetchResult, dict[str, Any]]:
-    meta: dict[str, Any] = {
-        "http_status": None,
-        "etag": prior.get("docs_etag")
-        if isinstance(prior.get("docs_etag"), str)
-        else None,
-        "last_modified": (
-            prior.get("docs_last_modified")
-            if isinstance(prior.get("docs_last_modified"), str)
-            else None
-        ),
-    }
+    meta: dict[str, Any] = {"http_status": None, **prior_validators(prior, "docs")}
 
     if within_max_age(prior, max_age_sec) and nonempty_file(docs_path):
         return (
@@ -228,14 +470,17 @@ def fetch_docs(
         conditional["If-Modified-Since"] = meta["last_modified"]
 
     try:
-        status, body, hdrs = http_get(
+        status, body, hdrs = engine.get(
             docs_url, timeout_sec, make_headers(conditional=conditional)
         )
         meta["http_status"] = status
-        meta["etag"] = header_get(hdrs, "ETag") or meta["etag"]
-        meta["last_modified"] = (
-            header_get(hdrs, "Last-Modified") or meta["last_modified"]
-        )
+        # HTTPPool returns error responses instead of raising; their
+        # validators do not describe the cached body.
+        if status == 304 or 200 <= status < 300:
+            meta["etag"] = header_get(hdrs, "ETag") or meta["etag"]
+            meta["last_modified"] = (
+                header_get(hdrs, "Last-Modified") or meta["last_modified"]
+            )
 
         if status == 304:
             if nonempty_file(docs_path):
@@ -262,7 +507,9 @@ def fetch_docs(
             source="network", message=f"fetched {docs_url}", ok=True
         ), meta
     except Exception as exc:  # noqa: BLE001
-        meta["http_status"] = None
+        # Validators from a failed or unusable response would let the next
+        # run's conditional request 304 against a cache they never described.
+        meta.update(http_status=None, **prior_validators(prior, "docs"))
         if nonempty_file(docs_path):
             errors.append(f"docs network fetch failed, used cache: {exc}")
             return FetchResult(
@@ -280,20 +527,12 @@ def fetch_gist_examples(
     prior: dict[str, Any],
     max_age_sec: int,
     github_token: str | None,
+    engine: FetchEngine,
+    github_api_url: str = DEFAULT_GITHUB_API_URL,
 ) -> tuple[FetchResult, dict[str, Any]]:
-    api_url = f"https://api.github.com/gists/{gist_id}"
+    api_url = f"{github_api_url.rstrip('/')}/gists/{gist_id}"
     index_path = examples_dir / "_gist-index.json"
-    meta: dict[str, Any] = {
-        "http_status": None,
-        "etag": prior.get("gist_etag")
-        if isinstance(prior.get("gist_etag"), str)
-        else None,
-        "last_modified": (
-            prior.get("gist_last_modified")
-            if isinstance(prior.get("gist_last_modified"), str)
-            else None
-        ),
-    }
+    meta: dict[str, Any] = {"http_status": None, **prior_validators(prior, "gist")}
 
     if within_max_age(prior, max_age_sec) and has_examples_cache(examples_dir):
         return (
@@ -312,7 +551,7 @@ def fetch_gist_examples(
         conditional["If-Modified-Since"] = meta["last_modified"]
 
     try:
-        status, body, hdrs = http_get(
+        status, body, hdrs = engine.get(
             api_url,
             timeout_sec,
             make_headers(
@@ -320,10 +559,11 @@ def fetch_gist_examples(
             ),
         )
         meta["http_status"] = status
-        meta["etag"] = header_get(hdrs, "ETag") or meta["etag"]
-        meta["last_modified"] = (
-            header_get(hdrs, "Last-Modified") or meta["last_modified"]
-        )
+        if status == 304 or 200 <= status < 300:
+            meta["etag"] = header_get(hdrs, "ETag") or meta["etag"]
+            meta["last_modified"] = (
+                header_get(hdrs, "Last-Modified") or meta["last_modified"]
+            )
 
         if status == 304:
             if has_examples_cache(examples_dir):
@@ -353,33 +593,82 @@ def fetch_gist_examples(
         if not isinstance(files, dict) or not files:
             raise RuntimeError("gist files list missing or empty")
 
-        examples_dir.mkdir(parents=True, exist_ok=True)
-        written: list[str] = []
+        prior_files = load_json_dict(index_path).get("file_metadata")
+        if not isinstance(prior_files, dict):
+            prior_files = {}
         raw_headers = make_headers(token=github_token)
-
+        # A truncated file whose raw_url (which names the blob revision) and
+        # size match the index, and whose cached bytes still match its sha256,
+        # needs no download. Every other raw download starts before any is
+        # collected.
+        gist_files: list[GistFile] = []
+        downloaded = reused = 0
         for file_info in files.values():
             if not isinstance(file_info, dict):
                 continue
             filename = sanitize_filename(str(file_info.get("filename", "")))
-            out_path = examples_dir / filename
-
+            size = file_info.get("size")
+            raw_url = file_info.get("raw_url")
+            gist_file = GistFile(
+                filename=filename,
+                size=size if isinstance(size, int) else None,
+                raw_url=raw_url if isinstance(raw_url, str) and raw_url else None,
+            )
             truncated = file_info.get("truncated") is True
             content = file_info.get("content")
             if isinstance(content, str) and not truncated:
-                data = content.encode("utf-8")
-            else:
-                raw_url = file_info.get("raw_url")
-                if not isinstance(raw_url, str) or not raw_url:
+                gist_file.data = content.encode("utf-8")
+                gist_files.append(gist_file)
+                continue
+            if gist_file.raw_url is None:
+                continue
+            entry = prior_files.get(filename)
+            gist_file.cached = cached_example(examples_dir / filename, entry)
+            if gist_file.cached is not None and entry.get("raw_url") == raw_url:
+                etag = entry.get("etag")
+                gist_file.etag = etag if isinstance(etag, str) else None
+                if gist_file.size is not None and entry.get("size") == gist_file.size:
+                    gist_file.data = gist_file.cached
+                    gist_files.append(gist_file)
+                    reused += 1
                     continue
-                raw_status, raw_body, _ = http_get(raw_url, timeout_sec, raw_headers)
-                if raw_status < 200 or raw_status >= 300:
-                    raise RuntimeError(f"unexpected status {raw_status} for {raw_url}")
-                if not raw_body:
-                    raise RuntimeError(f"empty response body for {raw_url}")
-                data = raw_body
+            headers = raw_headers
+            if gist_file.etag:
+                headers = {**raw_headers, "If-None-Match": gist_file.etag}
+            gist_file.future = engine.submit_get(gist_file.raw_url, timeout_sec, headers)
+            gist_files.append(gist_file)
+
+        for gist_file in gist_files:
+            if gist_file.future is None:
+                continue
+            raw_url = gist_file.raw_url
+            raw_status, raw_body, raw_hdrs = engine.result(gist_file.future)
+            if raw_status == 304 and gist_file.cached is not None:
+                gist_file.data = gist_file.cached
+                reused += 1
+                continue
+            if raw_status < 200 or raw_status >= 300:
+                raise RuntimeError(f"unexpected status {raw_status} for {raw_url}")
+            if not raw_body:
+                raise RuntimeError(f"empty response body for {raw_url}")
+            gist_file.data = raw_body
+            gist_file.etag = header_get(raw_hdrs, "ETag")
+            downloaded += 1
 
-            atomic_write_if_changed(out_path, data)
-            written.append(filename)
+        examples_dir.mkdir(parents=True, exist_ok=True)
+        written: list[str] = []
+        file_metadata: dict[str, dict[str, Any]] = {}
+        for gist_file in gist_files:
+            data = gist_file.data
+            assert data is not None
+            atomic_write_if_changed(examples_dir / gist_file.filename, data)
+            written.append(gist_file.filename)
+            file_metadata[gist_file.filename] = {
+                "size": gist_file.size if gist_file.size is not None else len(data),
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "raw_url": gist_file.raw_url,
+                "etag": gist_file.etag,
+            }
 
         if not written:
             raise RuntimeError("no gist files with content were available")
@@ -394,6 +683,7 @@ def fetch_gist_examples(
             "gist_id": gist_id,
             "refreshed_at": now_utc(),
             "files": sorted(written),
+            "file_metadata": dict(sorted(file_metadata.items())),
             "source": api_url,
         }
         index_data = json.dumps(index_payload, indent=2).encode("utf-8")
@@ -403,10 +693,15 @@ def fetch_gist_examples(
         ):
             atomic_write_if_changed(index_path, index_data)
         return FetchResult(
-            source="network", message=f"fetched gist {gist_id}", ok=True
+            source="network",
+            message=(
+                f"fetched gist {gist_id} "
+                f"({downloaded} raw files downloaded, {reused} reused)"
+            ),
+            ok=True,
         ), meta
     except Exception as exc:  # noqa: BLE001
-        meta["http_status"] = None
+        meta.update(http_status=None, **prior_validators(prior, "gist"))
         if has_examples_cache(examples_dir):
             errors.append(f"gist network fetch failed, used cache: {exc}")
             return (
@@ -424,66 +719,114 @@ def fetch_gist_examples(
         )
 
 
-def extract_code_lines_from_html(html_text: str) -> list[str]:
-    code_tag_re = re.compile(r"<code[^>]*>(.*?)</code>", re.IGNORECASE | re.DOTALL)
-    strip_tags_re = re.compile(r"<[^>]+>")
-    candidates: list[str] = []
+DOCS_READ_CHUNK_CHARS = 64 * 1024
 
-    for raw in code_tag_re.findall(html_text):
-        text = html.unescape(raw)
-        text = strip_tags_re.sub("", text)
-        text = text.replace("\r\n", "\n")
-        for line in text.split("\n"):
-            line = line.strip()
-            if line:
-                candidates.append(line)
 
-    seen: set[str] = set()
-    out: list[str] = []
-    for line in candidates:
-        if line not in seen:
-            seen.add(line)
-            out.append(line)
-    return out
+class CodeDirectiveIndex(html.parser.HTMLParser):
+    """Index the first `<code>` line for each wanted directive in one pass.
+
+    Each prefix ends with the directive's only colon, so a line matches a
+    prefix exactly when the text up to its first colon equals the prefix;
+    one dict lookup per line replaces a scan over every prefix. Only the
+    current `<code>` element's text is buffered.
+    """
+
+    def __init__(self, prefixes: Iterable[str]) -> None:
+        super().__init__(convert_charrefs=True)
+        self.wanted = set(prefixes)
+        self.first: dict[str, str] = {}
+        self._depth = 0
+        self._text: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "code":
+            self._depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "code" and self._depth:
+            self._depth -= 1
+            if not self._depth:
+                self._index("".join(self._text))
+                self._text.clear()
+
+    def handle_data(self, data: str) -> None:
+        if self._depth:
+            self._text.append(data)
+
+    def _index(self, text: str) -> None:
+        for line in text.replace("\r\n", "\n").split("\n"):
+            line = line.strip()
+            colon = line.find(":")
+            if colon < 0:
+                continue
+            prefix = line[: colon + 1]
+            if prefix in self.wanted and prefix not in self.first:
+                self.first[prefix] = line
+
+    def done(self) -> bool:
+        return len(self.first) == len(self.wanted)
+
+
+def index_code_directives(docs_path: Path, prefixes: Iterable[str]) -> dict[str, str]:
+    """Stream the docs HTML and map each prefix to its first `<code>` line."""
+    parser = CodeDirectiveIndex(prefixes)
+    with docs_path.open(encoding="utf-8", errors="replace") as handle:
+        while not parser.done() and (chunk := handle.read(DOCS_READ_CHUNK_CHARS)):
+            parser.feed(chunk)
+    parser.close()
+    return parser.first
+
+
+CHEATSHEET_DIRECTIVES = {
+    "theme:": "theme: Fira",
+    "footer:": "footer: Your footer goes here",
+    "slidenumbers:": "slidenumbers: true",
+    "autoscale:": "autoscale: true",
+    "background-image:": "background-image: image.jpg",
+    "build-lists:": "build-lists: notFirst",
+    "fit-header:": "fit-header: #, ##",
+    "paragraphs-as-presenter-notes:": "paragraphs-as-presenter-notes: true",
+    "slide-transition:": "slide-transition: fade(0.3)",
+    "[.text:": "[.text: alignment(center)]",
+    "[.background-color:": "[.background-color: #FF0000]",
+    "[.build-lists:": "[.build-lists: true]",
+    "[.footer:": "[.footer: A different footer]",
+    "[.presenter-notes:": (
+        "[.presenter-notes: #333333, alignment(left), text-scale(0.9), Helvetica]"
+    ),
+    "[.slide-transition:": "[.slide-transition: false]",
+    "[.code-highlight:": "[.code-highlight: 2, 6-8]",
+}
 
 
 def build_cheatsheet(docs_url: str, generated_at: str, docs_path: Path | None) -> str:
-    docs_lines: list[str] = []
+    directives: dict[str, str] = {}
     if docs_path and nonempty_file(docs_path):
         try:
-            docs_text = docs_path.read_text(encoding="utf-8", errors="replace")
-            docs_lines = extract_code_lines_from_html(docs_text)
+            directives = index_code_directives(docs_path, CHEATSHEET_DIRECTIVES)
         except Exception:  # noqa: BLE001
-            docs_lines = []
-
-    def pick(prefix: str, fallback: str) -> str:
-        for line in docs_lines:
-            if line.startswith(prefix):
-                return line
-        return fallback
-
-    theme_line = pick("theme:", "theme: Fira")
-    footer_line = pick("footer:", "footer: Your footer goes here")
-    slidenumbers_line = pick("slidenumbers:", "slidenumbers: true")
-    autoscale_line = pick("autoscale:", "autoscale: true")
-    background_image_line = pick("background-image:", "background-image: image.jpg")
-    build_lists_line = pick("build-lists:", "build-lists: notFirst")
-    fit_header_line = pick("fit-header:", "fit-header: #, ##")
-    paragraphs_notes_line = pick(
-        "paragraphs-as-presenter-notes:", "paragraphs-as-presenter-notes: true"
-    )
-    slide_transition_line = pick("slide-transition:", "slide-transition: fade(0.3)")
-
-    per_text = pick("[.text:", "[.text: alignment(center)]")
-    per_bg = pick("[.background-color:", "[.background-color: #FF0000]")
-    per_build = pick("[.build-lists:", "[.build-lists: true]")
-    per_footer = pick("[.footer:", "[.footer: A different footer]")
-    per_presenter_notes = pick(
-        "[.presenter-notes:",
-        "[.presenter-notes: #333333, alignment(left), text-scale(0.9), Helvetica]",
-    )
-    per_slide_transition = pick("[.slide-transition:", "[.slide-transition: false]")
-    code_highlight = pick("[.code-highlight:", "[.code-highlight: 2, 6-8]")
+            directives = {}
+
+    def pick(prefix: str) -> str:
+        return directives.get(prefix, CHEATSHEET_DIRECTIVES[prefix])
+
+    theme_line = pick("theme:")
+    footer_line = pick("footer:")
+    slidenumbers_line = pick("slidenumbers:")
+    autoscale_line = pick("autoscale:")
+    background_image_line = pick("background-image:")
+    build_lists_line = pick("build-lists:")
+    fit_header_line = pick("fit-header:")
+    paragraphs_notes_line = pick("paragraphs-as-presenter-notes:")
+    slide_transition_line = pick("slide-transition:")
+
+    per_text = pick("[.text:")
+    per_bg = pick("[.background-color:")
+    per_build = pick("[.build-lists:")
+    per_footer = pick("[.footer:")
+    per_presenter_notes = pick("[.presenter-notes:")
+    per_slide_transition = pick("[.slide-transition:")
+    code_highlight = pick("[.code-highlight:")
 
     lines: list[str] = [
         f"<!-- Generated by scripts/refresh_sources.py; generated_at={generated_at}; docs_url={docs_url} -->",
@@ -553,42 +896,134 @@ def same_cheatsheet_ignoring_generated_at(existing: str, generated: str) -> bool
     )
 
 
+def stat_key(path: Path) -> list[int] | None:
+    try:
+        info = path.stat()
+    except OSError:
+        return None
+    if info.st_size == 0:
+        return None
+    return [info.st_ino, info.st_size, info.st_mtime_ns]
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cheatsheet_inputs(
+    docs_url: str, docs_path: Path, prior_inputs: Any
+) -> dict[str, Any]:
+    """Describe what the cheatsheet is derived from.
+
+    The docs are hashed only when their stat differs from the recorded one,
+    so an unchanged docs cache costs a stat rather than a read.
+    """
+    docs_stat = stat_key(docs_path)
+    inputs: dict[str, Any] = {
+        "generator": CHEATSHEET_GENERATOR,
+        "docs_url": docs_url,
+        "docs_stat": docs_stat,
+        "docs_sha256": None,
+    }
+    if docs_stat is None:
+        return inputs
+    if (
+        isinstance(prior_inputs, dict)
+        and prior_inputs.get("docs_stat") == docs_stat
+        and isinstance(prior_inputs.get("docs_sha256"), str)
+    ):
+        inputs["docs_sha256"] = prior_inputs["docs_sha256"]
+    else:
+        inputs["docs_sha256"] = sha256_file(docs_path)
+    return inputs
+
+
+def cheatsheet_fresh(
+    inputs: dict[str, Any], prior_inputs: Any, cheatsheet_path: Path
+) -> bool:
+    if not isinstance(prior_inputs, dict):
+        return False
+    cheatsheet_stat = stat_key(cheatsheet_path)
+    return (
+        cheatsheet_stat is not None
+        and prior_inputs.get("cheatsheet_stat") == cheatsheet_stat
+        and all(
+            prior_inputs.get(key) == inputs[key]
+            for key in ("generator", "docs_url", "docs_sha256")
+        )
+    )
+
+
 def write_cheatsheet(
-    cheatsheet_path: Path, docs_url: str, docs_path: Path, errors: list[str]
-) -> FetchResult:
+    cheatsheet_path: Path,
+    docs_url: str,
+    docs_path: Path,
+    errors: list[str],
+    prior: dict[str, Any],
+) -> tuple[FetchResult, dict[str, Any] | None]:
+    prior_inputs = prior.get("cheatsheet_inputs")
     try:
+        inputs = cheatsheet_inputs(docs_url, docs_path, prior_inputs)
+        if cheatsheet_fresh(inputs, prior_inputs, cheatsheet_path):
+            return (
+                FetchResult(
+                    source="cache_not_modified",
+                    message="cheatsheet inputs unchanged",
+                    ok=True,
+                ),
+                {**inputs, "cheatsheet_stat": prior_inputs["cheatsheet_stat"]},
+            )
         content = build_cheatsheet(
             docs_url=docs_url,
             generated_at=now_utc(),
-            docs_path=docs_path if nonempty_file(docs_path) else None,
+            docs_path=docs_path if inputs["docs_stat"] else None,
         )
+        result = FetchResult(source="generated", message="generated cheatsheet", ok=True)
         if nonempty_file(cheatsheet_path):
             existing = cheatsheet_path.read_text(encoding="utf-8", errors="replace")
             if same_cheatsheet_ignoring_generated_at(existing, content):
-                return FetchResult(
+                result = FetchResult(
                     source="cache_not_modified",
                     message="cheatsheet not modified",
                     ok=True,
                 )
-        atomic_write_if_changed(cheatsheet_path, content.encode("utf-8"))
-        return FetchResult(source="generated", message="generated cheatsheet", ok=True)
+        if result.source == "generated":
+            atomic_write_if_changed(cheatsheet_path, content.encode("utf-8"))
+        return result, {**inputs, "cheatsheet_stat": stat_key(cheatsheet_path)}
     except Exception as exc:  # noqa: BLE001
         if nonempty_file(cheatsheet_path):
             errors.append(f"cheatsheet generation failed, used cache: {exc}")
-            return FetchResult(
-                source="cache_fallback", message="used cached cheatsheet", ok=True
+            return (
+                FetchResult(
+                    source="cache_fallback", message="used cached cheatsheet", ok=True
+                ),
+                None,
             )
         errors.append(f"cheatsheet generation failed with no cache: {exc}")
-        return FetchResult(source="none", message="cheatsheet unavailable", ok=False)
+        return (
+            FetchResult(source="none", message="cheatsheet unavailable", ok=False),
+            None,
+        )
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Refresh Deckset docs and gist examples used by the deckset skill."
     )
     parser.add_argument("--docs-url", default=DEFAULT_DOCS_URL)
     parser.add_argument("--gist-id", default=DEFAULT_GIST_ID)
+    parser.add_argument("--github-api-url", default=DEFAULT_GITHUB_API_URL)
     parser.add_argument("--timeout-sec", type=int, default=20)
+    parser.add_argument(
+        "--total-timeout-sec",
+        type=int,
+        default=DEFAULT_TOTAL_TIMEOUT_SEC,
+        help="Deadline for all network fetches together; late fetches use cache.",
+    )
     parser.add_argument(
         "--max-age-sec",
         type=int,
@@ -596,7 +1031,7 @@ def parse_args() -> argparse.Namespace:
         help="Skip network refresh if refreshed_at is within this many seconds.",
     )
     parser.add_argument("--refs-dir", default=None)
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def metadata_changed(prior: dict[str, Any], summary: dict[str, Any]) -> bool:
@@ -618,8 +1053,8 @@ def metadata_changed(prior: dict[str, Any], summary: dict[str, Any]) -> bool:
     return prior_material != summary_material
 
 
-def main() -> int:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     skill_dir = Path(__file__).resolve().parents[1]
     refs_dir = (
         Path(args.refs_dir).resolve() if args.refs_dir else skill_dir / "references"
@@ -631,23 +1066,39 @@ def main() -> int:
     metadata_path = refs_dir / METADATA_FILENAME
 
     prior = load_json_dict(metadata_path)
-    errors: list[str] = []
+    docs_errors: list[str] = []
+    gist_errors: list[str] = []
     github_token = get_github_token()
 
-    docs_result, docs_meta = fetch_docs(
-        args.docs_url, docs_path, args.timeout_sec, errors, prior, args.max_age_sec
-    )
-    gist_result, gist_meta = fetch_gist_examples(
-        args.gist_id,
-        examples_dir,
-        args.timeout_sec,
-        errors,
-        prior,
-        args.max_age_sec,
-        github_token,
-    )
-    cheatsheet_result = write_cheatsheet(
-        cheatsheet_path, args.docs_url, docs_path, errors
+    with FetchEngine(args.total_timeout_sec) as engine:
+        docs_future = engine.submit(
+            fetch_docs,
+            args.docs_url,
+            docs_path,
+            args.timeout_sec,
+            docs_errors,
+            prior,
+            args.max_age_sec,
+            engine,
+        )
+        gist_future = engine.submit(
+            fetch_gist_examples,
+            args.gist_id,
+            examples_dir,
+            args.timeout_sec,
+            gist_errors,
+            prior,
+            args.max_age_sec,
+            github_token,
+            engine,
+            args.github_api_url,
+        )
+        docs_result, docs_meta = docs_future.result()
+        gist_result, gist_meta = gist_future.result()
+    # Report errors in a fixed order regardless of which fetch finished first.
+    errors = docs_errors + gist_errors
+    cheatsheet_result, cheatsheet_meta = write_cheatsheet(
+        cheatsheet_path, args.docs_url, docs_path, errors, prior
     )
 
     used_cache_fallback = (
@@ -669,6 +1120,7 @@ def main() -> int:
         "docs_last_modified": docs_meta.get("last_modified"),
         "gist_etag": gist_meta.get("etag"),
         "gist_last_modified": gist_meta.get("last_modified"),
+        "cheatsheet_inputs": cheatsheet_meta,
         "errors": errors,
     }
 
@@ -0,0 +1,178 @@
+#!/usr/bin/env -S uv run python
+"""Benchmark `refresh_sources.py` against a local stand-in for its upstreams.
+
+Each scenario starts a fresh stand-in (`fixtures/refresh_stand_in.py`) that
+serves the Deckset docs page, the gist API and raw gist files, optionally
+primes the references cache with one refresh, applies its upstream change
+or fault, and then times one refresh in a child process. No network access
+or GitHub token is used; proxy and token variables are cleared for the child.
+
+Reported per scenario:
+
+- `wall_sec`: end-to-end time of the measured refresh, interpreter start included
+- `bytes_sent`: response body bytes the stand-in put on the wire (after gzip)
+- `requests` and `statuses`: what the refresh asked for and what it got
+- `files_rewritten`: cache files created or replaced, by (inode, mtime_ns)
+- the refresh's own JSON output and exit status
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+sys.dont_write_bytecode = True
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts/refresh_sources.py"
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+sys.path.insert(0, str(FIXTURES))
+from refresh_stand_in import StandIn, synthetic_files  # noqa: E402
+
+CLEARED_ENV = (
+    "GH_TOKEN",
+    "GITHUB_TOKEN",
+    "http_proxy",
+    "HTTP_PROXY",
+    "https_proxy",
+    "HTTPS_PROXY",
+)
+
+
+def snapshot(root: Path) -> dict[str, tuple[int, int]]:
+    if not root.exists():
+        return {}
+    return {
+        str(path.relative_to(root)): (path.stat().st_ino, path.stat().st_mtime_ns)
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+def run_refresh(stand_in: StandIn, refs: Path, extra: list[str]) -> dict[str, Any]:
+    env = {**os.environ, **{name: "" for name in CLEARED_ENV}}
+    before = snapshot(refs)
+    stand_in.reset_counters()
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, str(SCRIPT), "--refs-dir", str(refs), *stand_in.argv(), *extra],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    elapsed = time.perf_counter() - started
+    try:
+        output = json.loads(proc.stdout)
+    except json.JSONDecodeError:
+        message = f"refresh produced no JSON output: {proc.stderr.strip()}"
+        raise SystemExit(message) from None
+    after = snapshot(refs)
+    return {
+        "exit_status": proc.returncode,
+        "wall_sec": elapsed,
+        "bytes_sent": stand_in.bytes_sent,
+        "requests": len(stand_in.requests),
+        "connections": len(stand_in.connections),
+        "statuses": dict(Counter(str(status) for status in stand_in.statuses)),
+        "files_rewritten": sorted(
+            name for name, stat in after.items() if before.get(name) != stat
+        ),
+        "docs_source": output["docs_source"],
+        "gist_source": output["gist_source"],
+        "cheatsheet_source": output["cheatsheet_source"],
+        "used_cache_fallback": output["used_cache_fallback"],
+    }
+
+
+def append_to_raw_file(stand_in: StandIn) -> None:
+    name = sorted(stand_in.truncated)[0]
+    stand_in.files[name] += b"# Appendix\n"
+
+
+def fail_upstreams(stand_in: StandIn) -> None:
+    stand_in.failures = {"docs": 500, "gists": "reset"}
+
+
+def slow_upstreams(stand_in: StandIn) -> None:
+    stand_in.delays = {"docs": 0.25, "gists": 0.25, "raw": 0.25}
+    append_to_raw_file(stand_in)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    prime: bool
+    change: Callable[[StandIn], None] | None = None
+    extra: tuple[str, ...] = ()
+    file_bytes: int | None = None
+
+
+SCENARIOS = {
+    "cold": Scenario(prime=False),
+    "warm-not-modified": Scenario(prime=True),
+    "ttl": Scenario(prime=True, extra=("--max-age-sec", "3600")),
+    "partial-update": Scenario(prime=True, change=append_to_raw_file),
+    "slow-upstream": Scenario(prime=True, change=slow_upstreams),
+    "large-gist": Scenario(prime=True, change=append_to_raw_file, file_bytes=1_000_000),
+    "upstream-failure": Scenario(prime=True, change=fail_upstreams),
+    "cold-failure": Scenario(prime=False, change=fail_upstreams),
+}
+
+
+def run_scenario(name: str, options: argparse.Namespace) -> dict[str, Any]:
+    scenario = SCENARIOS[name]
+    file_bytes = scenario.file_bytes or options.file_bytes
+    files = synthetic_files(options.files, file_bytes)
+    # All but the first file are truncated, as the gist API does for large
+    # files, so the refresh has to fetch them from their raw URLs.
+    stand_in = StandIn(files, truncated=set(sorted(files)[1:]))
+    try:
+        with tempfile.TemporaryDirectory(prefix="deckset-refresh-bench-") as root:
+            refs = Path(root) / "references"
+            if scenario.prime:
+                run_refresh(stand_in, refs, [])
+            if scenario.change is not None:
+                scenario.change(stand_in)
+            return {
+                "scenario": name,
+                "files": options.files,
+                "file_bytes": file_bytes,
+                **run_refresh(stand_in, refs, list(scenario.extra)),
+            }
+    finally:
+        stand_in.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark the Deckset reference refresh")
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--files", type=int, default=12, help="Example files in the gist")
+    parser.add_argument(
+        "--file-bytes",
+        type=int,
+        default=4_096,
+        help="Approximate size of each example file (large-gist uses 1 MB)",
+    )
+    return parser
+
+
+def main() -> int:
+    options = build_parser().parse_args()
+    rows = [run_scenario(name, options) for name in options.scenarios]
+    print(json.dumps({"deckset_refresh_benchmark": rows}, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
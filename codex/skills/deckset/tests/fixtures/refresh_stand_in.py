@@ -0,0 +1,171 @@
+"""Local stand-in for the Deckset docs host, the gist API and raw gist files.
+
+`refresh_sources.py` reaches it through `--docs-url` and `--github-api-url`,
+so refreshes run without network access. The server speaks HTTP/1.1 with
+keep-alive, answers `If-None-Match` with 304, and gzips bodies on request.
+
+Faults are injected per route, keyed by the first path segment (`docs`,
+`gists`, `raw`):
+
+- `delays[route]`: seconds to sleep before answering
+- `failures[route]`: an HTTP status to answer with, `"reset"` to drop the
+  connection without a response, or `"stale"` to answer the next request
+  once with a garbled status line, as a dropped keep-alive connection does
+
+Every request is recorded, and `bytes_sent` counts response body bytes as
+sent on the wire (after gzip).
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DOCS_PATH = "/docs/markdownDocumentation.html"
+DOCS_HTML = b"<html><body><code>theme: Zurich</code><code>footer: Local</code></body></html>"
+GIST_ID = "0123abcd"
+INLINE_PREFIX_BYTES = 8
+
+
+def synthetic_files(count: int, size: int) -> dict[str, bytes]:
+    """Deckset-shaped example files of roughly `size` bytes each.
+
+    Slides are numbered so large files do not collapse under gzip.
+    """
+    files = {}
+    for index in range(count):
+        slides, total, slide = [], 0, 0
+        while total < size:
+            point = slide * 7919 % 104729
+            text = f"# Deck {index} slide {slide}\n\n- point {point}\n\n---\n"
+            slides.append(text)
+            total += len(text)
+            slide += 1
+        files[f"deck-{index}.md"] = "".join(slides).encode()
+    return files
+
+
+class StandIn:
+    def __init__(
+        self,
+        files: dict[str, bytes],
+        truncated: set[str],
+        docs: bytes = DOCS_HTML,
+    ) -> None:
+        self.files = files
+        self.truncated = truncated
+        self.docs = docs
+        self.delays: dict[str, float] = {}
+        self.failures: dict[str, int | str] = {}
+        self.requests: list[str] = []
+        self.statuses: list[int] = []
+        self.connections: set[tuple[str, int]] = set()
+        self.encodings: list[str | None] = []
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                route = self.path.split("/")[1]
+                with stand_in._lock:
+                    stand_in.requests.append(self.path)
+                    stand_in.connections.add(self.client_address)
+                time.sleep(stand_in.delays.get(route, 0.0))
+                with stand_in._lock:
+                    failure = stand_in.failures.get(route)
+                    if failure == "stale":
+                        del stand_in.failures[route]
+                if failure in ("reset", "stale"):
+                    if failure == "stale":
+                        self.wfile.write(b"\x15\x03\x03 garbled\r\n")
+                    self.close_connection = True
+                    return
+                if isinstance(failure, int):
+                    status, body = failure, b""
+                else:
+                    status, body = stand_in.route(self.path)
+                etag = f'"{hashlib.sha256(body).hexdigest()}"'
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    status, body = 304, b""
+                encoding = None
+                accepted = self.headers.get("Accept-Encoding") or ""
+                if status != 304 and "gzip" in accepted:
+                    encoding, body = "gzip", gzip.compress(body)
+                with stand_in._lock:
+                    stand_in.statuses.append(status)
+                    stand_in.encodings.append(encoding)
+                    stand_in.bytes_sent += len(body)
+                self.send_response(status)
+                self.send_header("ETag", etag)
+                if encoding:
+                    self.send_header("Content-Encoding", encoding)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.statuses.clear()
+            self.connections.clear()
+            self.encodings.clear()
+            self.bytes_sent = 0
+
+    def argv(self) -> list[str]:
+        return [
+            "--docs-url",
+            f"{self.url}{DOCS_PATH}",
+            "--github-api-url",
+            self.url,
+            "--gist-id",
+            GIST_ID,
+        ]
+
+    def route(self, path: str) -> tuple[int, bytes]:
+        if path == DOCS_PATH:
+            return 200, self.docs
+        if path == f"/gists/{GIST_ID}":
+            files = {
+                name: {
+                    "filename": name,
+                    "truncated": name in self.truncated,
+                    "content": body[
+                        : INLINE_PREFIX_BYTES if name in self.truncated else None
+                    ].decode(),
+                    "raw_url": self.raw_url(name),
+                    "size": len(body),
+                }
+                for name, body in self.files.items()
+            }
+            return 200, json.dumps({"files": files}).encode("utf-8")
+        for name in self.files:
+            if path == self.raw_url(name)[len(self.url) :]:
+                return 200, self.files[name]
+        return 404, b""
+
+    def raw_url(self, name: str) -> str:
+        revision = hashlib.sha1(self.files[name]).hexdigest()
+        return f"{self.url}/raw/{revision}/{name}"
+
+    def raw_requests(self) -> list[str]:
+        return [path for path in self.requests if path.startswith("/raw/")]
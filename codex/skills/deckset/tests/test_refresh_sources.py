@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts/refresh_sources.py"
+SPEC = importlib.util.spec_from_file_location("deckset_refresh_sources", SCRIPT)
+assert SPEC is not None and SPEC.loader is not None
+MODULE = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = MODULE
+SPEC.loader.exec_module(MODULE)
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+sys.path.insert(0, str(FIXTURES))
+from refresh_stand_in import DOCS_HTML, StandIn  # noqa: E402
+
+
+def snapshot(root: Path) -> dict[str, tuple[int, int]]:
+    """Map each file under `root` to (inode, mtime_ns) so rewrites are visible."""
+    return {
+        str(path.relative_to(root)): (path.stat().st_ino, path.stat().st_mtime_ns)
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+class RefreshTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        self.refs = Path(self.root.name) / "references"
+        files = {
+            f"deck-{index}.md": f"# Deck {index}\n\n---\n".encode() * 40
+            for index in range(4)
+        }
+        self.stand_in = StandIn(files, truncated={"deck-1.md", "deck-2.md", "deck-3.md"})
+        self.addCleanup(self.stand_in.close)
+        environment = mock.patch.dict(
+            os.environ,
+            {
+                name: ""
+                for name in ("GH_TOKEN", "GITHUB_TOKEN", "http_proxy", "HTTP_PROXY")
+            },
+        )
+        environment.start()
+        self.addCleanup(environment.stop)
+
+    def refresh(self, *extra: str) -> tuple[int, dict[str, object]]:
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            status = MODULE.main(
+                ["--refs-dir", str(self.refs), *self.stand_in.argv(), *extra]
+            )
+        return status, json.loads(stdout.getvalue())
+
+    def test_refresh_writes_docs_examples_and_cheatsheet(self) -> None:
+        status, output = self.refresh()
+        self.assertEqual(status, 0)
+        self.assertEqual(output["docs_source"], "network")
+        self.assertEqual(output["gist_source"], "network")
+        for name, body in self.stand_in.files.items():
+            self.assertEqual((self.refs / "examples" / name).read_bytes(), body)
+        self.assertIn("theme: Zurich", (self.refs / MODULE.CHEATSHEET_FILENAME).read_text())
+
+    def test_fetches_overlap_instead_of_adding_up(self) -> None:
+        self.stand_in.delays = {"docs": 0.4, "gists": 0.4, "raw": 0.4}
+        started = time.monotonic()
+        status, _ = self.refresh()
+        elapsed = time.monotonic() - started
+        self.assertEqual(status, 0)
+        # Serial: docs + api + 3 raw files = 2.0s; overlapped: api then raw = 0.8s.
+        self.assertLess(elapsed, 1.4)
+
+    def test_refresh_reuses_connections_and_decodes_gzip(self) -> None:
+        self.assertEqual(self.refresh()[0], 0)
+        self.assertEqual(len(self.stand_in.requests), 5)
+        self.assertLess(len(self.stand_in.connections), 5)
+        self.assertEqual(set(self.stand_in.encodings), {"gzip"})
+
+    def test_pool_keeps_one_connection_per_idle_host(self) -> None:
+        pool = MODULE.HTTPPool()
+        self.addCleanup(pool.close)
+        for name, body in self.stand_in.files.items():
+            status, data, _ = pool.get(self.stand_in.raw_url(name), 5, {})
+            self.assertEqual((status, data), (200, body))
+        self.assertEqual(pool.opened, 1)
+        self.assertEqual(len(self.stand_in.connections), 1)
+
+    def test_not_modified_response_leaves_the_connection_reusable(self) -> None:
+        pool = MODULE.HTTPPool()
+        self.addCleanup(pool.close)
+        url = self.stand_in.raw_url("deck-2.md")
+        body = self.stand_in.files["deck-2.md"]
+        _, _, headers = pool.get(url, 5, {})
+        etag = MODULE.header_get(headers, "ETag")
+        self.assertEqual(pool.get(url, 5, {"If-None-Match": etag})[:2], (304, b""))
+        self.assertEqual(pool.get(url, 5, {})[:2], (200, body))
+        self.assertEqual(self.stand_in.statuses, [200, 304, 200])
+        self.assertEqual(self.stand_in.encodings, ["gzip", None, "gzip"])
+        self.assertEqual(pool.opened, 1)
+
+    def test_pool_retries_a_dropped_keep_alive_connection_once(self) -> None:
+        pool = MODULE.HTTPPool()
+        self.addCleanup(pool.close)
+        url = self.stand_in.raw_url("deck-0.md")
+        self.assertEqual(pool.get(url, 5, {})[0], 200)
+        self.stand_in.failures = {"raw": "stale"}
+        status, data, _ = pool.get(url, 5, {})
+        self.assertEqual((status, data), (200, self.stand_in.files["deck-0.md"]))
+        self.assertEqual(pool.opened, 2)
+
+    def test_error_response_validators_are_not_recorded(self) -> None:
+        self.assertEqual(self.refresh()[0], 0)
+        metadata = self.refs / "refresh-metadata.json"
+        prior = json.loads(metadata.read_bytes())
+        self.stand_in.failures = {"docs": 500, "gists": 502}
+        self.refresh()
+        recorded = json.loads(metadata.read_bytes())
+        for key in ("docs_etag", "gist_etag"):
+            self.assertEqual(recorded[key], prior[key])
+
+    def test_only_changed_raw_files_are_downloaded(self) -> None:
+        self.assertEqual(self.refresh()[0], 0)
+        self.assertEqual(len(self.stand_in.raw_requests()), 3)
+        index = json.loads((self.refs / "examples/_gist-index.json").read_bytes())
+        entry = index["file_metadata"]["deck-2.md"]
+        self.assertEqual(entry["raw_url"], self.stand_in.raw_url("deck-2.md"))
+        self.assertEqual(
+            entry["sha256"], hashlib.sha256(self.stand_in.files["deck-2.md"]).hexdigest()
+        )
+        self.assertIsNotNone(entry["etag"])
+
+        self.stand_in.requests.clear()
+        self.assertEqual(self.refresh()[0], 0)
+        self.assertEqual(self.stand_in.raw_requests(), [])
+
+        self.stand_in.files["deck-2.md"] += b"# Appendix\n"
+        self.stand_in.requests.clear()
+        self.assertEqual(self.refresh()[0], 0)
+        changed = self.stand_in.raw_url("deck-2.md")[len(self.stand_in.url) :]
+        self.assertEqual(self.stand_in.raw_requests(), [changed])
+        self.assertEqual(
+            (self.refs / "examples/deck-2.md").read_bytes(),
+            self.stand_in.files["deck-2.md"],
+        )
+
+    def test_edited_cache_file_is_downloaded_again(self) -> None:
+        self.assertEqual(self.refresh()[0], 0)
+        (self.refs / "examples/deck-3.md").write_bytes(b"local edit\n")
+        self.stand_in.files["deck-1.md"] += b"# Appendix\n"
+        self.stand_in.requests.clear()
+        self.assertEqual(self.refresh()[0], 0)
+        self.assertEqual(len(self.stand_in.raw_requests()), 2)
+        self.assertEqual(
+            (self.refs / "examples/deck-3.md").read_bytes(),
+            self.stand_in.files["deck-3.md"],
+        )
+
+    def test_unchanged_inputs_skip_cheatsheet_rendering(self) -> None:
+        docs = self.refs / MODULE.DOCS_CACHE_FILENAME
+        self.assertEqual(self.refresh()[0], 0)
+        with mock.patch.object(
+            MODULE, "build_cheatsheet", side_effect=MODULE.build_cheatsheet
+        ) as build, mock.patch.object(
+            MODULE, "sha256_file", side_effect=MODULE.sha256_file
+        ) as digest:
+            _, output = self.refresh("--max-age-sec", "3600")
+            self.assertEqual(output["cheatsheet_source"], "cache_not_modified")
+            self.assertEqual((build.call_count, digest.call_count), (0, 0))
+
+            docs.write_bytes(docs.read_bytes())
+            self.refresh("--max-age-sec", "3600")
+            self.assertEqual((build.call_count, digest.call_count), (0, 1))
+
+            docs.write_bytes(DOCS_HTML.replace(b"Zurich", b"Fira"))
+            _, output = self.refresh("--max-age-sec", "3600")
+            self.assertEqual(output["cheatsheet_source"], "generated")
+            self.assertEqual(build.call_count, 1)
+
+            with mock.patch.object(MODULE, "CHEATSHEET_GENERATOR", "deckset-cheatsheet/test"):
+                self.refresh("--max-age-sec", "3600")
+            self.assertEqual(build.call_count, 2)
+
+    def test_deadline_falls_back_to_cached_examples(self) -> None:
+        self.assertEqual(self.refresh()[0], 0)
+        self.stand_in.files["deck-1.md"] += b"# Appendix\n"
+        self.stand_in.delays = {"raw": 3.0}
+        started = time.monotonic()
+        status, output = self.refresh("--total-timeout-sec", "1")
+        self.assertLess(time.monotonic() - started, 2.5)
+        self.assertEqual(status, 0)
+        self.assertEqual(output["gist_source"], "cache_fallback")
+        self.assertTrue(output["used_cache_fallback"])
+
+    def test_fresh_cache_within_max_age_makes_no_requests(self) -> None:
+        self.assertEqual(self.refresh()[0], 0)
+        self.stand_in.reset_counters()
+        status, output = self.refresh("--max-age-sec", "3600")
+        self.assertEqual(status, 0)
+        self.assertEqual(
+            (output["docs_source"], output["gist_source"]), ("cache_ttl", "cache_ttl")
+        )
+        self.assertEqual(self.stand_in.requests, [])
+
+    def test_not_modified_refresh_rewrites_nothing(self) -> None:
+        self.assertEqual(self.refresh()[0], 0)
+        before = snapshot(self.refs)
+        self.stand_in.reset_counters()
+        status, output = self.refresh()
+        self.assertEqual(status, 0)
+        self.assertEqual(
+            (output["docs_source"], output["gist_source"], output["cheatsheet_source"]),
+            ("cache_not_modified",) * 3,
+        )
+        self.assertEqual(set(self.stand_in.statuses), {304})
+        self.assertEqual(self.stand_in.bytes_sent, 0)
+        self.assertEqual(snapshot(self.refs), before)
+
+    def test_upstream_failures_fall_back_to_cache(self) -> None:
+        self.assertEqual(self.refresh()[0], 0)
+        before = snapshot(self.refs)
+        for failure in (500, "reset"):
+            with self.subTest(failure=failure):
+                self.stand_in.failures = {"docs": failure, "gists": failure}
+                status, output = self.refresh()
+                self.assertEqual(status, 0)
+                self.assertEqual(
+                    (output["docs_source"], output["gist_source"]),
+                    ("cache_fallback", "cache_fallback"),
+                )
+                self.assertTrue(output["used_cache_fallback"])
+                self.assertEqual(snapshot(self.refs), before)
+
+    def test_upstream_failures_without_cache_report_unavailable(self) -> None:
+        self.stand_in.failures = {"docs": 503, "gists": "reset"}
+        status, output = self.refresh()
+        self.assertEqual(status, 1)
+        self.assertEqual((output["docs_source"], output["gist_source"]), ("none", "none"))
+
+
+class CheatsheetTests(unittest.TestCase):
+    def test_directive_index_keeps_first_code_line_per_prefix(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            docs = Path(root) / "docs.html"
+            docs.write_text(
+                "<p>theme: Prose</p>"
+                "<pre><CODE>theme: Zurich\r\n  [.footer: Local]  </CODE></pre>"
+                "<code><span>footer:</span> &copy; Deck &amp; co</code>"
+                "<code>theme: Later\n[.code-highlight: 2]</code>",
+                encoding="utf-8",
+            )
+            index = MODULE.index_code_directives(docs, MODULE.CHEATSHEET_DIRECTIVES)
+            cheatsheet = MODULE.build_cheatsheet("docs", "now", docs)
+        self.assertEqual(
+            index,
+            {
+                "theme:": "theme: Zurich",
+                "[.footer:": "[.footer: Local]",
+                "footer:": "footer: \u00a9 Deck & co",
+                "[.code-highlight:": "[.code-highlight: 2]",
+            },
+        )
+        self.assertIn("theme: Zurich\nfooter: \u00a9 Deck & co\nslidenumbers: true", cheatsheet)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,21 @@
 #!/usr/bin/env -S uv run python
-"""Validate and transport one source-authorized Negative Ledger projection."""
+"""Validate and transport source-authorized Negative Ledger projections."""
 
 from __future__ import annotations
 
 import argparse
+import collections
+from concurrent.futures import Future, ThreadPoolExecutor
 import hashlib
 import json
 import os
 from pathlib import Path
 import shutil
+import stat
 import subprocess
 import sys
+import tempfile
+import threading
 from typing import Any
 
 
@@ -33,6 +38,17 @@ NOTE_DEFINITION = (
 SOURCE_DEFINITION_ID = "negative-ledger/negative-evidence-protocol"
 NOTE_DEFINITION_ID = "memory-source-notes/negative-ledger-memory-note-payload"
 LEDGER_ABI = "ledger-artifact-abi/v1"
+RECEIPT_SCHEMA = "negative-ledger-admission-receipt/v1"
+BATCH_SCHEMA = "negative-ledger-admission-batch/v1"
+RECONCILE_SCHEMA = "source-memory-reconciliation/v2"
+RECONCILE_RECORD_SCHEMA = "source-memory-reconciliation-record/v2"
+PIPELINE_WORKERS = min(4, os.cpu_count() or 1)
+DOCTOR_CACHE_SCHEMA = "negative-ledger-doctor-cache/v1"
+DOCTOR_CACHE_FILENAME = ".doctor-cache.json"
+SOURCE_STORE = Path(".ledger/negative-ledger")
+TRANSPORT_CHUNK_BYTES = 64 * 1024
+SPOOL_MAX_BYTES = 1024 * 1024
+EXPORT_TIMEOUT_SEC = 300.0
 
 
 class AdapterError(RuntimeError):
@@ -54,12 +70,14 @@ def _run(
     *,
     cwd: Path,
     input_bytes: bytes | None = None,
+    stdin: Any = None,
 ) -> subprocess.CompletedProcess[bytes]:
     try:
         return subprocess.run(
             argv,
             cwd=cwd,
             input=input_bytes,
+            stdin=stdin,
             capture_output=True,
             check=False,
         )
@@ -108,87 +126,333 @@ def _require_passive_result(
     return value
 
 
-def validate_projection(
-    raw: bytes,
-    expected_id: str,
-    *,
-    ledger: str,
-    repo: Path,
-) -> dict[str, Any]:
-    validation_raw = _require_success(
-        _run(
-            [
-                ledger,
-                "validate",
-                "--definition",
-                str(NOTE_DEFINITION),
-                "--input",
-                "note=-",
-                "--format",
-                "json",
-            ],
-            cwd=repo,
-            input_bytes=raw,
-        ),
-        "note structural validation",
-    )
-    validation = _require_passive_result(
-        _parse_json(validation_raw, "note structural validation"),
-        stage="note structural validation",
-        schema="ledger-validation-result/v1",
-        definition_id=NOTE_DEFINITION_ID,
-    )
-    if validation.get("valid") is not True:
-        raise AdapterError("note structural validation: invalid result")
-    envelope = _parse_json(raw, "ledger project")
-    if not isinstance(envelope, dict):
-        raise AdapterError("ledger project: expected object")
-    payload = envelope.get("payload")
-    if not isinstance(payload, dict):
-        raise AdapterError("ledger project.payload: expected object")
-    if payload["neg_id"] != expected_id:
-        raise AdapterError(
-            f"ledger project.payload.neg_id: expected {expected_id}, got {payload['neg_id']}"
-        )
-    return envelope
-
-
-def expected_writer_fingerprint(kind: str, raw: bytes) -> str:
+def _writer_hasher(kind: str) -> Any:
     digest = hashlib.sha256()
     digest.update(b"negative-ledger\n")
     digest.update(kind.encode("utf-8"))
     digest.update(b"\n")
+    return digest
+
+
+def expected_writer_fingerprint(kind: str, raw: bytes) -> str:
+    digest = _writer_hasher(kind)
     digest.update(raw)
     return digest.hexdigest()
 
 
-def inspect_projection(args: argparse.Namespace) -> tuple[bytes, dict[str, Any]]:
-    repo = Path(args.repo).expanduser().resolve()
-    if not repo.is_dir():
-        raise AdapterError(f"repo: not a directory: {repo}")
-    ledger = _resolve_binary(args.ledger_bin, "LEDGER_BIN", "ledger")
-    doctor_argv = [
+class ProjectionExport:
+    """Export bytes spooled once, with what was learned while they streamed.
+
+    Up to ``SPOOL_MAX_BYTES`` stay in memory; a larger projection rolls over
+    to an unlinked temporary file that ``memory-note append`` reads directly.
+    """
+
+    __slots__ = ("spool", "size", "writer_fingerprint", "envelope")
+
+    def __init__(
+        self,
+        spool: Any,
+        size: int,
+        writer_fingerprint: str,
+        envelope: dict[str, Any],
+    ) -> None:
+        self.spool = spool
+        self.size = size
+        self.writer_fingerprint = writer_fingerprint
+        self.envelope = envelope
+
+    def stdin_arguments(self) -> dict[str, Any]:
+        self.spool.seek(0)
+        if self.size > SPOOL_MAX_BYTES:
+            return {"stdin": self.spool}
+        return {"input_bytes": self.spool.read()}
+
+    def close(self) -> None:
+        self.spool.close()
+
+
+def _drain(stream: Any, chunks: list[bytes]) -> threading.Thread:
+    thread = threading.Thread(target=lambda: chunks.append(stream.read()), daemon=True)
+    thread.start()
+    return thread
+
+
+def _kill(proc: subprocess.Popen[bytes]) -> None:
+    try:
+        proc.kill()
+    except ProcessLookupError:
+        pass
+
+
+def _spawn(argv: list[str], *, cwd: Path, stdin: Any = None) -> subprocess.Popen[bytes]:
+    try:
+        return subprocess.Popen(
+            argv,
+            cwd=cwd,
+            stdin=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except OSError as exc:
+        raise AdapterError(f"{Path(argv[0]).name}: {exc}") from exc
+
+
+def export_projection(
+    neg_id: str,
+    *,
+    kind: str,
+    ledger: str,
+    repo: Path,
+) -> ProjectionExport:
+    """Stream one export into the validator, the writer hasher and a spool.
+
+    The bytes are read from ``ledger project`` once and parsed once; nothing
+    holds a second copy.
+    """
+    export_argv = [
         ledger,
-        "doctor",
+        "project",
         "--definition",
         str(SOURCE_DEFINITION),
+        "--projection",
+        "memory-note",
         "--repo",
         str(repo),
+        "--param",
+        f"id={neg_id}",
+        "--payload-only",
         "--format",
         "json",
     ]
-    export_argv = [
+    validate_argv = [
         ledger,
-        "project",
+        "validate",
+        "--definition",
+        str(NOTE_DEFINITION),
+        "--input",
+        "note=-",
+        "--format",
+        "json",
+    ]
+    spool: Any = None
+    processes: list[subprocess.Popen[bytes]] = []
+    expired = threading.Event()
+
+    def expire() -> None:
+        # Killing both unblocks a write to a validator that stopped reading.
+        expired.set()
+        for proc in processes:
+            _kill(proc)
+
+    watchdog = threading.Timer(EXPORT_TIMEOUT_SEC, expire)
+    watchdog.daemon = True
+    try:
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        validator = _spawn(validate_argv, cwd=repo, stdin=subprocess.PIPE)
+        processes.append(validator)
+        exporter = _spawn(export_argv, cwd=repo)
+        processes.append(exporter)
+        watchdog.start()
+        captured: dict[str, list[bytes]] = {
+            "export_stderr": [],
+            "validate_stdout": [],
+            "validate_stderr": [],
+        }
+        drains = [
+            _drain(exporter.stderr, captured["export_stderr"]),
+            _drain(validator.stdout, captured["validate_stdout"]),
+            _drain(validator.stderr, captured["validate_stderr"]),
+        ]
+        hasher = _writer_hasher(kind)
+        size = 0
+        feeding = True
+        assert exporter.stdout is not None and validator.stdin is not None
+        while chunk := exporter.stdout.read(TRANSPORT_CHUNK_BYTES):
+            size += len(chunk)
+            hasher.update(chunk)
+            spool.write(chunk)
+            if feeding:
+                try:
+                    validator.stdin.write(chunk)
+                except BrokenPipeError:
+                    feeding = False
+        try:
+            validator.stdin.close()
+        except BrokenPipeError:
+            pass
+        exporter.stdout.close()
+        export_status = exporter.wait()
+        validate_status = validator.wait()
+        watchdog.cancel()
+        for thread in drains:
+            thread.join()
+        if expired.is_set():
+            raise AdapterError(
+                f"ledger project {neg_id}: timed out after {EXPORT_TIMEOUT_SEC:g}s"
+            )
+        spool.seek(0)
+        _require_success(
+            subprocess.CompletedProcess(
+                export_argv,
+                export_status,
+                spool.read() if export_status else b"",
+                b"".join(captured["export_stderr"]),
+            ),
+            "ledger project",
+        )
+        validation_raw = _require_success(
+            subprocess.CompletedProcess(
+                validate_argv,
+                validate_status,
+                b"".join(captured["validate_stdout"]),
+                b"".join(captured["validate_stderr"]),
+            ),
+            "note structural validation",
+        )
+        validation = _require_passive_result(
+            _parse_json(validation_raw, "note structural validation"),
+            stage="note structural validation",
+            schema="ledger-validation-result/v1",
+            definition_id=NOTE_DEFINITION_ID,
+        )
+        if validation.get("valid") is not True:
+            raise AdapterError("note structural validation: invalid result")
+        spool.seek(0)
+        try:
+            envelope = json.load(spool)
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise AdapterError(f"ledger project: invalid JSON: {exc}") from exc
+        if not isinstance(envelope, dict):
+            raise AdapterError("ledger project: expected object")
+        payload = envelope.get("payload")
+        if not isinstance(payload, dict):
+            raise AdapterError("ledger project.payload: expected object")
+        if payload.get("neg_id") != neg_id:
+            raise AdapterError(
+                f"ledger project.payload.neg_id: expected {neg_id}, "
+                f"got {payload.get('neg_id')}"
+            )
+    except BaseException as exc:
+        watchdog.cancel()
+        for proc in processes:
+            _kill(proc)
+            proc.wait()
+        if spool is not None:
+            spool.close()
+        if isinstance(exc, OSError):
+            # A failed spool write (ENOSPC) or pipe read blocks this id only.
+            raise AdapterError(f"ledger project {neg_id}: {exc}") from exc
+        raise
+    return ProjectionExport(spool, size, hasher.hexdigest(), envelope)
+
+
+def _repo_path(value: str) -> Path:
+    repo = Path(value).expanduser().resolve()
+    if not repo.is_dir():
+        raise AdapterError(f"repo: not a directory: {repo}")
+    return repo
+
+
+def codex_home(override: str | None = None) -> Path:
+    if override:
+        return Path(override).expanduser().resolve()
+    env = os.environ.get("CODEX_HOME")
+    if env:
+        return Path(env).expanduser().resolve()
+    return (Path.home() / ".codex").resolve()
+
+
+def doctor_cache_path(home: Path) -> Path:
+    return home / "memories/extensions/negative-ledger/resources" / DOCTOR_CACHE_FILENAME
+
+
+def _stat_row(path: Path) -> list[int] | None:
+    try:
+        info = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [info.st_ino, info.st_size, info.st_mtime_ns]
+
+
+def source_store_fingerprint(*, ledger: str, repo: Path) -> str:
+    """Fingerprint what a doctor verdict depends on without reading the store.
+
+    Covers the source definition bytes, the Ledger binary, and the name,
+    inode, size and mtime of every file under the store's slot directory.
+    Any Ledger write to the store changes at least one of those.
+    """
+    binary = Path(shutil.which(ledger) or ledger).resolve()
+    store = repo / SOURCE_STORE
+    files: list[list[Any]] = []
+    for root, directories, names in os.walk(store):
+        directories.sort()
+        for name in sorted(names):
+            path = Path(root) / name
+            files.append([str(path.relative_to(store)), _stat_row(path)])
+    try:
+        definition = hashlib.sha256(SOURCE_DEFINITION.read_bytes()).hexdigest()
+    except OSError as exc:
+        raise AdapterError(f"ledger doctor: definition unreadable: {exc}") from exc
+    identity = {
+        "definition_sha256": definition,
+        "ledger": [str(binary), _stat_row(binary)],
+        "repo": str(repo),
+        "store": [_stat_row(store), files],
+    }
+    return hashlib.sha256(
+        json.dumps(identity, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+def _read_doctor_cache(path: Path) -> dict[str, Any]:
+    try:
+        descriptor = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    except OSError:
+        return {}
+    try:
+        with os.fdopen(descriptor, "rb") as handle:
+            if not stat.S_ISREG(os.fstat(handle.fileno()).st_mode):
+                return {}
+            value = json.loads(handle.read())
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return {}
+    if not isinstance(value, dict) or value.get("schema") != DOCTOR_CACHE_SCHEMA:
+        return {}
+    entries = value.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def _write_doctor_cache(path: Path, entries: dict[str, Any]) -> None:
+    """Replace the cache file; a cache that cannot be written is skipped."""
+    raw = json.dumps(
+        {"schema": DOCTOR_CACHE_SCHEMA, "entries": entries},
+        indent=2,
+        sort_keys=True,
+    ).encode()
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(
+            prefix=f".{path.name}.", dir=path.parent
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as handle:
+                handle.write(raw)
+            os.replace(temporary, path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+    except OSError:
+        return
+
+
+def run_source_doctor(*, ledger: str, repo: Path) -> dict[str, Any]:
+    doctor_argv = [
+        ledger,
+        "doctor",
         "--definition",
         str(SOURCE_DEFINITION),
-        "--projection",
-        "memory-note",
         "--repo",
         str(repo),
-        "--param",
-        f"id={args.id}",
-        "--payload-only",
         "--format",
         "json",
     ]
@@ -201,80 +465,425 @@ def inspect_projection(args: argparse.Namespace) -> tuple[bytes, dict[str, Any]]
     )
     if doctor.get("healthy") is not True:
         raise AdapterError("ledger doctor: source store is not healthy")
-    export_raw = _require_success(_run(export_argv, cwd=repo), "ledger project")
-    envelope = validate_projection(
-        export_raw,
-        args.id,
-        ledger=ledger,
-        repo=repo,
-    )
-    return export_raw, {
+    return doctor
+
+
+def check_source_store(
+    *,
+    ledger: str,
+    repo: Path,
+    home: Path | None = None,
+    fresh: bool = False,
+) -> tuple[dict[str, Any], bool]:
+    """Return ``(doctor, cached)`` for a healthy source store.
+
+    With ``home``, a healthy verdict is reused while the store fingerprint is
+    unchanged; ``fresh`` always reruns the doctor. Unhealthy verdicts are never
+    cached.
+    """
+    if home is None:
+        return run_source_doctor(ledger=ledger, repo=repo), False
+    path = doctor_cache_path(home)
+    fingerprint = source_store_fingerprint(ledger=ledger, repo=repo)
+    entries = _read_doctor_cache(path)
+    entry = entries.get(str(repo))
+    if (
+        not fresh
+        and isinstance(entry, dict)
+        and entry.get("fingerprint") == fingerprint
+        and isinstance(entry.get("doctor"), dict)
+    ):
+        return entry["doctor"], True
+    doctor = run_source_doctor(ledger=ledger, repo=repo)
+    entries[str(repo)] = {"fingerprint": fingerprint, "doctor": doctor}
+    _write_doctor_cache(path, entries)
+    return doctor, False
+
+
+def inspection_report(
+    export: ProjectionExport,
+    *,
+    neg_id: str,
+    kind: str,
+    doctor: dict[str, Any],
+    doctor_cached: bool,
+) -> dict[str, Any]:
+    return {
         "schema": "negative-ledger-admission-inspection/v1",
         "status": "exportable",
-        "neg_id": args.id,
-        "kind": args.kind,
-        "projection_status": envelope["payload"]["status"],
-        "projection_fingerprint": envelope["payload"]["projection_fingerprint"],
-        "writer_fingerprint": expected_writer_fingerprint(args.kind, export_raw),
+        "neg_id": neg_id,
+        "kind": kind,
+        "projection_status": export.envelope["payload"]["status"],
+        "projection_fingerprint": export.envelope["payload"]["projection_fingerprint"],
+        "writer_fingerprint": export.writer_fingerprint,
         "doctor": doctor,
+        "doctor_cached": doctor_cached,
         "authority_granted": False,
         "storage_mutated": False,
     }
 
 
-def cmd_inspect(args: argparse.Namespace) -> int:
-    _, report = inspect_projection(args)
-    print(json.dumps(report, indent=2, sort_keys=True))
-    return 0
+def inspect_projection(
+    args: argparse.Namespace,
+) -> tuple[ProjectionExport, dict[str, Any]]:
+    repo = _repo_path(args.repo)
+    ledger = _resolve_binary(args.ledger_bin, "LEDGER_BIN", "ledger")
+    doctor, doctor_cached = check_source_store(
+        ledger=ledger,
+        repo=repo,
+        home=codex_home(args.codex_home),
+        fresh=args.fresh_doctor,
+    )
+    export = export_projection(args.id, kind=args.kind, ledger=ledger, repo=repo)
+    try:
+        report = inspection_report(
+            export,
+            neg_id=args.id,
+            kind=args.kind,
+            doctor=doctor,
+            doctor_cached=doctor_cached,
+        )
+    except BaseException:
+        export.close()
+        raise
+    return export, report
 
 
-def cmd_admit(args: argparse.Namespace) -> int:
-    export_raw, _ = inspect_projection(args)
-    repo = Path(args.repo).expanduser().resolve()
-    memory_note = _resolve_binary(
-        args.memory_note_bin, "MEMORY_NOTE_BIN", "memory-note"
-    )
+def append_projection(
+    export: ProjectionExport,
+    *,
+    kind: str,
+    memory_note: str,
+    repo: Path,
+    codex_home: str | None,
+    dry_run: bool,
+) -> tuple[subprocess.CompletedProcess[bytes], dict[str, Any]]:
     argv = [
         memory_note,
         "append",
         "--extension",
         "negative-ledger",
         "--kind",
-        args.kind,
+        kind,
         "--json",
         "-",
     ]
-    if args.codex_home:
-        argv.extend(["--codex-home", args.codex_home])
-    if args.dry_run:
+    if codex_home:
+        argv.extend(["--codex-home", codex_home])
+    if dry_run:
         argv.append("--dry-run")
-    proc = _run(argv, cwd=repo, input_bytes=export_raw)
+    proc = _run(argv, cwd=repo, **export.stdin_arguments())
     stdout = _require_success(proc, "memory-note append")
     result = _parse_json(stdout, "memory-note append")
     if not isinstance(result, dict):
         raise AdapterError("memory-note append: expected object result")
-    sys.stdout.buffer.write(stdout)
+    return proc, result
+
+
+def cmd_inspect(args: argparse.Namespace) -> int:
+    export, report = inspect_projection(args)
+    export.close()
+    print(json.dumps(report, indent=2, sort_keys=True))
+    return 0
+
+
+def cmd_admit(args: argparse.Namespace) -> int:
+    export, _ = inspect_projection(args)
+    try:
+        proc, _ = append_projection(
+            export,
+            kind=args.kind,
+            memory_note=_resolve_binary(
+                args.memory_note_bin, "MEMORY_NOTE_BIN", "memory-note"
+            ),
+            repo=Path(args.repo).expanduser().resolve(),
+            codex_home=args.codex_home,
+            dry_run=args.dry_run,
+        )
+    finally:
+        export.close()
+    sys.stdout.buffer.write(proc.stdout)
     if proc.stderr:
         sys.stderr.buffer.write(proc.stderr)
     return 0
 
 
+def _read_input(value: str) -> str:
+    if value == "-":
+        return sys.stdin.read()
+    try:
+        return Path(value).expanduser().read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as exc:
+        raise AdapterError(f"{value}: {exc}") from exc
+
+
+def reconcile_eligible_ids(text: str) -> list[str]:
+    """Return Negative Ledger ids the reconciler classified eligible-unadmitted.
+
+    Accepts the reconciler's buffered JSON report or its NDJSON stream. A
+    stream is recognized by the schema of its first line, a record or the
+    closing summary, so a stream with no records yields no ids.
+    """
+    lines = [
+        (number, line)
+        for number, line in enumerate(text.splitlines(), start=1)
+        if line.strip()
+    ]
+    try:
+        first = json.loads(lines[0][1]) if lines else None
+    except json.JSONDecodeError:
+        first = None
+    if not (
+        isinstance(first, dict)
+        and first.get("schema") in (RECONCILE_RECORD_SCHEMA, RECONCILE_SCHEMA)
+    ):
+        try:
+            report = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise AdapterError(
+                f"reconcile report: {exc}; use --format json or ndjson"
+            ) from exc
+        rows = _reconcile_report_records(report)
+        if rows is None:
+            raise AdapterError(
+                "reconcile report: no negative-ledger records; "
+                "use --format json or ndjson"
+            )
+    else:
+        rows = []
+        for number, line in lines:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise AdapterError(f"reconcile report line {number}: {exc}") from exc
+            if not isinstance(row, dict):
+                continue
+            if row.get("schema") == RECONCILE_RECORD_SCHEMA:
+                if row.get("source") == "negative-ledger":
+                    rows.append(row)
+            else:
+                # The streamed summary carries no records; a compacted
+                # buffered report on one line does.
+                rows.extend(_reconcile_report_records(row) or [])
+    return [
+        row["record_id"]
+        for row in rows
+        if isinstance(row, dict)
+        and row.get("status") == "eligible-unadmitted"
+        and isinstance(row.get("record_id"), str)
+    ]
+
+
+def _reconcile_report_records(report: Any) -> list[Any] | None:
+    if not isinstance(report, dict) or not isinstance(report.get("sources"), dict):
+        return None
+    source = report["sources"].get("negative-ledger")
+    if not isinstance(source, dict) or not isinstance(source.get("records"), list):
+        return None
+    return source["records"]
+
+
+def batch_ids(args: argparse.Namespace) -> list[str]:
+    if args.ids_file == "-" and args.from_reconcile == "-":
+        raise AdapterError("--ids-file and --from-reconcile cannot both read stdin")
+    ids = list(args.id or [])
+    if args.ids_file:
+        for line in _read_input(args.ids_file).splitlines():
+            value = line.strip()
+            if value and not value.startswith("#"):
+                ids.append(value)
+    if args.from_reconcile:
+        ids.extend(reconcile_eligible_ids(_read_input(args.from_reconcile)))
+    return list(dict.fromkeys(ids))
+
+
+def _emit_receipt(value: dict[str, Any]) -> None:
+    sys.stdout.write(json.dumps(value, sort_keys=True, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+
+def prepare_admission(
+    neg_id: str,
+    *,
+    kind: str,
+    ledger: str,
+    repo: Path,
+    dry_run: bool,
+) -> tuple[dict[str, Any], ProjectionExport | None]:
+    """Export and validate one id; a failure yields a blocked receipt."""
+    receipt: dict[str, Any] = {
+        "schema": RECEIPT_SCHEMA,
+        "neg_id": neg_id,
+        "kind": kind,
+        "dry_run": dry_run,
+        "canonical_rollback": False,
+    }
+    try:
+        export = export_projection(neg_id, kind=kind, ledger=ledger, repo=repo)
+    except AdapterError as exc:
+        return {**receipt, "verdict": "blocked", "error": str(exc)}, None
+    payload = export.envelope["payload"]
+    receipt["projection_status"] = payload.get("status")
+    receipt["projection_fingerprint"] = payload.get("projection_fingerprint")
+    receipt["writer_fingerprint"] = export.writer_fingerprint
+    return receipt, export
+
+
+def complete_admission(
+    receipt: dict[str, Any],
+    export: ProjectionExport | None,
+    *,
+    memory_note: str,
+    repo: Path,
+    codex_home: str | None,
+) -> dict[str, Any]:
+    if export is None:
+        return receipt
+    try:
+        proc, result = append_projection(
+            export,
+            kind=receipt["kind"],
+            memory_note=memory_note,
+            repo=repo,
+            codex_home=codex_home,
+            dry_run=receipt["dry_run"],
+        )
+    except AdapterError as exc:
+        return {**receipt, "verdict": "blocked", "error": str(exc)}
+    finally:
+        export.close()
+    if proc.stderr:
+        sys.stderr.buffer.write(proc.stderr)
+    return {**receipt, "verdict": "admitted", "result": result}
+
+
+def _discard_pending(
+    pending: collections.deque[Future[tuple[dict[str, Any], ProjectionExport | None]]],
+) -> None:
+    """Cancel or wait out exports left behind by an early exit, closing their spools."""
+    while pending:
+        future = pending.popleft()
+        if future.cancel() or future.exception() is not None:
+            continue
+        _, export = future.result()
+        if export is not None:
+            export.close()
+
+
+def cmd_admit_batch(args: argparse.Namespace) -> int:
+    ids = batch_ids(args)
+    if not ids:
+        raise AdapterError("admit-batch: no ids to admit")
+    if args.workers < 1:
+        raise AdapterError("admit-batch: --workers must be at least 1")
+    repo = _repo_path(args.repo)
+    ledger = _resolve_binary(args.ledger_bin, "LEDGER_BIN", "ledger")
+    memory_note = _resolve_binary(
+        args.memory_note_bin, "MEMORY_NOTE_BIN", "memory-note"
+    )
+    doctor, doctor_cached = check_source_store(
+        ledger=ledger,
+        repo=repo,
+        home=codex_home(args.codex_home),
+        fresh=args.fresh_doctor,
+    )
+    blocked = 0
+    # Workers export and validate ahead of the append cursor; at most
+    # `workers` ids are in flight, and appends run here in id order.
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        pending: collections.deque[
+            Future[tuple[dict[str, Any], ProjectionExport | None]]
+        ] = collections.deque()
+        queued = iter(ids)
+
+        def submit_next() -> None:
+            neg_id = next(queued, None)
+            if neg_id is not None:
+                pending.append(
+                    pool.submit(
+                        prepare_admission,
+                        neg_id,
+                        kind=args.kind,
+                        ledger=ledger,
+                        repo=repo,
+                        dry_run=args.dry_run,
+                    )
+                )
+
+        for _ in range(args.workers):
+            submit_next()
+        try:
+            while pending:
+                receipt, export = pending.popleft().result()
+                submit_next()
+                receipt = complete_admission(
+                    receipt,
+                    export,
+                    memory_note=memory_note,
+                    repo=repo,
+                    codex_home=args.codex_home,
+                )
+                blocked += receipt["verdict"] == "blocked"
+                _emit_receipt(receipt)
+        finally:
+            _discard_pending(pending)
+    _emit_receipt(
+        {
+            "schema": BATCH_SCHEMA,
+            "verdict": "blocked" if blocked else "ok",
+            "requested": len(ids),
+            "admitted": len(ids) - blocked,
+            "blocked": blocked,
+            "dry_run": args.dry_run,
+            "doctor": doctor,
+            "doctor_cached": doctor_cached,
+            "authority_granted": False,
+        }
+    )
+    return 2 if blocked else 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
-        description="Validate and transport a source-authorized Negative Ledger projection"
+        description="Validate and transport source-authorized Negative Ledger projections"
     )
     sub = parser.add_subparsers(dest="command", required=True)
-    for name, handler in (("inspect", cmd_inspect), ("admit", cmd_admit)):
+    for name, handler in (
+        ("inspect", cmd_inspect),
+        ("admit", cmd_admit),
+        ("admit-batch", cmd_admit_batch),
+    ):
         command = sub.add_parser(name)
-        command.add_argument("--id", required=True)
+        if name == "admit-batch":
+            command.add_argument("--id", action="append")
+            command.add_argument(
+                "--ids-file", help="One NEG id per line; '-' reads stdin"
+            )
+            command.add_argument(
+                "--from-reconcile",
+                help="Reconciler JSON or NDJSON output; admits eligible-unadmitted rows",
+            )
+            command.add_argument(
+                "--workers",
+                type=int,
+                default=PIPELINE_WORKERS,
+                help="Ids exported and validated ahead of the in-order appends",
+            )
+        else:
+            command.add_argument("--id", required=True)
         command.add_argument(
             "--kind", choices=sorted(ALLOWED_KINDS), default="ledger-projection"
         )
         command.add_argument("--repo", default=".")
         command.add_argument("--ledger-bin")
-        if name == "admit":
+        command.add_argument("--codex-home")
+        command.add_argument(
+            "--fresh-doctor",
+            action="store_true",
+            help="Rerun ledger doctor instead of reusing a cached healthy verdict",
+        )
+        if name != "inspect":
             command.add_argument("--memory-note-bin")
-            command.add_argument("--codex-home")
             command.add_argument("--dry-run", action="store_true")
         command.set_defaults(func=handler)
     return parser
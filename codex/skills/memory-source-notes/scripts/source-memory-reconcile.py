@@ -4,16 +4,21 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import hashlib
+import heapq
 import importlib.util
 import json
+import mmap
 import os
 import re
 import shutil
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 from urllib.parse import urlparse
 
 SOURCES = ("learnings", "synesthesia", "negative-ledger")
@@ -39,7 +44,10 @@ SOURCE_DEFINITION_IDS = {
     "synesthesia": "synesthesia/protocol",
 }
 MEMORY_NOTE_PROJECTIONS = {source: "memory-note" for source in SOURCES}
+RECORD_SCHEMA = "source-memory-reconciliation-record/v2"
+SLOWEST_INVOCATIONS = 10
 TOKEN_CHARS = r"A-Za-z0-9_-"
+TOKEN_RUN = re.compile(rf"[{TOKEN_CHARS}]+".encode())
 
 
 class ReconcileError(RuntimeError):
@@ -53,11 +61,107 @@ def resolve_binary(explicit: str | None, env_name: str, name: str) -> str:
     return value
 
 
+class Timings:
+    """Opt-in wall-time and subprocess accounting for one reconciliation.
+
+    Stage time is exclusive: a nested stage pauses its parent, so the stage
+    totals partition the instrumented run.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.binaries: dict[str, dict[str, Any]] = {}
+        self.slowest: list[tuple[float, int, dict[str, Any]]] = []
+        self._stack: list[list[Any]] = []
+        self._sequence = 0
+        # The adapter may report validator subprocesses from worker threads.
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        now = time.perf_counter()
+        if self._stack:
+            self._charge(self._stack[-1], now)
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._charge(self._stack.pop(), now)
+            if self._stack:
+                self._stack[-1][1] = now
+
+    def _charge(self, frame: list[Any], now: float) -> None:
+        self.stages[frame[0]] = self.stages.get(frame[0], 0.0) + now - frame[1]
+
+    def record(
+        self, argv: list[str], elapsed: float, proc: subprocess.CompletedProcess[Any]
+    ) -> None:
+        with self._lock:
+            self._record(argv, elapsed, proc)
+
+    def _record(
+        self, argv: list[str], elapsed: float, proc: subprocess.CompletedProcess[Any]
+    ) -> None:
+        binary = Path(argv[0]).name
+        read = sum(
+            len(value.encode() if isinstance(value, str) else value)
+            for value in (proc.stdout, proc.stderr)
+            if value
+        )
+        row = self.binaries.setdefault(
+            binary, {"invocations": 0, "bytes_read": 0, "wall_sec": 0.0}
+        )
+        row["invocations"] += 1
+        row["bytes_read"] += read
+        row["wall_sec"] += elapsed
+        self._sequence += 1
+        invocation = {
+            "command": " ".join([binary, *argv[1:3]]),
+            "stage": self._stack[-1][0] if self._stack else None,
+            "wall_sec": round(elapsed, 6),
+            "bytes_read": read,
+            "exit_code": proc.returncode,
+        }
+        entry = (elapsed, -self._sequence, invocation)
+        if len(self.slowest) < SLOWEST_INVOCATIONS:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heappushpop(self.slowest, entry)
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "total_wall_sec": round(time.perf_counter() - self.started, 6),
+            "stages": {
+                name: {"wall_sec": round(elapsed, 6)}
+                for name, elapsed in sorted(self.stages.items())
+            },
+            "binaries": {
+                name: {**row, "wall_sec": round(row["wall_sec"], 6)}
+                for name, row in sorted(self.binaries.items())
+            },
+            "slowest_invocations": [
+                row for _, _, row in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+
+TIMINGS: Timings | None = None
+
+
+def stage(name: str) -> contextlib.AbstractContextManager[None]:
+    return TIMINGS.stage(name) if TIMINGS is not None else contextlib.nullcontext()
+
+
 def run_bytes(argv: list[str], *, cwd: Path) -> bytes:
+    started = time.perf_counter()
     try:
         proc = subprocess.run(argv, cwd=cwd, capture_output=True, check=False)
     except OSError as exc:
         raise ReconcileError(f"{Path(argv[0]).name}: {exc}") from exc
+    if TIMINGS is not None:
+        TIMINGS.record(argv, time.perf_counter() - started, proc)
     if proc.returncode:
         detail = (
             proc.stderr.decode("utf-8", errors="replace").strip()
@@ -234,9 +338,10 @@ def load_notes(
         "--codex-home",
         str(codex_home),
     ]
-    listing = memory_note_result(
-        run_json(argv, cwd=cwd), command="list", stage=f"memory-note list {source}"
-    )
+    with stage("list"):
+        listing = memory_note_result(
+            run_json(argv, cwd=cwd), command="list", stage=f"memory-note list {source}"
+        )
     rows = listing.get("notes")
     if listing.get("extension") != source or not isinstance(rows, list):
         raise ReconcileError(f"memory-note list {source}: invalid result")
@@ -264,11 +369,12 @@ def load_notes(
             "--codex-home",
             str(codex_home),
         ]
-        note = memory_note_result(
-            run_json(show, cwd=cwd),
-            command="show",
-            stage=f"memory-note show {note_id}",
-        )
+        with stage("show-fallbacks"):
+            note = memory_note_result(
+                run_json(show, cwd=cwd),
+                command="show",
+                stage=f"memory-note show {note_id}",
+            )
         if note.get("id") != note_id or note.get("extension") != source:
             raise ReconcileError(f"memory-note show {note_id}: invalid result")
         notes.append(note)
@@ -276,34 +382,51 @@ def load_notes(
     return notes, show_count
 
 
-def load_compiled_corpus(codex_home: Path) -> tuple[list[str], list[str]]:
-    root = codex_home / "memories"
-    paths = [root / "memory_summary.md", root / "MEMORY.md"]
-    skills = root / "skills"
-    if skills.is_dir():
-        try:
-            paths.extend(sorted(path for path in skills.rglob("*") if path.is_file()))
-        except OSError:
-            return [], [str(skills)]
-    texts: list[str] = []
-    unreadable: list[str] = []
-    for path in paths:
-        if not path.exists():
-            continue
-        try:
-            texts.append(path.read_text(encoding="utf-8"))
-        except (OSError, UnicodeDecodeError):
-            unreadable.append(str(path))
-    return texts, unreadable
-
-
-def contains_token(corpus: list[str], value: str | None) -> bool:
+def contains_token(corpus: Iterable[str | bytes | mmap.mmap], value: str | None) -> bool:
+    """Match an exact provenance token against text or mapped compiled memory."""
     if not value:
         return False
     pattern = re.compile(
-        rf"(?<![{TOKEN_CHARS}]){re.escape(value)}(?![{TOKEN_CHARS}])"
+        rf"(?<![{TOKEN_CHARS}]){re.escape(value)}(?![{TOKEN_CHARS}])".encode()
+    )
+    return any(
+        pattern.search(
+            document.encode("utf-8") if isinstance(document, str) else document
+        )
+        is not None
+        for document in corpus
     )
-    return any(pattern.search(text) is not None for text in corpus)
+
+
+def visible_tokens(
+    corpus: Iterable[str | bytes | mmap.mmap], values: Iterable[str | None]
+) -> set[str]:
+    """Return the values present as exact tokens, reading each document once.
+
+    A value made only of token characters matches exactly when it is a whole
+    token run, so one pass over every document's runs answers all of them.
+    Other values fall back to a ``contains_token`` scan each.
+    """
+    runs: dict[bytes, str] = {}
+    others: list[str] = []
+    for value in values:
+        if not value:
+            continue
+        encoded = value.encode("utf-8")
+        if TOKEN_RUN.fullmatch(encoded):
+            runs[encoded] = value
+        else:
+            others.append(value)
+    found: set[str] = set()
+    if runs:
+        for document in corpus:
+            data = document.encode("utf-8") if isinstance(document, str) else document
+            for match in TOKEN_RUN.finditer(data):
+                value = runs.get(match.group())
+                if value is not None:
+                    found.add(value)
+    found.update(value for value in others if contains_token(corpus, value))
+    return found
 
 
 def normalize_repository(value: str) -> str:
@@ -408,9 +531,11 @@ def classify_record(
     expected_fingerprint: str | None,
     export_error: str | None,
     eligibility: dict[str, str] | None,
-    compiled_corpus: list[str],
+    compiled_corpus: Iterable[str | bytes | mmap.mmap],
     unreadable_phase2: list[str],
+    compiled_tokens: set[str] | None = None,
 ) -> dict[str, Any]:
+    """Classify one record; ``compiled_tokens`` is a precomputed ``visible_tokens``."""
     note_id = note.get("id") if note else None
     note_fingerprint = note.get("fingerprint") if note else None
     current = bool(note and expected_fingerprint == note_fingerprint)
@@ -427,9 +552,14 @@ def classify_record(
     else:
         status = "needs-source-review"
 
-    visible = contains_token(compiled_corpus, record_id) or contains_token(
-        compiled_corpus, note_id if isinstance(note_id, str) else None
-    )
+    if compiled_tokens is not None:
+        visible = record_id in compiled_tokens or (
+            isinstance(note_id, str) and note_id in compiled_tokens
+        )
+    else:
+        visible = contains_token(compiled_corpus, record_id) or contains_token(
+            compiled_corpus, note_id if isinstance(note_id, str) else None
+        )
     if visible:
         phase2_status = "visible"
         visible_value: bool | None = True
@@ -569,13 +699,20 @@ def source_report(
     ledger: str,
     cwd: Path,
     eligibility: dict[str, dict[str, str]],
-    compiled_corpus: list[str],
+    compiled_corpus: Iterable[str | bytes | mmap.mmap],
     unreadable_phase2: list[str],
     synesthesia_adapter: Any,
     repository_identity: str | None,
     standalone_note_ids: set[str],
     fallback_show_count: int,
+    emit: Callable[[dict[str, Any]], None] | None = None,
+    compiled_tokens: set[str] | None = None,
 ) -> dict[str, Any]:
+    """Classify one source's records.
+
+    With ``emit``, each classified row is handed off as soon as it exists and
+    is not retained, so the report omits ``records`` and memory stays flat.
+    """
     local_notes, foreign_notes, unresolved_notes, unscoped_notes = partition_notes(
         notes, repository_identity
     )
@@ -591,7 +728,10 @@ def source_report(
     }
 
     rows: list[dict[str, Any]] = []
+    counts: dict[str, int] = {}
+    expected_fingerprints: set[str] = set()
     canonical_ids: set[str] = set()
+    classified = 0
     for record in records:
         record_id = canonical_record_id(source, record)
         canonical_ids.add(record_id)
@@ -604,11 +744,12 @@ def source_report(
             raise ReconcileError(f"{source} {record_id}: logical kind missing")
 
         should_export = source != "learnings" or bool(candidates) or record_id in eligibility
-        raw, export_error = (
-            native_export(ledger, source, record_id, cwd=cwd)
-            if should_export
-            else (None, None)
-        )
+        with stage("exports"):
+            raw, export_error = (
+                native_export(ledger, source, record_id, cwd=cwd)
+                if should_export
+                else (None, None)
+            )
         expected = None
         note = candidates[0] if candidates else None
         if raw is not None and source == "synesthesia":
@@ -636,21 +777,29 @@ def source_report(
                 if isinstance(kind, str):
                     expected = writer_fingerprint(source, kind, raw)
 
-        rows.append(
-            classify_record(
-                record_id=record_id,
-                note=note,
-                expected_fingerprint=expected,
-                export_error=export_error,
-                eligibility=eligibility.get(record_id),
-                compiled_corpus=compiled_corpus,
-                unreadable_phase2=unreadable_phase2,
-            )
+        row = classify_record(
+            record_id=record_id,
+            note=note,
+            expected_fingerprint=expected,
+            export_error=export_error,
+            eligibility=eligibility.get(record_id),
+            compiled_corpus=compiled_corpus,
+            unreadable_phase2=unreadable_phase2,
+            compiled_tokens=compiled_tokens,
         )
+        classified += 1
+        counts[row["status"]] = counts.get(row["status"], 0) + 1
+        if row["phase2_status"] == "lag":
+            counts["phase2-lag"] = counts.get("phase2-lag", 0) + 1
+        elif row["phase2_status"] == "unknown":
+            counts["phase2-unknown"] = counts.get("phase2-unknown", 0) + 1
+        if row["expected_fingerprint"]:
+            expected_fingerprints.add(row["expected_fingerprint"])
+        if emit is None:
+            rows.append(row)
+        else:
+            emit({"schema": RECORD_SCHEMA, "source": source, **row})
 
-    expected_fingerprints = {
-        row["expected_fingerprint"] for row in rows if row["expected_fingerprint"]
-    }
     orphans: list[str] = []
     for note in local_notes:
         note_id = note.get("id")
@@ -663,18 +812,12 @@ def source_report(
         if orphaned:
             orphans.append(note_id)
 
-    counts: dict[str, int] = {}
-    for row in rows:
-        counts[row["status"]] = counts.get(row["status"], 0) + 1
-    counts["phase2-lag"] = sum(row["phase2_status"] == "lag" for row in rows)
-    counts["phase2-unknown"] = sum(
-        row["phase2_status"] == "unknown" for row in rows
-    )
-    return {
-        "canonical_records": len(rows),
+    counts.setdefault("phase2-lag", 0)
+    counts.setdefault("phase2-unknown", 0)
+    report: dict[str, Any] = {
+        "canonical_records": classified,
         "admission_notes": len(local_notes),
         "counts": counts,
-        "records": rows,
         "orphan_note_ids": sorted(orphans),
         "standalone_compatible_note_ids": sorted(standalone_note_ids),
         "foreign_repo_note_ids": sorted(
@@ -688,9 +831,32 @@ def source_report(
         ),
         "fallback_show_count": fallback_show_count,
     }
+    if emit is None:
+        report["records"] = rows
+    return report
 
 
-def reconcile(args: argparse.Namespace) -> dict[str, Any]:
+def reconcile(
+    args: argparse.Namespace,
+    *,
+    emit: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    global TIMINGS
+    TIMINGS = Timings() if args.timings else None
+    try:
+        report = reconcile_sources(args, emit=emit)
+    finally:
+        timings, TIMINGS = TIMINGS, None
+    if timings is not None:
+        report["timings"] = timings.report()
+    return report
+
+
+def reconcile_sources(
+    args: argparse.Namespace,
+    *,
+    emit: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
     cwd = Path(args.repo).expanduser().resolve()
     if not cwd.is_dir():
         raise ReconcileError(f"repo: not a directory: {cwd}")
@@ -703,43 +869,48 @@ def reconcile(args: argparse.Namespace) -> dict[str, Any]:
         args.codex_home or os.environ.get("CODEX_HOME") or Path.home() / ".codex"
     ).expanduser().resolve()
     repository_identity = canonical_repository(cwd)
-    eligibility = load_eligibility(args.eligibility, ledger=ledger, cwd=cwd)
-    compiled_corpus, unreadable_phase2 = load_compiled_corpus(codex_home)
-
+    with stage("eligibility"):
+        eligibility = load_eligibility(args.eligibility, ledger=ledger, cwd=cwd)
+    adapter = load_synesthesia_adapter(
+        SKILLS_ROOT / "memory-source-notes/scripts/synesthesia_memory_note.py"
+    )
+    if TIMINGS is not None:
+        adapter.PROCESS_OBSERVER = TIMINGS.record
     doctors: dict[str, Any] = {}
-    for source in SOURCES:
-        doctors[source] = ledger_doctor(
+    with stage("doctors"):
+        for source in SOURCES:
+            doctors[source] = ledger_doctor(
+                run_json(
+                    [
+                        ledger,
+                        "doctor",
+                        "--definition",
+                        str(SOURCE_DEFINITIONS[source]),
+                        "--repo",
+                        str(cwd),
+                        "--format",
+                        "json",
+                    ],
+                    cwd=cwd,
+                ),
+                definition_id=SOURCE_DEFINITION_IDS[source],
+                stage=f"ledger doctor {source}",
+            )
+        doctors["memory-note"] = memory_note_result(
             run_json(
                 [
-                    ledger,
+                    memory_note,
                     "doctor",
-                    "--definition",
-                    str(SOURCE_DEFINITIONS[source]),
-                    "--repo",
-                    str(cwd),
                     "--format",
                     "json",
+                    "--codex-home",
+                    str(codex_home),
                 ],
                 cwd=cwd,
             ),
-            definition_id=SOURCE_DEFINITION_IDS[source],
-            stage=f"ledger doctor {source}",
+            command="doctor",
+            stage="memory-note doctor",
         )
-    doctors["memory-note"] = memory_note_result(
-        run_json(
-            [
-                memory_note,
-                "doctor",
-                "--format",
-                "json",
-                "--codex-home",
-                str(codex_home),
-            ],
-            cwd=cwd,
-        ),
-        command="doctor",
-        stage="memory-note doctor",
-    )
 
     notes: dict[str, list[dict[str, Any]]] = {}
     show_counts: dict[str, int] = {}
@@ -751,18 +922,20 @@ def reconcile(args: argparse.Namespace) -> dict[str, Any]:
             codex_home=codex_home,
             limit=args.limit,
         )
-    records = {
-        source: source_records(ledger, source, cwd=cwd, limit=args.limit)
-        for source in SOURCES
-    }
+    with stage("records"):
+        records = {
+            source: source_records(ledger, source, cwd=cwd, limit=args.limit)
+            for source in SOURCES
+        }
     validate_eligibility_ids(eligibility, records)
 
-    adapter = load_synesthesia_adapter(
-        SKILLS_ROOT / "memory-source-notes/scripts/synesthesia_memory_note.py"
-    )
-    stored_synesthesia, invalid_synesthesia, _, _ = adapter.load_stored_notes(
-        codex_home, ledger_bin=ledger
-    )
+    with stage("adapter-validation"):
+        # Read-only reuse: verdicts recorded by the adapter skip re-validation,
+        # and nothing learned here is written back.
+        _, validation_cache = adapter.open_validation_cache(codex_home, ledger)
+        stored_synesthesia, invalid_synesthesia, _, _ = adapter.load_stored_notes(
+            codex_home, ledger_bin=ledger, validation_cache=validation_cache
+        )
     if invalid_synesthesia:
         raise ReconcileError("synesthesia stored-note validation failed")
     if {note.get("id") for note in notes["synesthesia"]} != {
@@ -775,25 +948,48 @@ def reconcile(args: argparse.Namespace) -> dict[str, Any]:
         if note.validation_profile == "stored-legacy-corridor-v1"
     }
 
-    sources = {
-        source: source_report(
-            source,
-            records[source],
-            notes[source],
-            ledger=ledger,
-            cwd=cwd,
-            eligibility=eligibility[source],
-            compiled_corpus=compiled_corpus,
-            unreadable_phase2=unreadable_phase2,
-            synesthesia_adapter=adapter,
-            repository_identity=repository_identity,
-            standalone_note_ids=(
-                standalone_synesthesia if source == "synesthesia" else set()
-            ),
-            fallback_show_count=show_counts[source],
-        )
-        for source in SOURCES
-    }
+    with stage("compiled-corpus"):
+        compiled_corpus = adapter.load_compiled_corpus(codex_home)
+    unreadable_phase2 = compiled_corpus.unreadable
+    with compiled_corpus:
+        with stage("compiled-corpus"):
+            # One pass over compiled memory for every id a record could be
+            # matched by, instead of one pass per record.
+            compiled_tokens = visible_tokens(
+                compiled_corpus,
+                [
+                    value
+                    for source in SOURCES
+                    for value in (
+                        *(canonical_record_id(source, row) for row in records[source]),
+                        *(note.get("id") for note in notes[source]),
+                    )
+                    if isinstance(value, str)
+                ],
+            )
+        with stage("classification"):
+            sources = {
+                source: source_report(
+                    source,
+                    records[source],
+                    notes[source],
+                    ledger=ledger,
+                    cwd=cwd,
+                    eligibility=eligibility[source],
+                    compiled_corpus=compiled_corpus,
+                    unreadable_phase2=unreadable_phase2,
+                    synesthesia_adapter=adapter,
+                    repository_identity=repository_identity,
+                    standalone_note_ids=(
+                        standalone_synesthesia if source == "synesthesia" else set()
+                    ),
+                    fallback_show_count=show_counts[source],
+                    emit=emit,
+                    compiled_tokens=compiled_tokens,
+                )
+                for source in SOURCES
+            }
+        readable_documents = len(compiled_corpus)
     gaps = sum(
         report["counts"].get("eligible-unadmitted", 0)
         + report["counts"].get("stale-note", 0)
@@ -832,7 +1028,7 @@ def reconcile(args: argparse.Namespace) -> dict[str, Any]:
         "codex_home": str(codex_home),
         "limit": args.limit,
         "compiled_memory": {
-            "readable_documents": len(compiled_corpus),
+            "readable_documents": readable_documents,
             "unreadable_paths": unreadable_phase2,
         },
         "doctors": doctors,
@@ -869,6 +1065,20 @@ def print_text(report: dict[str, Any]) -> None:
             print("  unscoped notes: " + ", ".join(value["unscoped_note_ids"]))
     summary = report["summary"]
     print("summary: " + " ".join(f"{key}={value}" for key, value in summary.items()))
+    if "timings" in report:
+        timings = report["timings"]
+        print(
+            "timings: "
+            + " ".join(
+                f"{name}={row['wall_sec']:.3f}s"
+                for name, row in timings["stages"].items()
+            )
+        )
+        for name, row in timings["binaries"].items():
+            print(
+                f"  {name}: invocations={row['invocations']} "
+                f"bytes_read={row['bytes_read']} wall={row['wall_sec']:.3f}s"
+            )
     if report["compiled_memory"]["unreadable_paths"]:
         print("unreadable Phase 2 paths:")
         for path in report["compiled_memory"]["unreadable_paths"]:
@@ -883,14 +1093,31 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--ledger-bin")
     parser.add_argument("--memory-note-bin")
     parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
-    parser.add_argument("--format", choices=("json", "text"), default="json")
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Add per-stage wall time and per-binary subprocess accounting",
+    )
+    parser.add_argument(
+        "--format", choices=("json", "ndjson", "text"), default="json"
+    )
     return parser
 
 
+def emit_ndjson(value: dict[str, Any]) -> None:
+    sys.stdout.write(
+        json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        + "\n"
+    )
+    sys.stdout.flush()
+
+
 def main() -> int:
     args = build_parser().parse_args()
     try:
-        report = reconcile(args)
+        report = reconcile(
+            args, emit=emit_ndjson if args.format == "ndjson" else None
+        )
     except ReconcileError as exc:
         print(
             json.dumps(
@@ -912,6 +1139,8 @@ def main() -> int:
         return 2
     if args.format == "text":
         print_text(report)
+    elif args.format == "ndjson":
+        emit_ndjson(report)
     else:
         print(json.dumps(report, indent=2, sort_keys=True))
     return 0
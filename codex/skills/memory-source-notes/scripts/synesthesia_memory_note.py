@@ -8,19 +8,26 @@ regular copy. It never creates or follows a symlink in the live extension path.
 from __future__ import annotations
 
 import argparse
+import codecs
+import contextlib
 import copy
+import fcntl
 import hashlib
 import json
+import mmap
 import os
 import re
 import shutil
+import sqlite3
 import stat
 import subprocess
 import sys
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
 LOGICAL_TO_PHYSICAL_KIND = {
     "mapping-endorsement": "mapping-endorsement",
@@ -45,6 +52,38 @@ class ValidationError(ValueError):
     """A deterministic validation failure suitable for user-facing reporting."""
 
 
+class StructuralRejection(ValidationError):
+    """Ledger ran and rejected the submission under the current definition."""
+
+
+# Thread-pool widths for stored-note reads and validator subprocesses. Both
+# are I/O-bound, and results are always collected in input order.
+LOAD_WORKERS = min(8, os.cpu_count() or 1)
+VALIDATION_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def _ordered_map(
+    function: Callable[[Any], Any], items: list[Any], workers: int
+) -> list[Any]:
+    """Map ``function`` over ``items`` in order, on threads when that can help."""
+    if workers <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+        return list(executor.map(function, items))
+
+
+# Optional in-process observer, e.g. the reconciler's timing accounting.
+PROCESS_OBSERVER: Callable[[list[str], float, subprocess.CompletedProcess[Any]], None] | None = None
+
+
+def _run_process(argv: list[str], **kwargs: Any) -> subprocess.CompletedProcess[Any]:
+    started = time.perf_counter()
+    proc = subprocess.run(argv, **kwargs)
+    if PROCESS_OBSERVER is not None:
+        PROCESS_OBSERVER(argv, time.perf_counter() - started, proc)
+    return proc
+
+
 def _trim_if_string(value: Any) -> Any:
     return value.strip() if isinstance(value, str) else value
 
@@ -150,49 +189,16 @@ def synesthesia_source_definition_path() -> Path:
     )
 
 
-def _validate_submission_with_ledger(
-    submission: dict[str, Any],
-    *,
-    stored_note: Any | None = None,
-    ledger_bin: str | Path | None = None,
+def _validation_command(binary: Path, definition: Path, *inputs: str) -> list[str]:
+    command = [str(binary), "validate", "--definition", str(definition)]
+    for value in inputs:
+        command.extend(["--input", value])
+    return [*command, "--format", "json"]
+
+
+def _validation_verdict(
+    proc: subprocess.CompletedProcess[bytes], expected_digest: str | None = None
 ) -> dict[str, Any]:
-    binary = find_ledger_binary(ledger_bin)
-    if binary is None:
-        raise ValidationError(
-            "ledger: Ledger 1.x with ledger-artifact-abi/v1 is required"
-        )
-    definition = synesthesia_definition_path()
-    if not definition.is_file():
-        raise ValidationError(f"ledger: definition not found: {definition}")
-    command = [
-        str(binary),
-        "validate",
-        "--definition",
-        str(definition),
-    ]
-    input_bytes: bytes | None = canonical_json_bytes(submission)
-    if stored_note is None:
-        command.extend(["--input", "submission=-"])
-        proc = subprocess.run(
-            [*command, "--format", "json"],
-            input=input_bytes,
-            capture_output=True,
-            check=False,
-        )
-    else:
-        documents: dict[str, Any] = {"submission": submission}
-        if stored_note is not None:
-            documents["stored_note"] = stored_note
-        with tempfile.TemporaryDirectory(prefix="synesthesia-ledger-validation-") as root:
-            for name, value in documents.items():
-                path = Path(root) / f"{name}.json"
-                path.write_bytes(canonical_json_bytes(value))
-                command.extend(["--input", f"{name}={path}"])
-            proc = subprocess.run(
-                [*command, "--format", "json"],
-                capture_output=True,
-                check=False,
-            )
     try:
         result = json.loads(proc.stdout)
     except (UnicodeDecodeError, json.JSONDecodeError) as exc:
@@ -211,6 +217,8 @@ def _validate_submission_with_ledger(
         or result.get("storage_mutated") is not False
     ):
         raise ValidationError("ledger: unexpected structural validation result")
+    if expected_digest is not None and definition_result.get("digest") != expected_digest:
+        raise ValidationError("ledger: definition digest changed since definition check")
     if proc.returncode != 0 or result.get("valid") is not True:
         errors = result.get("errors")
         detail = (
@@ -220,7 +228,7 @@ def _validate_submission_with_ledger(
             and isinstance(errors[0], dict)
             else "definition rejected the submission"
         )
-        raise ValidationError(
+        raise StructuralRejection(
             "structurally invalid under "
             f"{definition_result.get('id')}@{definition_result.get('digest')}: "
             f"{detail}"
@@ -228,9 +236,94 @@ def _validate_submission_with_ledger(
     return result
 
 
-def _require_synesthesia_validator(
-    ledger_bin: str | Path | None = None,
-) -> Path:
+class ValidatorSession:
+    """The Ledger structural validator shared by one adapter process.
+
+    Ledger has no long-lived validation server, and the ledger skill rules out
+    local stand-ins for its decisions, so every submission is still one
+    ``ledger validate``. A session resolves the binary and definition once and
+    runs ``ledger definition check`` once per binary and definition file
+    state. Digest, doctor, append, lineage-index and reconcile paths in the same
+    process all share it, and each verdict must name the checked definition
+    digest.
+    """
+
+    __slots__ = ("binary", "definition", "_checked", "_stamp")
+
+    def __init__(self, binary: Path, definition: Path) -> None:
+        self.binary = binary
+        self.definition = definition
+        self._checked: dict[str, Any] | None = None
+        self._stamp: tuple[tuple[int, int, int], ...] | None = None
+
+    def _file_stamp(self) -> tuple[tuple[int, int, int], ...]:
+        stamps = []
+        for path in (self.binary, self.definition):
+            path_stat = path.stat()
+            stamps.append((path_stat.st_ino, path_stat.st_size, path_stat.st_mtime_ns))
+        return tuple(stamps)
+
+    def _expected_digest(self) -> str | None:
+        if self._checked is None or self._stamp != self._file_stamp():
+            return None
+        return self._checked.get("digest")
+
+    def check_definition(self) -> dict[str, Any]:
+        """Return the definition identity, checking it again only after a file change."""
+        stamp = self._file_stamp()
+        if self._checked is None or stamp != self._stamp:
+            self._checked = _run_definition_check(self.binary, self.definition)
+            self._stamp = stamp
+        return self._checked
+
+    def validate(self, submission: dict[str, Any]) -> dict[str, Any]:
+        proc = _run_process(
+            _validation_command(self.binary, self.definition, "submission=-"),
+            input=canonical_json_bytes(submission),
+            capture_output=True,
+            check=False,
+        )
+        return _validation_verdict(proc, self._expected_digest())
+
+    def validate_stored(
+        self, items: list[tuple[dict[str, Any], Any]]
+    ) -> list[dict[str, Any] | ValidationError]:
+        """Validate (submission, stored note) pairs and map each verdict back.
+
+        The stored-note documents share one temporary directory, submissions
+        go on stdin, and up to ``VALIDATION_WORKERS`` validators run at a time.
+        """
+        if not items:
+            return []
+        expected_digest = self._expected_digest()
+        with tempfile.TemporaryDirectory(prefix="synesthesia-ledger-validation-") as root:
+
+            def validate(indexed: tuple[int, tuple[dict[str, Any], Any]]) -> Any:
+                index, (submission, stored_note) = indexed
+                path = Path(root) / f"stored_note-{index}.json"
+                path.write_bytes(canonical_json_bytes(stored_note))
+                proc = _run_process(
+                    _validation_command(
+                        self.binary, self.definition, "submission=-", f"stored_note={path}"
+                    ),
+                    input=canonical_json_bytes(submission),
+                    capture_output=True,
+                    check=False,
+                )
+                path.unlink()
+                try:
+                    return _validation_verdict(proc, expected_digest)
+                except ValidationError as exc:
+                    return exc
+
+            return _ordered_map(validate, list(enumerate(items)), VALIDATION_WORKERS)
+
+
+_VALIDATOR_SESSIONS: dict[tuple[str, str], ValidatorSession] = {}
+
+
+def validator_session(ledger_bin: str | Path | None = None) -> ValidatorSession:
+    """Return this process's validator session for the selected Ledger binary."""
     binary = find_ledger_binary(ledger_bin)
     if binary is None:
         raise ValidationError(
@@ -239,7 +332,56 @@ def _require_synesthesia_validator(
     definition = synesthesia_definition_path()
     if not definition.is_file():
         raise ValidationError(f"ledger: definition not found: {definition}")
-    proc = subprocess.run(
+    key = (str(binary), str(definition))
+    session = _VALIDATOR_SESSIONS.get(key)
+    if session is None:
+        session = _VALIDATOR_SESSIONS[key] = ValidatorSession(binary, definition)
+    return session
+
+
+def _validate_submission_with_ledger(
+    submission: dict[str, Any],
+    *,
+    stored_note: Any | None = None,
+    ledger_bin: str | Path | None = None,
+) -> dict[str, Any]:
+    session = validator_session(ledger_bin)
+    if stored_note is None:
+        return session.validate(submission)
+    verdict = session.validate_stored([(submission, stored_note)])[0]
+    if isinstance(verdict, ValidationError):
+        raise verdict
+    return verdict
+
+
+def _validate_stored_batch(
+    items: list[tuple[dict[str, Any], Any]],
+    *,
+    ledger_bin: str | Path | None = None,
+) -> list[dict[str, Any] | ValidationError]:
+    if not items:
+        return []
+    return validator_session(ledger_bin).validate_stored(items)
+
+
+def _require_synesthesia_validator(
+    ledger_bin: str | Path | None = None,
+) -> Path:
+    binary, _ = _check_synesthesia_definition(ledger_bin)
+    return binary
+
+
+def _check_synesthesia_definition(
+    ledger_bin: str | Path | None = None,
+) -> tuple[Path, dict[str, Any]]:
+    """Return the binary and definition identity from the session's checked definition."""
+    session = validator_session(ledger_bin)
+    return session.binary, session.check_definition()
+
+
+def _run_definition_check(binary: Path, definition: Path) -> dict[str, Any]:
+    """Run ``ledger definition check`` and return the definition identity."""
+    proc = _run_process(
         [
             str(binary),
             "definition",
@@ -273,7 +415,7 @@ def _require_synesthesia_validator(
         or definition_result.get("abi") != "ledger-artifact-abi/v1"
     ):
         raise ValidationError("ledger: unexpected definition check result")
-    return binary
+    return definition_result
 
 
 def _inspect_source_ledger(repo: Path) -> dict[str, Any]:
@@ -297,7 +439,7 @@ def _inspect_source_ledger(repo: Path) -> dict[str, Any]:
         report["error"] = f"repo is not a directory: {repo}"
         return report
 
-    proc = subprocess.run(
+    proc = _run_process(
         [
             str(binary),
             "doctor",
@@ -594,13 +736,274 @@ SCOPE_SPECIFICITY = {
 }
 
 
-def _stored_note_from_value(
-    path: Path,
-    value: Any,
-    file_sha256: str,
-    *,
-    ledger_bin: str | Path | None = None,
-) -> StoredNote:
+VALIDATION_CACHE_SCHEMA = "synesthesia-validation-cache/v2"
+VALIDATION_CACHE_FILENAME = ".validation-cache.json"
+PROJECTION_STATE_SCHEMA = "synesthesia-projection-state/v1"
+PROJECTION_STATE_FILENAME = ".projection-state.json"
+DIGEST_MANIFEST_SCHEMA = "synesthesia-digest-manifest/v1"
+DIGEST_MANIFEST_FILENAME = ".digest-manifest.json"
+DIGEST_DIRTY_FILENAME = ".digest-dirty.json"
+DIGEST_QUEUE_LOCK_FILENAME = ".digest-queue.lock"
+DIGEST_LOCK_FILENAME = ".digest.lock"
+DIGEST_WORKER_LOCK_FILENAME = ".digest-worker.lock"
+# Coalesced refresh after append: wait for this much quiet after the last
+# append, but never longer than the max delay after the first unrefreshed one.
+DIGEST_QUIET_SEC = 2.0
+DIGEST_MAX_DELAY_SEC = 30.0
+SHARD_INDEX_SCHEMA = "synesthesia-digest-shards/v1"
+SHARD_INDEX_FILENAME = "index.json"
+LINEAGE_INDEX_SCHEMA = "synesthesia-lineage-index/v1"
+LINEAGE_INDEX_FILENAME = ".lineage-index.sqlite3"
+
+
+def _read_resource_json(path: Path) -> Any | None:
+    """Read a regular, non-symlinked JSON resource; ``None`` when unusable."""
+    try:
+        ensure_no_symlink_components(path)
+        descriptor = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    except (OSError, ValidationError):
+        return None
+    try:
+        with os.fdopen(descriptor, "rb") as handle:
+            if not stat.S_ISREG(os.fstat(handle.fileno()).st_mode):
+                return None
+            return json.loads(handle.read())
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return None
+
+
+class ValidationCache:
+    """Ledger verdicts keyed by (file_sha256, validation profile, definition digest).
+
+    Notes are immutable, so a file Ledger accepted or structurally rejected
+    under the current definition digest needs no second ``ledger validate``.
+    Only ``StructuralRejection`` verdicts are cached as rejections; a validator
+    that could not run leaves no entry. The cache holds one definition digest
+    at a time; opening it under another digest starts empty, and saving then
+    drops every verdict recorded under the old definition.
+    """
+
+    __slots__ = ("path", "definition_digest", "_verdicts", "_dirty")
+
+    def __init__(
+        self,
+        path: Path,
+        definition_digest: str,
+        verdicts: dict[str, str | None] | None = None,
+    ) -> None:
+        self.path = path
+        self.definition_digest = definition_digest
+        self._verdicts = dict(verdicts or {})
+        self._dirty = False
+
+    @staticmethod
+    def key(file_sha256: str, validation_profile: str) -> str:
+        return f"{file_sha256}:{validation_profile}"
+
+    @classmethod
+    def open(cls, home: Path, definition_digest: str) -> ValidationCache:
+        path = resources_directory(home) / VALIDATION_CACHE_FILENAME
+        cache = cls(path, definition_digest)
+        value = _read_resource_json(path)
+        if (
+            isinstance(value, dict)
+            and value.get("schema") == VALIDATION_CACHE_SCHEMA
+            and value.get("definition_digest") == definition_digest
+            and isinstance(value.get("verdicts"), dict)
+        ):
+            cache._verdicts = {
+                key: error
+                for key, error in value["verdicts"].items()
+                if isinstance(key, str) and (error is None or isinstance(error, str))
+            }
+        return cache
+
+    def __len__(self) -> int:
+        return len(self._verdicts)
+
+    def lookup(
+        self, file_sha256: str, validation_profile: str
+    ) -> tuple[bool, StructuralRejection | None]:
+        """Return ``(hit, rejection)``; a hit without a rejection is a pass."""
+        key = self.key(file_sha256, validation_profile)
+        if key not in self._verdicts:
+            return False, None
+        error = self._verdicts[key]
+        return True, None if error is None else StructuralRejection(error)
+
+    def record(
+        self,
+        file_sha256: str,
+        validation_profile: str,
+        rejection: StructuralRejection | None = None,
+    ) -> None:
+        key = self.key(file_sha256, validation_profile)
+        error = None if rejection is None else str(rejection)
+        if key not in self._verdicts or self._verdicts[key] != error:
+            self._verdicts[key] = error
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        _atomic_write_regular(
+            self.path,
+            canonical_json_bytes(
+                {
+                    "schema": VALIDATION_CACHE_SCHEMA,
+                    "definition_digest": self.definition_digest,
+                    "verdicts": self._verdicts,
+                }
+            ),
+            secure_parent=True,
+        )
+        self._dirty = False
+
+
+def open_validation_cache(
+    home: Path, ledger_bin: str | Path | None = None
+) -> tuple[Path, ValidationCache | None]:
+    """Check the definition once and open the verdict cache for its digest."""
+    binary, definition = _check_synesthesia_definition(ledger_bin)
+    digest = definition.get("digest")
+    if not isinstance(digest, str) or not digest:
+        return binary, None
+    return binary, ValidationCache.open(home, digest)
+
+
+class ProjectionState:
+    """Folded lineage state for the valid notes already applied to the digest.
+
+    Lineages reference notes by id, so the state resumes only while the notes
+    it applied are still the unchanged leading run of the current
+    ``(captured_at, id)`` order and every other note sorts after its
+    high-water mark. Appending notes then folds just the new ones; a removed,
+    edited, newly rejected or backdated note replays the fold from scratch,
+    as does a changed generator or definition.
+    """
+
+    __slots__ = ("path", "generator", "_state", "_dirty")
+
+    def __init__(
+        self,
+        path: Path,
+        generator: dict[str, Any],
+        state: dict[str, Any] | None = None,
+    ) -> None:
+        self.path = path
+        self.generator = generator
+        self._state = state
+        self._dirty = False
+
+    @classmethod
+    def open(cls, home: Path) -> ProjectionState:
+        path = resources_directory(home) / PROJECTION_STATE_FILENAME
+        generator = _digest_generator_key()
+        value = _read_resource_json(path)
+        if (
+            isinstance(value, dict)
+            and value.get("schema") == PROJECTION_STATE_SCHEMA
+            and all(value.get(key) == expected for key, expected in generator.items())
+        ):
+            return cls(path, generator, value)
+        return cls(path, generator)
+
+    def resume(
+        self, home: Path, notes: list[StoredNote]
+    ) -> tuple[int, dict[str, dict[str, Any]], dict[str, str], list[dict[str, Any]]] | None:
+        """Return ``(applied, lineages, note_to_lineage, unresolved)`` or ``None``."""
+        state = self._state
+        if state is None or state.get("notes_directory") != str(notes_directory(home)):
+            return None
+        try:
+            applied = state["applied"]
+            count = len(applied)
+            if count > len(notes) or any(
+                [note.id, note.file_sha256] != row
+                for note, row in zip(notes, applied)
+            ):
+                return None
+            if 0 < count < len(notes) and (
+                notes[count].captured_at,
+                notes[count].id,
+            ) <= tuple(state["high_water"]):
+                return None
+            by_id = {note.id: note for note in notes[:count]}
+            lineages = {
+                root_id: {
+                    "root_id": root_id,
+                    "category": row["category"],
+                    "active": row["active"],
+                    "state": row["state"],
+                    "current_note": by_id[row["current_note"]],
+                    "last_active_note": by_id[row["last_active_note"]],
+                    "terminal_note": (
+                        by_id[row["terminal_note"]] if row["terminal_note"] else None
+                    ),
+                    "events": [by_id[value] for value in row["events"]],
+                    "confirmation_count": row["confirmation_count"],
+                }
+                for root_id, row in state["lineages"].items()
+            }
+            note_to_lineage = dict(state["note_to_lineage"])
+            unresolved = [dict(row) for row in state["unresolved"]]
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return None
+        return count, lineages, note_to_lineage, unresolved
+
+    def record(
+        self,
+        home: Path,
+        notes: list[StoredNote],
+        lineages: dict[str, dict[str, Any]],
+        note_to_lineage: dict[str, str],
+        unresolved: list[dict[str, Any]],
+        source_fingerprint: str,
+    ) -> None:
+        state = {
+            "schema": PROJECTION_STATE_SCHEMA,
+            **self.generator,
+            "notes_directory": str(notes_directory(home)),
+            "source_fingerprint": source_fingerprint,
+            "applied": [[note.id, note.file_sha256] for note in notes],
+            "high_water": [notes[-1].captured_at, notes[-1].id] if notes else None,
+            "lineages": {
+                root_id: {
+                    "category": lineage["category"],
+                    "active": lineage["active"],
+                    "state": lineage["state"],
+                    "current_note": lineage["current_note"].id,
+                    "last_active_note": lineage["last_active_note"].id,
+                    "terminal_note": (
+                        lineage["terminal_note"].id
+                        if lineage["terminal_note"] is not None
+                        else None
+                    ),
+                    "events": [note.id for note in lineage["events"]],
+                    "confirmation_count": lineage["confirmation_count"],
+                }
+                for root_id, lineage in lineages.items()
+            },
+            "note_to_lineage": note_to_lineage,
+            "unresolved": unresolved,
+        }
+        if state != self._state:
+            self._state = state
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        _atomic_write_regular(
+            self.path, canonical_json_bytes(self._state), secure_parent=True
+        )
+        self._dirty = False
+
+
+def _stored_note_submission(
+    value: Any, file_sha256: str
+) -> tuple[dict[str, Any], dict[str, Any], str]:
+    """Build the stored-note submission; returns (submission, record, profile)."""
     note = value if isinstance(value, dict) else {}
     kind = note.get("kind") if isinstance(note.get("kind"), str) else ""
     operation = (
@@ -662,24 +1065,30 @@ def _stored_note_from_value(
             "record": record,
         },
     }
-    _validate_submission_with_ledger(
-        submission,
-        stored_note=value,
-        ledger_bin=ledger_bin,
-    )
+    return submission, record, validation_profile
+
+
+def _build_stored_note(
+    path: Path,
+    value: dict[str, Any],
+    record: dict[str, Any],
+    file_sha256: str,
+    validation_profile: str,
+) -> StoredNote:
+    """Materialize a note Ledger has already accepted."""
     return StoredNote(
         path=path,
-        id=note["id"],
-        captured_at=note["captured_at"],
-        kind=kind,
-        operation=operation,
+        id=value["id"],
+        captured_at=value["captured_at"],
+        kind=value["kind"],
+        operation=value["operation"],
         authority=record["authority"],
         summary=record["summary"],
         scope=record["scope"],
         source_refs=record["source_refs"],
         related_ids=record["related_ids"],
         supersedes_id=record["supersedes_id"],
-        fingerprint=fingerprint,
+        fingerprint=value["fingerprint"],
         payload=record["payload"],
         file_sha256=file_sha256,
         validation_profile=validation_profile,
@@ -706,6 +1115,10 @@ def default_digest_path(home: Path) -> Path:
     return resources_directory(home) / DIGEST_FILENAME
 
 
+def shards_directory(home: Path) -> Path:
+    return resources_directory(home) / "shards"
+
+
 def _source_manifest_fingerprint(
     notes: list[StoredNote], invalid_notes: list[dict[str, Any]]
 ) -> str:
@@ -731,11 +1144,31 @@ def _source_manifest_fingerprint(
     return hashlib.sha256(canonical_json_bytes(manifest)).hexdigest()
 
 
+def _read_stored_note(
+    path: Path,
+) -> tuple[Path, Any, str, dict[str, Any], dict[str, Any], str] | dict[str, Any] | None:
+    """Read, hash and decode one note once; invalid notes yield their report row."""
+    if path.is_symlink():
+        return {"path": str(path), "file_sha256": None, "error": "source note is a symlink"}
+    if not path.is_file():
+        return None
+    file_sha256: str | None = None
+    try:
+        raw = path.read_bytes()
+        file_sha256 = hashlib.sha256(raw).hexdigest()
+        value = json.loads(raw.decode("utf-8"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        return {"path": str(path), "file_sha256": file_sha256, "error": str(exc)}
+    return (path, value, file_sha256, *_stored_note_submission(value, file_sha256))
+
+
 def load_stored_notes(
     home: Path,
     *,
     ledger_bin: str | Path | None = None,
+    validation_cache: ValidationCache | None = None,
 ) -> tuple[list[StoredNote], list[dict[str, Any]], str, int]:
+    """Load and validate stored notes; cached verdicts skip ``ledger validate``."""
     directory = notes_directory(home)
     if directory.is_symlink():
         raise ValidationError(f"notes directory is a symlink: {directory}")
@@ -746,48 +1179,69 @@ def load_stored_notes(
     if not directory.is_dir():
         raise ValidationError(f"notes path is not a directory: {directory}")
 
-    notes: list[StoredNote] = []
     invalid: list[dict[str, Any]] = []
-    seen_ids: set[str] = set()
+    parsed: list[tuple[Path, Any, str, dict[str, Any], dict[str, Any], str]] = []
     paths = sorted(directory.glob("*.md"), key=lambda item: item.name)
-    for path in paths:
-        if path.is_symlink():
-            invalid.append(
-                {
-                    "path": str(path),
-                    "file_sha256": None,
-                    "error": "source note is a symlink",
-                }
-            )
-            continue
-        if not path.is_file():
+    for row in _ordered_map(_read_stored_note, paths, LOAD_WORKERS):
+        if isinstance(row, dict):
+            invalid.append(row)
+        elif row is not None:
+            parsed.append(row)
+
+    verdicts: dict[Path, dict[str, Any] | ValidationError] = {}
+    pending = []
+    for row in parsed:
+        path, _, file_sha256, _, _, validation_profile = row
+        hit, rejection = (
+            validation_cache.lookup(file_sha256, validation_profile)
+            if validation_cache is not None
+            else (False, None)
+        )
+        if not hit:
+            pending.append(row)
+        elif rejection is not None:
+            verdicts[path] = rejection
+    try:
+        batch = _validate_stored_batch(
+            [(submission, value) for _, value, _, submission, _, _ in pending],
+            ledger_bin=ledger_bin,
+        )
+    except ValidationError as exc:
+        batch = [exc] * len(pending)
+    except OSError as exc:
+        # A validator that cannot start or spool its input leaves every
+        # pending note unverified, not the whole load failed.
+        batch = [ValidationError(f"ledger validate: {exc}")] * len(pending)
+    for (path, _, file_sha256, _, _, validation_profile), verdict in zip(pending, batch):
+        verdicts[path] = verdict
+        if validation_cache is None:
             continue
+        if isinstance(verdict, StructuralRejection):
+            validation_cache.record(file_sha256, validation_profile, verdict)
+        elif not isinstance(verdict, ValidationError):
+            validation_cache.record(file_sha256, validation_profile)
+
+    notes: list[StoredNote] = []
+    seen_ids: set[str] = set()
+    for path, value, file_sha256, _, record, validation_profile in parsed:
+        verdict = verdicts.get(path)
         try:
-            raw = path.read_bytes()
-            file_sha256 = hashlib.sha256(raw).hexdigest()
-            value = json.loads(raw.decode("utf-8"))
-            note = _stored_note_from_value(
-                path,
-                value,
-                file_sha256,
-                ledger_bin=ledger_bin,
-            )
+            if isinstance(verdict, ValidationError):
+                raise verdict
+            note = _build_stored_note(path, value, record, file_sha256, validation_profile)
             if note.id in seen_ids:
                 raise ValidationError(f"id: duplicate source note id {note.id}")
-            seen_ids.add(note.id)
-            notes.append(note)
-        except (OSError, UnicodeDecodeError, json.JSONDecodeError, ValidationError) as exc:
-            try:
-                file_sha256 = hashlib.sha256(path.read_bytes()).hexdigest()
-            except OSError:
-                file_sha256 = None
-            invalid.append(
-                {
-                    "path": str(path),
-                    "file_sha256": file_sha256,
-                    "error": str(exc),
-                }
-            )
+        except ValidationError as exc:
+            row = {"path": str(path), "file_sha256": file_sha256, "error": str(exc)}
+            if exc is verdict and not isinstance(exc, StructuralRejection):
+                # The validator never reached a verdict (spawn, output, or
+                # definition failure), so a later load may accept the note.
+                row["retryable"] = True
+            invalid.append(row)
+            continue
+        seen_ids.add(note.id)
+        notes.append(note)
+    invalid.sort(key=lambda item: item["path"])
     notes.sort(key=lambda item: (item.captured_at, item.id, item.path.name))
     return notes, invalid, _source_manifest_fingerprint(notes, invalid), len(paths)
 
@@ -837,131 +1291,151 @@ def _unresolved_event(note: StoredNote, reason: str) -> dict[str, Any]:
     }
 
 
+def _fold_note(
+    note: StoredNote,
+    lineages: dict[str, dict[str, Any]],
+    note_to_lineage: dict[str, str],
+    unresolved: list[dict[str, Any]],
+) -> None:
+    """Apply one note, in ``(captured_at, id)`` order, to the lineage fold."""
+    category = _note_category(note)
+    if note.operation == "assert":
+        if category not in {"mapping", "boundary"}:
+            unresolved.append(_unresolved_event(note, "assert-kind-does-not-create-lineage"))
+            return
+        lineage = {
+            "root_id": note.id,
+            "category": category,
+            "active": True,
+            "state": "asserted",
+            "current_note": note,
+            "last_active_note": note,
+            "terminal_note": None,
+            "events": [note],
+            "confirmation_count": 0,
+        }
+        lineages[note.id] = lineage
+        note_to_lineage[note.id] = note.id
+        return
+
+    prior_ids = _prior_ids(note)
+    if not prior_ids:
+        unresolved.append(_unresolved_event(note, "missing-prior-note-relationship"))
+        return
+    missing = [value for value in prior_ids if value not in note_to_lineage]
+    if missing:
+        unresolved.append(
+            _unresolved_event(note, f"missing-or-forward-prior-note:{','.join(missing)}")
+        )
+        return
+    roots = {note_to_lineage[value] for value in prior_ids}
+    if len(roots) != 1:
+        unresolved.append(_unresolved_event(note, "prior-notes-cross-lineages"))
+        return
+    root_id = next(iter(roots))
+    lineage = lineages[root_id]
+
+    if note.operation == "confirm":
+        if not lineage["active"]:
+            unresolved.append(_unresolved_event(note, "cannot-confirm-inactive-lineage"))
+            return
+        if category != lineage["category"]:
+            unresolved.append(_unresolved_event(note, "confirmation-category-mismatch"))
+            return
+        current = lineage["current_note"]
+        if _lineage_signature(note, category) != _lineage_signature(current, category):
+            unresolved.append(_unresolved_event(note, "confirmation-content-mismatch"))
+            return
+        lineage["events"].append(note)
+        lineage["confirmation_count"] += 1
+        lineage["state"] = "confirmed"
+        note_to_lineage[note.id] = root_id
+        return
+
+    if note.operation == "supersede":
+        if not lineage["active"]:
+            unresolved.append(_unresolved_event(note, "cannot-supersede-inactive-lineage"))
+            return
+        if category != lineage["category"]:
+            unresolved.append(_unresolved_event(note, "supersession-category-mismatch"))
+            return
+        lineage["events"].append(note)
+        lineage["current_note"] = note
+        lineage["last_active_note"] = note
+        lineage["terminal_note"] = None
+        lineage["state"] = "corrected"
+        note_to_lineage[note.id] = root_id
+        return
+
+    if note.operation == "reject":
+        if lineage["category"] != "mapping":
+            unresolved.append(_unresolved_event(note, "rejection-target-is-not-mapping"))
+            return
+        if not lineage["active"]:
+            unresolved.append(_unresolved_event(note, "cannot-reject-inactive-lineage"))
+            return
+        lineage["events"].append(note)
+        lineage["active"] = False
+        lineage["state"] = "rejected"
+        lineage["terminal_note"] = note
+        note_to_lineage[note.id] = root_id
+        return
+
+    if note.operation == "retract":
+        if not lineage["active"]:
+            unresolved.append(_unresolved_event(note, "cannot-retract-inactive-lineage"))
+            return
+        lineage["events"].append(note)
+        lineage["active"] = False
+        lineage["state"] = "retracted"
+        lineage["terminal_note"] = note
+        note_to_lineage[note.id] = root_id
+        return
+
+    if note.operation == "reopen":
+        if lineage["active"]:
+            unresolved.append(_unresolved_event(note, "cannot-reopen-active-lineage"))
+            return
+        if category != lineage["category"]:
+            unresolved.append(_unresolved_event(note, "reopening-category-mismatch"))
+            return
+        lineage["events"].append(note)
+        lineage["active"] = True
+        lineage["state"] = "reopened"
+        lineage["current_note"] = note
+        lineage["last_active_note"] = note
+        lineage["terminal_note"] = None
+        note_to_lineage[note.id] = root_id
+        return
+
+    unresolved.append(_unresolved_event(note, "unsupported-event-operation"))
+
+
 def build_digest_projection(
     home: Path,
     *,
     ledger_bin: str | Path | None = None,
+    validation_cache: ValidationCache | None = None,
+    projection_state: ProjectionState | None = None,
 ) -> dict[str, Any]:
     notes, invalid_notes, source_fingerprint, source_file_count = load_stored_notes(
         home,
         ledger_bin=ledger_bin,
+        validation_cache=validation_cache,
     )
-    lineages: dict[str, dict[str, Any]] = {}
-    note_to_lineage: dict[str, str] = {}
-    unresolved: list[dict[str, Any]] = []
-
-    for note in notes:
-        category = _note_category(note)
-        if note.operation == "assert":
-            if category not in {"mapping", "boundary"}:
-                unresolved.append(_unresolved_event(note, "assert-kind-does-not-create-lineage"))
-                continue
-            lineage = {
-                "root_id": note.id,
-                "category": category,
-                "active": True,
-                "state": "asserted",
-                "current_note": note,
-                "last_active_note": note,
-                "terminal_note": None,
-                "events": [note],
-                "confirmation_count": 0,
-            }
-            lineages[note.id] = lineage
-            note_to_lineage[note.id] = note.id
-            continue
-
-        prior_ids = _prior_ids(note)
-        if not prior_ids:
-            unresolved.append(_unresolved_event(note, "missing-prior-note-relationship"))
-            continue
-        missing = [value for value in prior_ids if value not in note_to_lineage]
-        if missing:
-            unresolved.append(
-                _unresolved_event(note, f"missing-or-forward-prior-note:{','.join(missing)}")
-            )
-            continue
-        roots = {note_to_lineage[value] for value in prior_ids}
-        if len(roots) != 1:
-            unresolved.append(_unresolved_event(note, "prior-notes-cross-lineages"))
-            continue
-        root_id = next(iter(roots))
-        lineage = lineages[root_id]
-
-        if note.operation == "confirm":
-            if not lineage["active"]:
-                unresolved.append(_unresolved_event(note, "cannot-confirm-inactive-lineage"))
-                continue
-            if category != lineage["category"]:
-                unresolved.append(_unresolved_event(note, "confirmation-category-mismatch"))
-                continue
-            current = lineage["current_note"]
-            if _lineage_signature(note, category) != _lineage_signature(current, category):
-                unresolved.append(_unresolved_event(note, "confirmation-content-mismatch"))
-                continue
-            lineage["events"].append(note)
-            lineage["confirmation_count"] += 1
-            lineage["state"] = "confirmed"
-            note_to_lineage[note.id] = root_id
-            continue
-
-        if note.operation == "supersede":
-            if not lineage["active"]:
-                unresolved.append(_unresolved_event(note, "cannot-supersede-inactive-lineage"))
-                continue
-            if category != lineage["category"]:
-                unresolved.append(_unresolved_event(note, "supersession-category-mismatch"))
-                continue
-            lineage["events"].append(note)
-            lineage["current_note"] = note
-            lineage["last_active_note"] = note
-            lineage["terminal_note"] = None
-            lineage["state"] = "corrected"
-            note_to_lineage[note.id] = root_id
-            continue
-
-        if note.operation == "reject":
-            if lineage["category"] != "mapping":
-                unresolved.append(_unresolved_event(note, "rejection-target-is-not-mapping"))
-                continue
-            if not lineage["active"]:
-                unresolved.append(_unresolved_event(note, "cannot-reject-inactive-lineage"))
-                continue
-            lineage["events"].append(note)
-            lineage["active"] = False
-            lineage["state"] = "rejected"
-            lineage["terminal_note"] = note
-            note_to_lineage[note.id] = root_id
-            continue
-
-        if note.operation == "retract":
-            if not lineage["active"]:
-                unresolved.append(_unresolved_event(note, "cannot-retract-inactive-lineage"))
-                continue
-            lineage["events"].append(note)
-            lineage["active"] = False
-            lineage["state"] = "retracted"
-            lineage["terminal_note"] = note
-            note_to_lineage[note.id] = root_id
-            continue
-
-        if note.operation == "reopen":
-            if lineage["active"]:
-                unresolved.append(_unresolved_event(note, "cannot-reopen-active-lineage"))
-                continue
-            if category != lineage["category"]:
-                unresolved.append(_unresolved_event(note, "reopening-category-mismatch"))
-                continue
-            lineage["events"].append(note)
-            lineage["active"] = True
-            lineage["state"] = "reopened"
-            lineage["current_note"] = note
-            lineage["last_active_note"] = note
-            lineage["terminal_note"] = None
-            note_to_lineage[note.id] = root_id
-            continue
-
-        unresolved.append(_unresolved_event(note, "unsupported-event-operation"))
+    resumed = (
+        projection_state.resume(home, notes) if projection_state is not None else None
+    )
+    if resumed is None:
+        applied, lineages, note_to_lineage, unresolved = 0, {}, {}, []
+    else:
+        applied, lineages, note_to_lineage, unresolved = resumed
+    for note in notes[applied:]:
+        _fold_note(note, lineages, note_to_lineage, unresolved)
+    if projection_state is not None:
+        projection_state.record(
+            home, notes, lineages, note_to_lineage, unresolved, source_fingerprint
+        )
 
     def lineage_sort_key(lineage: dict[str, Any]) -> tuple[Any, ...]:
         note: StoredNote = lineage["current_note"]
@@ -1156,13 +1630,27 @@ def _render_inactive_entry(lines: list[str], lineage: dict[str, Any]) -> None:
     lines.append("")
 
 
-def render_memory_digest(
+def _lines_chunk(lines: list[str]) -> str:
+    return "".join(f"{line}\n" for line in lines)
+
+
+def _rendered_entry(
+    render: Callable[[list[str], dict[str, Any]], None], lineage: dict[str, Any]
+) -> str:
+    lines: list[str] = []
+    render(lines, lineage)
+    return _lines_chunk(lines)
+
+
+def iter_memory_digest(
     projection: dict[str, Any],
     generated_at: str,
     *,
     include_inactive: bool = True,
     limit: int = 0,
-) -> str:
+    shard: str | None = None,
+) -> Iterator[str]:
+    """Yield the digest text a section or entry at a time."""
     active_mappings = list(projection["active_mappings"])
     active_boundaries = list(projection["active_boundaries"])
     if limit > 0:
@@ -1177,6 +1665,7 @@ def render_memory_digest(
         f"generated_at: {generated_at}",
         "generator: synesthesia_memory_note.py memory-digest",
         f"digest_version: {DIGEST_VERSION}",
+        *([f"shard: {shard}"] if shard is not None else []),
         "canonical: false",
         "source: immutable memory-source-note/v1 events",
         f"source_fingerprint: sha256:{projection['source_fingerprint']}",
@@ -1200,24 +1689,26 @@ def render_memory_digest(
     ]
     if not active_mappings:
         lines.append("No active mappings.\n")
-    else:
-        for lineage in active_mappings:
-            _render_active_mapping(lines, lineage)
+    yield _lines_chunk(lines)
+    for lineage in active_mappings:
+        yield _rendered_entry(_render_active_mapping, lineage)
 
-    lines.extend(["## Active activation boundaries", ""])
+    lines = ["## Active activation boundaries", ""]
     if not active_boundaries:
         lines.append("No active activation boundaries.\n")
-    else:
-        for lineage in active_boundaries:
-            _render_active_boundary(lines, lineage)
+    yield _lines_chunk(lines)
+    for lineage in active_boundaries:
+        yield _rendered_entry(_render_active_boundary, lineage)
 
+    lines = []
     if include_inactive:
         lines.extend(["## Rejected or retracted mappings and boundaries", ""])
         if not projection["inactive_entries"]:
             lines.append("No rejected or retracted entries.\n")
-        else:
-            for lineage in projection["inactive_entries"]:
-                _render_inactive_entry(lines, lineage)
+        yield _lines_chunk(lines)
+        for lineage in projection["inactive_entries"]:
+            yield _rendered_entry(_render_inactive_entry, lineage)
+        lines = []
 
     lines.extend(["## Unresolved event chains", ""])
     if not projection["unresolved_events"]:
@@ -1256,10 +1747,23 @@ def render_memory_digest(
             "- Put scoped mappings and verification rules in `MEMORY.md`.",
             "- Do not recreate the installed Synesthesia skill in memory.",
             "- Regenerate this digest after source-note changes before Phase 2 consolidation.",
-            "",
         ]
     )
-    return "\n".join(lines).rstrip() + "\n"
+    yield _lines_chunk(lines)
+
+
+def render_memory_digest(
+    projection: dict[str, Any],
+    generated_at: str,
+    *,
+    include_inactive: bool = True,
+    limit: int = 0,
+) -> str:
+    return "".join(
+        iter_memory_digest(
+            projection, generated_at, include_inactive=include_inactive, limit=limit
+        )
+    )
 
 
 def _digest_metadata(text: str) -> dict[str, str] | None:
@@ -1284,6 +1788,33 @@ def _metadata_int(metadata: dict[str, str], key: str) -> int:
         raise ValidationError(f"digest metadata {key}: expected integer") from exc
 
 
+DIGEST_READ_CHUNK = 1 << 16
+DIGEST_HEAD_LINES = 40
+
+
+def _read_digest_head(handle: Any) -> tuple[str, str]:
+    """Hash a digest file in chunks, keeping only the metadata head as text."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    digest = hashlib.sha256()
+    head: list[str] = []
+    newlines = 0
+    for chunk in iter(lambda: handle.read(DIGEST_READ_CHUNK), b""):
+        digest.update(chunk)
+        text = decoder.decode(chunk)
+        if newlines <= DIGEST_HEAD_LINES:
+            head.append(text)
+            newlines += text.count("\n")
+    decoder.decode(b"", final=True)
+    return "".join(head), digest.hexdigest()
+
+
+def _digest_sha256(chunks: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
+
+
 def inspect_digest(
     home: Path,
     projection: dict[str, Any],
@@ -1318,9 +1849,9 @@ def inspect_digest(
                 "status": "not-file",
                 "expected_source_fingerprint": expected,
             }
-        with os.fdopen(descriptor, encoding="utf-8") as handle:
+        with os.fdopen(descriptor, "rb") as handle:
             descriptor = -1
-            text = handle.read()
+            text, file_sha256 = _read_digest_head(handle)
     except (OSError, UnicodeError):
         return {
             "path": str(digest_path),
@@ -1361,12 +1892,14 @@ def inspect_digest(
     generated_at = metadata.get("generated_at")
     if status == "current" and (
         not generated_at
-        or text
-        != render_memory_digest(
-            projection,
-            generated_at,
-            include_inactive=True,
-            limit=0,
+        or file_sha256
+        != _digest_sha256(
+            iter_memory_digest(
+                projection,
+                generated_at,
+                include_inactive=True,
+                limit=0,
+            )
         )
     ):
         status = "invalid"
@@ -1403,6 +1936,10 @@ def _atomic_write_regular(
     *,
     secure_parent: bool,
 ) -> None:
+    _atomic_write_chunks(path, (content,), secure_parent=secure_parent)
+
+
+def _prepare_destination(path: Path, *, secure_parent: bool) -> None:
     ensure_no_symlink_components(path)
     if path.is_symlink():
         raise ValidationError(f"digest destination is a symlink: {path}")
@@ -1411,23 +1948,312 @@ def _atomic_write_regular(
     ensure_no_symlink_components(path.parent)
     if secure_parent or not parent_existed:
         os.chmod(path.parent, 0o700)
+
+
+def _atomic_write_chunks(
+    path: Path,
+    chunks: Iterable[bytes],
+    *,
+    secure_parent: bool,
+) -> str:
+    """Stream chunks into the ``mkstemp`` file, replace ``path``, return the SHA-256."""
+    _prepare_destination(path, secure_parent=secure_parent)
     fd, temp_name = tempfile.mkstemp(prefix=".synesthesia-digest-", dir=str(path.parent))
+    digest = hashlib.sha256()
     try:
         os.fchmod(fd, 0o600)
         with os.fdopen(fd, "wb") as handle:
-            handle.write(content)
+            for chunk in chunks:
+                digest.update(chunk)
+                handle.write(chunk)
             handle.flush()
             os.fsync(handle.fileno())
         os.replace(temp_name, path)
     finally:
         if os.path.exists(temp_name):
             os.unlink(temp_name)
+    return digest.hexdigest()
 
 
 def now_utc() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
+def digest_shard_key(scope: dict[str, Any]) -> str:
+    """Partition a scope into ``global``, ``repo:<repo>`` or ``repo:<repo>:path:<prefix>``.
+
+    Scopes without a repository share the global shard. A path-family scope
+    whose paths share one top-level directory gets its own shard; any other
+    repository scope uses the repository shard.
+    """
+    repo = scope.get("repo")
+    if not isinstance(repo, str) or not repo:
+        return "global"
+    if scope.get("kind") == "path-family":
+        prefixes = {
+            path.strip("/").split("/", 1)[0]
+            for path in scope.get("paths") or ()
+            if isinstance(path, str) and path.strip("/")
+        }
+        if len(prefixes) == 1:
+            return f"repo:{repo}:path:{prefixes.pop()}"
+    return f"repo:{repo}"
+
+
+def _shard_scope(key: str) -> dict[str, Any]:
+    if key == "global":
+        return {"repo": None, "path_prefix": None, "specificity": SCOPE_SPECIFICITY["global"]}
+    _, rest = key.split(":", 1)
+    repo, _, prefix = rest.partition(":path:")
+    return {
+        "repo": repo,
+        "path_prefix": prefix or None,
+        "specificity": SCOPE_SPECIFICITY["path-family" if prefix else "repo"],
+    }
+
+
+def _shard_filename(key: str) -> str:
+    if key == "global":
+        return "global.md"
+    readable = re.sub(r"[^A-Za-z0-9]+", "-", key).strip("-").lower()[:80]
+    return f"{readable}-{hashlib.sha256(key.encode()).hexdigest()[:12]}.md"
+
+
+def partition_digest_projection(projection: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Split a projection into per-shard projections with their own fingerprints.
+
+    Lineages follow their current note's scope and unresolved events their
+    own note's scope; invalid notes have no trustworthy scope and stay global.
+    """
+    notes_by_id = {note.id: note for note in projection["notes"]}
+    shards: dict[str, dict[str, Any]] = {}
+
+    def shard(key: str) -> dict[str, Any]:
+        return shards.setdefault(
+            key,
+            {
+                "notes": [],
+                "invalid_notes": [],
+                "active_mappings": [],
+                "active_boundaries": [],
+                "inactive_entries": [],
+                "unresolved_events": [],
+            },
+        )
+
+    for section in ("active_mappings", "active_boundaries", "inactive_entries"):
+        for lineage in projection[section]:
+            row = shard(digest_shard_key(lineage["current_note"].scope))
+            row[section].append(lineage)
+            row["notes"].extend(lineage["events"])
+    for event in projection["unresolved_events"]:
+        note = notes_by_id[event["id"]]
+        row = shard(digest_shard_key(note.scope))
+        row["unresolved_events"].append(event)
+        row["notes"].append(note)
+    global_shard = shard("global")
+    global_shard["invalid_notes"] = list(projection["invalid_notes"])
+    for row in shards.values():
+        row["notes"].sort(key=lambda item: (item.captured_at, item.id, item.path.name))
+        row["source_fingerprint"] = _source_manifest_fingerprint(
+            row["notes"], row["invalid_notes"]
+        )
+        row["source_latest_at"] = row["notes"][-1].captured_at if row["notes"] else None
+        row["valid_note_count"] = len(row["notes"])
+        row["source_file_count"] = len(row["notes"]) + len(row["invalid_notes"])
+    return shards
+
+
+def write_digest_shards(
+    home: Path, projection: dict[str, Any], generated_at: str
+) -> dict[str, int]:
+    """Write scope shards under ``resources/shards/``, skipping unchanged ones.
+
+    A shard is rewritten only when its own source fingerprint moved or its
+    file no longer matches the recorded hash, so an append touches just the
+    shards whose notes changed. Shards that lost every note are removed.
+    """
+    directory = shards_directory(home)
+    index_path = directory / SHARD_INDEX_FILENAME
+    previous = _read_resource_json(index_path)
+    previous_rows = {
+        row.get("key"): row
+        for row in (previous.get("shards") if isinstance(previous, dict) else None) or ()
+        if isinstance(row, dict)
+    }
+    counts = {"written": 0, "unchanged": 0, "removed": 0}
+    rows = []
+    for key, shard in partition_digest_projection(projection).items():
+        path = directory / _shard_filename(key)
+        fingerprint = f"sha256:{shard['source_fingerprint']}"
+        prior = previous_rows.get(key)
+        if (
+            isinstance(prior, dict)
+            and previous.get("digest_version") == DIGEST_VERSION
+            and prior.get("source_fingerprint") == fingerprint
+            and prior.get("sha256") == _current_digest_sha256(path)
+        ):
+            rows.append(prior)
+            counts["unchanged"] += 1
+            continue
+        file_sha256 = _atomic_write_chunks(
+            path,
+            (
+                chunk.encode("utf-8")
+                for chunk in iter_memory_digest(shard, generated_at, shard=key)
+            ),
+            secure_parent=True,
+        )
+        rows.append(
+            {
+                "key": key,
+                "path": path.name,
+                **_shard_scope(key),
+                "source_fingerprint": fingerprint,
+                "sha256": file_sha256,
+                "generated_at": generated_at,
+                "active_mappings": len(shard["active_mappings"]),
+                "active_boundaries": len(shard["active_boundaries"]),
+                "inactive_entries": len(shard["inactive_entries"]),
+                "unresolved_events": len(shard["unresolved_events"]),
+                "invalid_notes": len(shard["invalid_notes"]),
+            }
+        )
+        counts["written"] += 1
+    current_names = {row["path"] for row in rows}
+    for key, prior in previous_rows.items():
+        name = prior.get("path")
+        if not isinstance(name, str) or name in current_names or Path(name).name != name:
+            continue
+        stale = directory / name
+        if stale.is_file() and not stale.is_symlink():
+            stale.unlink()
+            counts["removed"] += 1
+    rows.sort(key=lambda row: (-row["specificity"], row["key"]))
+    _atomic_write_regular(
+        index_path,
+        canonical_json_bytes(
+            {
+                "schema": SHARD_INDEX_SCHEMA,
+                "digest_version": DIGEST_VERSION,
+                "source_fingerprint": f"sha256:{projection['source_fingerprint']}",
+                "shards": rows,
+            }
+        ),
+        secure_parent=True,
+    )
+    return counts
+
+
+def relevant_shards(
+    home: Path, repo: str | None = None, paths: Iterable[str] = ()
+) -> list[dict[str, Any]]:
+    """Return the shard rows a session in ``repo`` (and ``paths``) should load."""
+    index = _read_resource_json(shards_directory(home) / SHARD_INDEX_FILENAME)
+    if not isinstance(index, dict) or index.get("schema") != SHARD_INDEX_SCHEMA:
+        raise ValidationError("digest shards: index missing; run memory-digest")
+    prefixes = {path.strip("/").split("/", 1)[0] for path in paths if path.strip("/")}
+    selected = []
+    for row in index.get("shards") or ():
+        if not isinstance(row, dict):
+            continue
+        if row.get("key") == "global" or (
+            repo is not None
+            and row.get("repo") == repo
+            and (row.get("path_prefix") is None or not prefixes or row.get("path_prefix") in prefixes)
+        ):
+            selected.append({**row, "path": str(shards_directory(home) / row["path"])})
+    return selected
+
+
+def _notes_listing(home: Path) -> list[list[Any]] | None:
+    """Stat the notes directory without reading note bodies; ``None`` if unknown."""
+    directory = notes_directory(home)
+    try:
+        if directory.is_symlink():
+            return None
+        ensure_no_symlink_components(directory)
+        with os.scandir(directory) as entries:
+            listing = []
+            for entry in entries:
+                if not entry.name.endswith(".md"):
+                    continue
+                entry_stat = entry.stat(follow_symlinks=False)
+                listing.append([entry.name, entry_stat.st_size, entry_stat.st_mtime_ns])
+    except FileNotFoundError:
+        return []
+    except (OSError, ValidationError):
+        return None
+    return sorted(listing)
+
+
+def _digest_generator_key() -> dict[str, Any]:
+    """Identify the code and definition that fold notes into a digest."""
+    definition = synesthesia_definition_path()
+    return {
+        "digest_version": DIGEST_VERSION,
+        "generator_sha256": sha256_file(Path(__file__)),
+        "definition_sha256": sha256_file(definition) if definition.is_file() else None,
+    }
+
+
+def _digest_manifest_key(listing: list[list[Any]]) -> dict[str, Any]:
+    return {
+        "schema": DIGEST_MANIFEST_SCHEMA,
+        **_digest_generator_key(),
+        "notes": listing,
+    }
+
+
+def _current_digest_sha256(destination: Path) -> str | None:
+    """Hash the default digest when it still has its required file and parent modes."""
+    try:
+        ensure_no_symlink_components(destination)
+        descriptor = os.open(destination, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    except (OSError, ValidationError):
+        return None
+    try:
+        with os.fdopen(descriptor, "rb") as handle:
+            file_stat = os.fstat(handle.fileno())
+            if (
+                not stat.S_ISREG(file_stat.st_mode)
+                or file_stat.st_mode & 0o777 != 0o600
+                or destination.parent.stat().st_mode & 0o777 != 0o700
+            ):
+                return None
+            return hashlib.sha256(handle.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _manifest_current_result(
+    home: Path, destination: Path, listing: list[list[Any]] | None
+) -> dict[str, Any] | None:
+    """Return the recorded ``current`` result when nothing it covers has changed."""
+    if listing is None:
+        return None
+    manifest = _read_resource_json(resources_directory(home) / DIGEST_MANIFEST_FILENAME)
+    if not isinstance(manifest, dict):
+        return None
+    key = _digest_manifest_key(listing)
+    if any(manifest.get(name) != value for name, value in key.items()):
+        return None
+    result = manifest.get("result")
+    if (
+        not isinstance(result, dict)
+        or result.get("path") != str(destination)
+        or manifest.get("digest_sha256") != _current_digest_sha256(destination)
+    ):
+        return None
+    shard_index = _read_resource_json(shards_directory(home) / SHARD_INDEX_FILENAME)
+    if (
+        not isinstance(shard_index, dict)
+        or shard_index.get("source_fingerprint") != result.get("source_fingerprint")
+    ):
+        return None
+    return result
+
+
 def generate_memory_digest(
     home: Path,
     *,
@@ -1444,37 +2270,25 @@ def generate_memory_digest(
         raise ValidationError(
             "partial digest options require --output; the default latest digest must be complete"
         )
-    ledger_bin = _require_synesthesia_validator()
-    projection = build_digest_projection(home, ledger_bin=ledger_bin)
-    before = inspect_digest(home, projection, destination)
-    if before["status"] == "current" and not force:
-        return {
-            "status": "current",
-            "path": str(destination),
-            "source_fingerprint": f"sha256:{projection['source_fingerprint']}",
-            "source_notes": projection["source_file_count"],
-            "active_mappings": len(projection["active_mappings"]),
-            "active_boundaries": len(projection["active_boundaries"]),
-            "inactive_entries": len(projection["inactive_entries"]),
-            "unresolved_events": len(projection["unresolved_events"]),
-            "invalid_notes": len(projection["invalid_notes"]),
-        }
-    timestamp = generated_at or now_utc()
-    digest = render_memory_digest(
-        projection,
-        timestamp,
-        include_inactive=include_inactive,
-        limit=limit,
-    )
-    _atomic_write_regular(
-        destination,
-        digest.encode("utf-8"),
-        secure_parent=output is None,
+    # Stat before loading so a note written mid-build invalidates the manifest.
+    listing = _notes_listing(home) if output is None else None
+    if not force:
+        current = _manifest_current_result(home, destination, listing)
+        if current is not None:
+            return current
+    ledger_bin, validation_cache = open_validation_cache(home)
+    projection_state = ProjectionState.open(home)
+    projection = build_digest_projection(
+        home,
+        ledger_bin=ledger_bin,
+        validation_cache=validation_cache,
+        projection_state=projection_state,
     )
-    return {
-        "status": "written",
+    if validation_cache is not None:
+        validation_cache.save()
+    projection_state.save()
+    summary = {
         "path": str(destination),
-        "generated_at": timestamp,
         "source_fingerprint": f"sha256:{projection['source_fingerprint']}",
         "source_notes": projection["source_file_count"],
         "active_mappings": len(projection["active_mappings"]),
@@ -1483,26 +2297,708 @@ def generate_memory_digest(
         "unresolved_events": len(projection["unresolved_events"]),
         "invalid_notes": len(projection["invalid_notes"]),
     }
+    before = inspect_digest(home, projection, destination)
+    if before["status"] == "current" and not force:
+        result = {"status": "current", **summary}
+    else:
+        timestamp = generated_at or now_utc()
+        written_sha256 = _atomic_write_chunks(
+            destination,
+            (
+                chunk.encode("utf-8")
+                for chunk in iter_memory_digest(
+                    projection,
+                    timestamp,
+                    include_inactive=include_inactive,
+                    limit=limit,
+                )
+            ),
+            secure_parent=output is None,
+        )
+        result = {"status": "written", "generated_at": timestamp, **summary}
+    if output is None:
+        write_digest_shards(home, projection, generated_at or now_utc())
+    # Invalid notes may reflect a validator that could not run, so only a clean
+    # projection is trusted to stay current until the listing changes.
+    if listing is not None and not projection["invalid_notes"]:
+        digest_sha256 = (
+            written_sha256
+            if result["status"] == "written"
+            else _current_digest_sha256(destination)
+        )
+        if digest_sha256 is not None:
+            _atomic_write_regular(
+                resources_directory(home) / DIGEST_MANIFEST_FILENAME,
+                canonical_json_bytes(
+                    {
+                        **_digest_manifest_key(listing),
+                        "digest_sha256": digest_sha256,
+                        "result": {"status": "current", **summary},
+                    }
+                ),
+                secure_parent=True,
+            )
+    return result
 
 
-def _scan_compiled_memory(home: Path, note_ids: list[str]) -> dict[str, Any]:
-    roots = [home / "memories/memory_summary.md", home / "memories/MEMORY.md"]
-    skills_root = home / "memories/skills"
+@contextlib.contextmanager
+def _resource_lock(home: Path, name: str) -> Iterator[None]:
+    """Hold an exclusive ``flock`` on a lock file under ``resources/``."""
+    path = resources_directory(home) / name
+    _prepare_destination(path, secure_parent=True)
+    descriptor = os.open(
+        path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600
+    )
+    try:
+        fcntl.flock(descriptor, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(descriptor)
+
+
+def _debounce_settings() -> tuple[float, float]:
+    settings = []
+    for name, default in (
+        ("SYNESTHESIA_DIGEST_QUIET_SEC", DIGEST_QUIET_SEC),
+        ("SYNESTHESIA_DIGEST_MAX_DELAY_SEC", DIGEST_MAX_DELAY_SEC),
+    ):
+        try:
+            settings.append(max(0.0, float(os.environ.get(name, default))))
+        except ValueError:
+            settings.append(default)
+    return settings[0], settings[1]
+
+
+def _read_dirty_marker(home: Path) -> dict[str, Any] | None:
+    marker = _read_resource_json(resources_directory(home) / DIGEST_DIRTY_FILENAME)
+    if not isinstance(marker, dict) or not all(
+        isinstance(marker.get(key), (int, float))
+        for key in ("first_marked_at", "last_marked_at", "generation")
+    ):
+        return None
+    return marker
+
+
+def _write_dirty_marker(home: Path, marker: dict[str, Any] | None) -> None:
+    path = resources_directory(home) / DIGEST_DIRTY_FILENAME
+    if marker is None:
+        if path.is_file() and not path.is_symlink():
+            path.unlink()
+        return
+    _atomic_write_regular(path, canonical_json_bytes(marker), secure_parent=True)
+
+
+def _claim_worker_lock(home: Path) -> int | None:
+    """Return a descriptor holding the worker lock, or ``None`` while a worker runs.
+
+    The spawned worker inherits the descriptor, so the lock is held exactly
+    as long as the worker lives; an exited, zombie, or recycled-pid worker
+    never looks alive.
+    """
+    path = resources_directory(home) / DIGEST_WORKER_LOCK_FILENAME
+    _prepare_destination(path, secure_parent=True)
+    descriptor = os.open(
+        path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600
+    )
+    try:
+        fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(descriptor)
+        return None
+    except BaseException:
+        os.close(descriptor)
+        raise
+    return descriptor
+
+
+def _spawn_digest_refresh(home: Path, worker_lock: int) -> int:
+    """Start a detached ``refresh-digest`` worker holding ``worker_lock``; return its pid."""
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            str(Path(__file__).resolve()),
+            "refresh-digest",
+            "--codex-home",
+            str(home),
+            "--worker-lock-fd",
+            str(worker_lock),
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        pass_fds=(worker_lock,),
+    )
+    return proc.pid
+
+
+def schedule_digest_refresh(home: Path) -> dict[str, Any]:
+    """Mark the default digest dirty and make sure one refresh worker will run.
+
+    Appends in a burst only bump the marker's generation; the single live
+    worker sees the newer generation and folds them into its next pass.
+    """
+    now = time.time()
+    with _resource_lock(home, DIGEST_QUEUE_LOCK_FILENAME):
+        marker = _read_dirty_marker(home) or {
+            "first_marked_at": now,
+            "generation": 0,
+            "worker_pid": None,
+        }
+        marker["last_marked_at"] = now
+        marker["generation"] += 1
+        worker_lock = _claim_worker_lock(home)
+        spawn = worker_lock is not None
+        if worker_lock is not None:
+            try:
+                marker["worker_pid"] = _spawn_digest_refresh(home, worker_lock)
+            finally:
+                os.close(worker_lock)
+        _write_dirty_marker(home, marker)
+    return {
+        "status": "scheduled" if spawn else "coalesced",
+        "generation": marker["generation"],
+    }
+
+
+def run_digest_refresh(
+    home: Path, worker_lock: int | None = None
+) -> dict[str, Any] | None:
+    """Regenerate the default digest once the pending appends go quiet.
+
+    Returns the last ``generate_memory_digest`` result, or ``None`` when
+    nothing was pending. Generation holds the digest lock that manual
+    ``memory-digest`` runs also take; waiting for quiet does not. Appends
+    that land during a pass leave the marker dirty, so the loop runs again.
+
+    ``worker_lock`` is the descriptor a scheduled worker inherits. It is
+    closed under the queue lock before the worker last looks at the marker,
+    so an append that lands after that spawns a new worker instead of
+    coalescing into one that is about to exit.
+    """
+
+    def release_worker_lock() -> None:
+        nonlocal worker_lock
+        if worker_lock is not None:
+            os.close(worker_lock)
+            worker_lock = None
+
+    quiet, max_delay = _debounce_settings()
+    result = None
+    try:
+        while True:
+            with _resource_lock(home, DIGEST_QUEUE_LOCK_FILENAME):
+                marker = _read_dirty_marker(home)
+                if marker is None:
+                    release_worker_lock()
+                    return result
+                now = time.time()
+                due = min(
+                    marker["last_marked_at"] + quiet,
+                    marker["first_marked_at"] + max_delay,
+                )
+                if now >= due:
+                    generation = marker["generation"]
+                    marker["worker_pid"] = os.getpid()
+                    _write_dirty_marker(home, marker)
+            if now < due:
+                time.sleep(due - now)
+                continue
+            started = time.time()
+            try:
+                with _resource_lock(home, DIGEST_LOCK_FILENAME):
+                    result = generate_memory_digest(home)
+            except (ValidationError, OSError) as exc:
+                with _resource_lock(home, DIGEST_QUEUE_LOCK_FILENAME):
+                    release_worker_lock()
+                    marker = _read_dirty_marker(home)
+                    if marker is not None:
+                        marker.update(worker_pid=None, last_error=str(exc))
+                        _write_dirty_marker(home, marker)
+                raise
+            with _resource_lock(home, DIGEST_QUEUE_LOCK_FILENAME):
+                marker = _read_dirty_marker(home)
+                if marker is None or marker["generation"] == generation:
+                    release_worker_lock()
+                    _write_dirty_marker(home, None)
+                    return result
+                marker["first_marked_at"] = started
+                _write_dirty_marker(home, marker)
+    finally:
+        release_worker_lock()
+
+
+_LINEAGE_INDEX_DDL = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE notes (
+    id TEXT PRIMARY KEY,
+    root_id TEXT,
+    event_index INTEGER,
+    captured_at TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    scope_kind TEXT,
+    scope_repo TEXT,
+    note_json TEXT NOT NULL
+);
+CREATE INDEX notes_root ON notes (root_id, event_index);
+CREATE INDEX notes_scope ON notes (scope_kind, scope_repo);
+CREATE INDEX notes_kind ON notes (kind, operation);
+CREATE TABLE note_scope_paths (note_id TEXT NOT NULL, path TEXT NOT NULL);
+CREATE INDEX note_scope_paths_path ON note_scope_paths (path, note_id);
+CREATE TABLE lineages (
+    root_id TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    active INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    current_note_id TEXT NOT NULL,
+    terminal_note_id TEXT,
+    confirmation_count INTEGER NOT NULL,
+    scope_kind TEXT,
+    scope_repo TEXT,
+    label TEXT NOT NULL
+);
+CREATE INDEX lineages_active_scope ON lineages (active, scope_kind, scope_repo);
+CREATE TABLE unresolved (
+    id TEXT PRIMARY KEY,
+    captured_at TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    prior_ids TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE INDEX unresolved_captured_at ON unresolved (captured_at, id);
+"""
+
+
+def lineage_index_path(home: Path) -> Path:
+    return resources_directory(home) / LINEAGE_INDEX_FILENAME
+
+
+def _note_document(note: StoredNote) -> dict[str, Any]:
+    return {
+        "id": note.id,
+        "captured_at": note.captured_at,
+        "kind": note.kind,
+        "operation": note.operation,
+        "authority": note.authority,
+        "summary": note.summary,
+        "scope": note.scope,
+        "source_refs": note.source_refs,
+        "related_ids": note.related_ids,
+        "supersedes_id": note.supersedes_id,
+        "fingerprint": note.fingerprint,
+        "payload": note.payload,
+        "file_sha256": note.file_sha256,
+        "path": str(note.path),
+    }
+
+
+def write_lineage_index(
+    home: Path, projection: dict[str, Any], listing: list[list[Any]]
+) -> Path:
+    """Replace the SQLite lineage index with the notes and lineages of ``projection``."""
+    destination = lineage_index_path(home)
+    _prepare_destination(destination, secure_parent=True)
+    fd, temp_name = tempfile.mkstemp(prefix=".synesthesia-index-", dir=str(destination.parent))
+    try:
+        os.fchmod(fd, 0o600)
+        os.close(fd)
+        connection = sqlite3.connect(temp_name)
+        try:
+            with connection:
+                connection.executescript(_LINEAGE_INDEX_DDL)
+                positions = {
+                    note.id: (lineage["root_id"], index)
+                    for lineage in projection["lineages"].values()
+                    for index, note in enumerate(lineage["events"])
+                }
+                connection.executemany(
+                    "INSERT INTO notes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            note.id,
+                            *positions.get(note.id, (None, None)),
+                            note.captured_at,
+                            note.kind,
+                            note.operation,
+                            note.scope.get("kind"),
+                            note.scope.get("repo"),
+                            json.dumps(_note_document(note), sort_keys=True),
+                        )
+                        for note in projection["notes"]
+                    ),
+                )
+                connection.executemany(
+                    "INSERT INTO note_scope_paths VALUES (?, ?)",
+                    (
+                        (note.id, path)
+                        for note in projection["notes"]
+                        for path in note.scope.get("paths") or ()
+                    ),
+                )
+                connection.executemany(
+                    "INSERT INTO lineages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            lineage["root_id"],
+                            lineage["category"],
+                            int(lineage["active"]),
+                            lineage["state"],
+                            lineage["current_note"].id,
+                            lineage["terminal_note"].id if lineage["terminal_note"] else None,
+                            lineage["confirmation_count"],
+                            lineage["current_note"].scope.get("kind"),
+                            lineage["current_note"].scope.get("repo"),
+                            str(
+                                lineage["current_note"].payload.get(
+                                    "sensory_phrase"
+                                    if lineage["category"] == "mapping"
+                                    else "activation_boundary",
+                                    "",
+                                )
+                            ),
+                        )
+                        for lineage in projection["lineages"].values()
+                    ),
+                )
+                connection.executemany(
+                    "INSERT INTO unresolved VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            row["id"],
+                            row["captured_at"],
+                            row["kind"],
+                            row["operation"],
+                            row["reason"],
+                            json.dumps(row["prior_ids"]),
+                            row["path"],
+                        )
+                        for row in projection["unresolved_events"]
+                    ),
+                )
+                connection.executemany(
+                    "INSERT INTO meta VALUES (?, ?)",
+                    (
+                        ("schema", LINEAGE_INDEX_SCHEMA),
+                        ("manifest", json.dumps(_digest_manifest_key(listing), sort_keys=True)),
+                        ("source_fingerprint", projection["source_fingerprint"]),
+                        ("invalid_note_count", str(len(projection["invalid_notes"]))),
+                        (
+                            "retryable_invalid_count",
+                            str(
+                                sum(
+                                    bool(row.get("retryable"))
+                                    for row in projection["invalid_notes"]
+                                )
+                            ),
+                        ),
+                    ),
+                )
+        finally:
+            connection.close()
+        os.replace(temp_name, destination)
+    finally:
+        if os.path.exists(temp_name):
+            os.unlink(temp_name)
+    return destination
+
+
+def _open_index_read_only(path: Path) -> sqlite3.Connection | None:
+    try:
+        ensure_no_symlink_components(path)
+        if path.is_symlink() or not path.is_file():
+            return None
+        connection = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
+    except (OSError, ValidationError, sqlite3.Error):
+        return None
+    connection.row_factory = sqlite3.Row
+    return connection
+
+
+def open_lineage_index(home: Path, *, ledger_bin: str | Path | None = None) -> sqlite3.Connection:
+    """Open a current lineage index, rebuilding it when the notes listing moved.
+
+    The index is current when it was built from the same ``(name, size,
+    mtime_ns)`` notes listing, generator and definition, and none of its
+    invalid notes were left unverdicted by a validator failure; invalid notes
+    that were parsed and rejected stay invalid until the listing changes.
+    Otherwise the notes are loaded, validated through the verdict cache,
+    folded, and the index is rewritten.
+    """
+    listing = _notes_listing(home)
+    if listing is None:
+        raise ValidationError(f"notes directory is not a readable directory: {notes_directory(home)}")
+    path = lineage_index_path(home)
+    connection = _open_index_read_only(path)
+    if connection is not None:
+        try:
+            meta = dict(connection.execute("SELECT key, value FROM meta").fetchall())
+        except sqlite3.Error:
+            meta = {}
+        if (
+            meta.get("schema") == LINEAGE_INDEX_SCHEMA
+            and meta.get("source_fingerprint")
+            and meta.get("retryable_invalid_count") == "0"
+            and meta.get("manifest") == json.dumps(_digest_manifest_key(listing), sort_keys=True)
+        ):
+            return connection
+        connection.close()
+    ledger_bin, validation_cache = open_validation_cache(home, ledger_bin)
+    projection_state = ProjectionState.open(home)
+    projection = build_digest_projection(
+        home,
+        ledger_bin=ledger_bin,
+        validation_cache=validation_cache,
+        projection_state=projection_state,
+    )
+    if validation_cache is not None:
+        validation_cache.save()
+    projection_state.save()
+    write_lineage_index(home, projection, listing)
+    connection = _open_index_read_only(path)
+    if connection is None:
+        raise ValidationError(f"lineage index could not be opened: {path}")
+    return connection
+
+
+def _indexed_note(row: sqlite3.Row | None) -> dict[str, Any] | None:
+    return json.loads(row["note_json"]) if row is not None else None
+
+
+def _indexed_lineage(connection: sqlite3.Connection, row: sqlite3.Row) -> dict[str, Any]:
+    current = connection.execute(
+        "SELECT note_json FROM notes WHERE id = ?", (row["current_note_id"],)
+    ).fetchone()
+    return {
+        "root_id": row["root_id"],
+        "category": row["category"],
+        "active": bool(row["active"]),
+        "state": row["state"],
+        "confirmation_count": row["confirmation_count"],
+        "terminal_note_id": row["terminal_note_id"],
+        "current_note": _indexed_note(current),
+    }
+
+
+def query_lineage(connection: sqlite3.Connection, note_id: str) -> dict[str, Any]:
+    """Return the lineage containing ``note_id`` with its ordered events."""
+    located = connection.execute(
+        "SELECT root_id FROM notes WHERE id = ?", (note_id,)
+    ).fetchone()
+    if located is None or located["root_id"] is None:
+        raise ValidationError(f"lineage: no lineage contains note {note_id}")
+    row = connection.execute(
+        "SELECT * FROM lineages WHERE root_id = ?", (located["root_id"],)
+    ).fetchone()
+    events = connection.execute(
+        "SELECT id, captured_at, kind, operation FROM notes "
+        "WHERE root_id = ? ORDER BY event_index",
+        (located["root_id"],),
+    ).fetchall()
+    return {
+        **_indexed_lineage(connection, row),
+        "events": [dict(event) for event in events],
+    }
+
+
+def query_active(
+    connection: sqlite3.Connection,
+    *,
+    scope_repo: str | None = None,
+    scope_kind: str | None = None,
+    scope_path: str | None = None,
+    category: str | None = None,
+) -> list[dict[str, Any]]:
+    """Return active lineages, optionally narrowed by scope and category."""
+    clauses = ["lineages.active = 1"]
+    params: list[Any] = []
+    for column, value in (
+        ("lineages.scope_repo", scope_repo),
+        ("lineages.scope_kind", scope_kind),
+        ("lineages.category", category),
+    ):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if scope_path is not None:
+        clauses.append(
+            "EXISTS (SELECT 1 FROM note_scope_paths WHERE note_scope_paths.note_id = "
+            "lineages.current_note_id AND note_scope_paths.path = ?)"
+        )
+        params.append(scope_path)
+    rows = connection.execute(
+        "SELECT * FROM lineages WHERE "
+        + " AND ".join(clauses)
+        + " ORDER BY category, lower(label), root_id",
+        params,
+    ).fetchall()
+    return [_indexed_lineage(connection, row) for row in rows]
+
+
+def query_unresolved(
+    connection: sqlite3.Connection, *, since: str | None = None
+) -> list[dict[str, Any]]:
+    """Return unresolved events captured at or after ``since``."""
+    rows = connection.execute(
+        "SELECT * FROM unresolved WHERE captured_at >= ? ORDER BY captured_at, id",
+        (since or "",),
+    ).fetchall()
+    return [{**dict(row), "prior_ids": json.loads(row["prior_ids"])} for row in rows]
+
+
+def _compiled_skill_paths(skills_root: Path) -> list[Path]:
+    def fail(exc: OSError) -> None:
+        raise exc
+
+    paths = []
+    for root, _, filenames in os.walk(skills_root, onerror=fail):
+        for name in filenames:
+            path = Path(root) / name
+            if path.is_file():
+                paths.append(path)
+    paths.sort()
+    return paths
+
+
+# Each map holds a duplicated descriptor for as long as it stays open, so
+# only this many documents stay mapped; the rest are mapped per scan.
+MAX_OPEN_MAPS = 128
+
+
+def _open_map_budget() -> int:
+    try:
+        import resource
+
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ImportError, OSError, ValueError):
+        return MAX_OPEN_MAPS
+    if soft == resource.RLIM_INFINITY:
+        return MAX_OPEN_MAPS
+    return max(0, min(MAX_OPEN_MAPS, soft // 4))
+
+
+def _map_file(path: Path) -> mmap.mmap | bytes:
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class CompiledCorpus:
+    """Compiled-memory documents mapped read-only and searched as bytes.
+
+    Documents are never decoded: tokens and terms are UTF-8 encoded instead.
+    Mapped pages stay file-backed, so a large compiled tree does not become
+    resident Python strings. Up to `MAX_OPEN_MAPS` documents stay mapped for
+    the life of the corpus; the rest are mapped only while being scanned.
+    """
+
+    __slots__ = ("paths", "unreadable", "_buffers")
+
+    def __init__(self, paths: list[Path], unreadable: list[str] | None = None) -> None:
+        self.paths: list[Path] = []
+        self.unreadable: list[str] = list(unreadable or [])
+        # None marks a readable document that is mapped on demand.
+        self._buffers: list[mmap.mmap | bytes | None] = []
+        budget = _open_map_budget()
+        for path in paths:
+            try:
+                if budget:
+                    buffer: mmap.mmap | bytes | None = _map_file(path)
+                    budget -= isinstance(buffer, mmap.mmap)
+                else:
+                    with path.open("rb"):
+                        buffer = None
+            except (OSError, ValueError):
+                self.unreadable.append(str(path))
+                continue
+            self.paths.append(path)
+            self._buffers.append(buffer)
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def __iter__(self) -> Iterator[mmap.mmap | bytes]:
+        for index in range(len(self._buffers)):
+            with self._borrow(index) as buffer:
+                yield buffer
+
+    def __enter__(self) -> CompiledCorpus:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for buffer in self._buffers:
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+        self._buffers = []
+        self.paths = []
+
+    @contextlib.contextmanager
+    def _borrow(self, index: int) -> Iterator[mmap.mmap | bytes]:
+        buffer = self._buffers[index]
+        if buffer is not None:
+            yield buffer
+            return
+        path = self.paths[index]
+        try:
+            mapped = _map_file(path)
+        except (OSError, ValueError):
+            # Vanished or unreadable since the corpus was opened.
+            if str(path) not in self.unreadable:
+                self.unreadable.append(str(path))
+            yield b""
+            return
+        try:
+            yield mapped
+        finally:
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+
+    def search(self, pattern: re.Pattern[bytes]) -> bool:
+        return any(pattern.search(buffer) is not None for buffer in self)
+
+    def terms_in(self, index: int, terms: list[bytes]) -> list[int]:
+        with self._borrow(index) as buffer:
+            return [
+                position
+                for position, term in enumerate(terms)
+                if term and buffer.find(term) != -1
+            ]
+
+
+def load_compiled_corpus(home: Path) -> CompiledCorpus:
+    """Map Phase 2 outputs; an unlistable skills tree is reported as unreadable."""
+    root = home / "memories"
+    paths = [
+        path
+        for path in (root / "memory_summary.md", root / "MEMORY.md")
+        if path.is_file()
+    ]
+    skills_root = root / "skills"
     if skills_root.is_dir():
-        roots.extend(path for path in skills_root.rglob("*") if path.is_file())
-    mentions: list[dict[str, Any]] = []
-    terms = ["synesthesia", "sensory_phrase", "engineering_translation", *note_ids]
-    for path in roots:
-        if not path.is_file():
-            continue
         try:
-            text = path.read_text(encoding="utf-8", errors="replace")
+            paths.extend(_compiled_skill_paths(skills_root))
         except OSError:
-            continue
-        hits = [term for term in terms if term and term in text]
-        if hits:
-            mentions.append({"path": str(path), "terms": hits[:20]})
-    return {"files_checked": len(roots), "mentions": mentions}
+            return CompiledCorpus([], [str(skills_root)])
+    return CompiledCorpus(paths)
+
+
+def _scan_compiled_memory(home: Path, note_ids: list[str]) -> dict[str, Any]:
+    terms = ["synesthesia", "sensory_phrase", "engineering_translation", *note_ids]
+    encoded = [term.encode("utf-8") for term in terms]
+    mentions: list[dict[str, Any]] = []
+    with load_compiled_corpus(home) as corpus:
+        for index, path in enumerate(corpus.paths):
+            hits = [terms[position] for position in corpus.terms_in(index, encoded)]
+            if hits:
+                mentions.append({"path": str(path), "terms": hits[:20]})
+        files_checked = len(corpus) + len(corpus.unreadable)
+    return {"files_checked": files_checked, "mentions": mentions}
 
 
 def doctor(home: Path, source_repo: Path | None = None) -> dict[str, Any]:
@@ -1520,7 +3016,17 @@ def doctor(home: Path, source_repo: Path | None = None) -> dict[str, Any]:
     else:
         adapter_status = "stale-or-local"
 
-    projection = build_digest_projection(home)
+    try:
+        ledger_bin, validation_cache = open_validation_cache(home)
+    except ValidationError:
+        # Without a validator every note is reported invalid below.
+        ledger_bin, validation_cache = None, None
+    projection = build_digest_projection(
+        home,
+        ledger_bin=ledger_bin,
+        validation_cache=validation_cache,
+        projection_state=ProjectionState.open(home),
+    )
     note_ids = [note.id for note in projection["notes"]]
     latest = [
         {
@@ -1539,7 +3045,7 @@ def doctor(home: Path, source_repo: Path | None = None) -> dict[str, Any]:
         "binary": str(binary) if binary else None,
     }
     if binary:
-        proc = subprocess.run(
+        proc = _run_process(
             [
                 str(binary),
                 "doctor",
@@ -1712,7 +3218,7 @@ def cmd_append(args: argparse.Namespace) -> int:
         command.extend(["--codex-home", args.codex_home])
     if args.dry_run:
         command.append("--dry-run")
-    proc = subprocess.run(
+    proc = _run_process(
         command,
         input=canonical_json_bytes(normalized),
         capture_output=True,
@@ -1723,8 +3229,12 @@ def cmd_append(args: argparse.Namespace) -> int:
     if proc.stderr:
         sys.stderr.buffer.write(proc.stderr)
     if proc.returncode == 0 and not args.dry_run:
+        home = codex_home(args.codex_home)
         try:
-            generate_memory_digest(codex_home(args.codex_home))
+            if args.sync_digest:
+                generate_memory_digest(home)
+            else:
+                schedule_digest_refresh(home)
         except Exception as exc:  # Digest failure must never roll back source-note capture.
             print(f"memory-digest warning: {exc}", file=sys.stderr)
     return proc.returncode
@@ -1732,13 +3242,19 @@ def cmd_append(args: argparse.Namespace) -> int:
 
 def cmd_memory_digest(args: argparse.Namespace) -> int:
     output = Path(args.output).expanduser() if args.output else None
-    result = generate_memory_digest(
-        codex_home(args.codex_home),
-        output=output,
-        include_inactive=args.include_inactive,
-        limit=args.limit,
-        force=args.force,
-    )
+    home = codex_home(args.codex_home)
+    with (
+        _resource_lock(home, DIGEST_LOCK_FILENAME)
+        if output is None
+        else contextlib.nullcontext()
+    ):
+        result = generate_memory_digest(
+            home,
+            output=output,
+            include_inactive=args.include_inactive,
+            limit=args.limit,
+            force=args.force,
+        )
     if args.format == "json":
         print(json.dumps({"synesthesia_memory_digest": result}, indent=2, sort_keys=True))
     else:
@@ -1751,6 +3267,13 @@ def cmd_memory_digest(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_refresh_digest(args: argparse.Namespace) -> int:
+    result = run_digest_refresh(codex_home(args.codex_home), args.worker_lock_fd)
+    if args.format == "json":
+        print(json.dumps({"synesthesia_memory_digest": result}, indent=2, sort_keys=True))
+    return 0
+
+
 def cmd_sync(args: argparse.Namespace) -> int:
     result = sync_instructions(
         codex_home(args.codex_home), Path(args.source).expanduser() if args.source else None
@@ -1785,6 +3308,45 @@ def cmd_doctor(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_shards(args: argparse.Namespace) -> int:
+    result = relevant_shards(codex_home(args.codex_home), args.scope_repo, args.path or ())
+    if args.format == "json":
+        print(json.dumps({"synesthesia_digest_shards": result}, indent=2, sort_keys=True))
+    else:
+        for row in result:
+            print(row["path"])
+    return 0
+
+
+def cmd_lineage(args: argparse.Namespace) -> int:
+    with contextlib.closing(open_lineage_index(codex_home(args.codex_home))) as connection:
+        result = query_lineage(connection, args.id)
+    print(json.dumps({"synesthesia_lineage": result}, indent=2, ensure_ascii=False, sort_keys=True))
+    return 0
+
+
+def cmd_active(args: argparse.Namespace) -> int:
+    with contextlib.closing(open_lineage_index(codex_home(args.codex_home))) as connection:
+        result = query_active(
+            connection,
+            scope_repo=args.scope_repo,
+            scope_kind=args.scope_kind,
+            scope_path=args.scope_path,
+            category=args.category,
+        )
+    print(json.dumps({"synesthesia_active": result}, indent=2, ensure_ascii=False, sort_keys=True))
+    return 0
+
+
+def cmd_unresolved(args: argparse.Namespace) -> int:
+    with contextlib.closing(open_lineage_index(codex_home(args.codex_home))) as connection:
+        result = query_unresolved(connection, since=args.since)
+    print(
+        json.dumps({"synesthesia_unresolved": result}, indent=2, ensure_ascii=False, sort_keys=True)
+    )
+    return 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Synesthesia memory-source note, digest, and deployment adapter"
@@ -1801,6 +3363,11 @@ def build_parser() -> argparse.ArgumentParser:
     append_parser.add_argument("--json", required=True, help="JSON input file or - for stdin")
     append_parser.add_argument("--codex-home")
     append_parser.add_argument("--dry-run", action="store_true")
+    append_parser.add_argument(
+        "--sync-digest",
+        action="store_true",
+        help="Regenerate the digest before returning instead of coalescing the refresh",
+    )
     append_parser.set_defaults(func=cmd_append)
 
     digest_parser = sub.add_parser(
@@ -1820,6 +3387,15 @@ def build_parser() -> argparse.ArgumentParser:
     digest_parser.add_argument("--format", choices=("text", "json"), default="text")
     digest_parser.set_defaults(func=cmd_memory_digest)
 
+    refresh_parser = sub.add_parser(
+        "refresh-digest",
+        help="Run the coalesced digest refresh that append schedules",
+    )
+    refresh_parser.add_argument("--codex-home")
+    refresh_parser.add_argument("--format", choices=("quiet", "json"), default="quiet")
+    refresh_parser.add_argument("--worker-lock-fd", type=int, help=argparse.SUPPRESS)
+    refresh_parser.set_defaults(func=cmd_refresh_digest)
+
     sync_parser = sub.add_parser(
         "sync-instructions", help="Copy the checked-in adapter into the live memory root"
     )
@@ -1832,6 +3408,39 @@ def build_parser() -> argparse.ArgumentParser:
     doctor_parser.add_argument("--repo", default=".")
     doctor_parser.add_argument("--format", choices=("json", "text"), default="json")
     doctor_parser.set_defaults(func=cmd_doctor)
+
+    shards_parser = sub.add_parser(
+        "shards", help="List the digest shards relevant to a repository"
+    )
+    shards_parser.add_argument("--codex-home")
+    shards_parser.add_argument("--scope-repo", help="Canonical owner/repo")
+    shards_parser.add_argument(
+        "--path", action="append", help="Repository path being worked on (repeatable)"
+    )
+    shards_parser.add_argument("--format", choices=("text", "json"), default="text")
+    shards_parser.set_defaults(func=cmd_shards)
+
+    lineage_parser = sub.add_parser(
+        "lineage", help="Show the indexed lineage that contains one note id"
+    )
+    lineage_parser.add_argument("--codex-home")
+    lineage_parser.add_argument("--id", required=True, help="Any note id in the lineage")
+    lineage_parser.set_defaults(func=cmd_lineage)
+
+    active_parser = sub.add_parser("active", help="List indexed active lineages")
+    active_parser.add_argument("--codex-home")
+    active_parser.add_argument("--scope-repo")
+    active_parser.add_argument("--scope-kind", choices=sorted(SCOPE_SPECIFICITY))
+    active_parser.add_argument("--scope-path")
+    active_parser.add_argument("--category", choices=("mapping", "boundary"))
+    active_parser.set_defaults(func=cmd_active)
+
+    unresolved_parser = sub.add_parser(
+        "unresolved", help="List indexed unresolved events"
+    )
+    unresolved_parser.add_argument("--codex-home")
+    unresolved_parser.add_argument("--since", help="Minimum captured_at, e.g. 2026-01-01T00:00:00Z")
+    unresolved_parser.set_defaults(func=cmd_unresolved)
     return parser
 
 
@@ -1850,7 +3459,7 @@ def main() -> int:
             file=sys.stderr,
         )
         return 2
-    except OSError as exc:
+    except (OSError, sqlite3.Error) as exc:
         print(
             json.dumps(
                 {"synesthesia_memory_note": {"verdict": "fail", "error": str(exc)}},
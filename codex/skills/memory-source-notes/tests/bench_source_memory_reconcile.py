@@ -0,0 +1,239 @@
+#!/usr/bin/env -S uv run python
+"""Benchmark source-memory reconciliation against synthesized stores.
+
+Each tier runs the reconciler in a fresh child process with the stub
+`ledger` and `memory-note` executables from `fixtures/bin`, selected through
+`LEDGER_BIN` and `MEMORY_NOTE_BIN`. No live store or compiled memory is read.
+
+The largest default tier is one below `MAX_LIMIT`: an inventory that reaches
+`--limit` is treated as truncated and blocks the run by design.
+
+Stages are attributed by wrapping reconciler entry points in the child.
+Subprocess work that runs outside a wrapped stage, such as the store doctors,
+is reported under `other`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+sys.dont_write_bytecode = True
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts/source-memory-reconcile.py"
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+STUB_BIN = FIXTURES / "bin"
+DEFAULT_SIZES = (1_000, 10_000, 99_999)
+
+
+def load_reconciler() -> Any:
+    spec = importlib.util.spec_from_file_location("source_memory_reconcile", SCRIPT)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class StageMeter:
+    """Attribute wall time and traced peak memory to the innermost stage."""
+
+    def __init__(self, trace_memory: bool) -> None:
+        self.trace_memory = trace_memory
+        self.stack: list[str] = []
+        self.stages: dict[str, dict[str, Any]] = {}
+
+    def wrap(self, stage: str, function: Callable[..., Any]) -> Callable[..., Any]:
+        def measured(*args: Any, **kwargs: Any) -> Any:
+            self.stack.append(stage)
+            os.environ["RECONCILE_STUB_STAGE"] = stage
+            if self.trace_memory:
+                tracemalloc.reset_peak()
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                row = self.stages.setdefault(
+                    stage, {"calls": 0, "wall_sec": 0.0, "peak_traced_bytes": 0}
+                )
+                row["calls"] += 1
+                row["wall_sec"] += time.perf_counter() - started
+                if self.trace_memory:
+                    row["peak_traced_bytes"] = max(
+                        row["peak_traced_bytes"], tracemalloc.get_traced_memory()[1]
+                    )
+                self.stack.pop()
+                os.environ["RECONCILE_STUB_STAGE"] = (
+                    self.stack[-1] if self.stack else "other"
+                )
+
+        return measured
+
+
+def run_child(config: dict[str, Any]) -> int:
+    module = load_reconciler()
+    meter = StageMeter(config["trace_memory"])
+    os.environ["RECONCILE_STUB_STAGE"] = "other"
+    for stage, name in (
+        ("eligibility", "load_eligibility"),
+        ("list", "load_notes"),
+        ("records", "source_records"),
+        ("classification", "source_report"),
+    ):
+        setattr(module, name, meter.wrap(stage, getattr(module, name)))
+    load_adapter = module.load_synesthesia_adapter
+
+    def load_measured_adapter(path: Path) -> Any:
+        adapter = load_adapter(path)
+        adapter.load_compiled_corpus = meter.wrap(
+            "compiled-corpus", adapter.load_compiled_corpus
+        )
+        adapter.load_stored_notes = meter.wrap(
+            "adapter-validation", adapter.load_stored_notes
+        )
+        return adapter
+
+    module.load_synesthesia_adapter = load_measured_adapter
+    args = module.build_parser().parse_args(config["argv"])
+    streamed = 0
+
+    def sink(_: dict[str, Any]) -> None:
+        nonlocal streamed
+        streamed += 1
+
+    if config["trace_memory"]:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        report = module.reconcile(args, emit=sink if config["ndjson"] else None)
+        verdict, error = report["verdict"], None
+    except module.ReconcileError as exc:
+        verdict, error = "blocked", str(exc)
+    wall = time.perf_counter() - started
+    print(
+        json.dumps(
+            {
+                "verdict": verdict,
+                "error": error,
+                "wall_sec": wall,
+                "streamed_records": streamed,
+                "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                "stages": meter.stages,
+            }
+        )
+    )
+    return 0
+
+
+def subprocess_accounting(log: Path) -> dict[str, Any]:
+    by_command: dict[str, int] = {}
+    by_stage: dict[str, dict[str, int]] = {}
+    total = 0
+    if log.exists():
+        for line in log.read_text(encoding="utf-8").splitlines():
+            row = json.loads(line)
+            command = f"{row['binary']} {row['command']}"
+            by_command[command] = by_command.get(command, 0) + 1
+            stage = by_stage.setdefault(row["stage"], {})
+            stage[command] = stage.get(command, 0) + 1
+            total += 1
+    return {"total": total, "by_command": by_command, "by_stage": by_stage}
+
+
+def run_tier(size: int, options: argparse.Namespace) -> dict[str, Any]:
+    sys.path.insert(0, str(FIXTURES))
+    import reconcile_stub
+
+    synesthesia_records = (
+        options.synesthesia_records if options.synesthesia_records is not None else size
+    )
+    with tempfile.TemporaryDirectory(prefix="reconcile-bench-") as root:
+        repo = Path(root) / "repo"
+        home = Path(root) / "codex-home"
+        repo.mkdir()
+        (home / "memories").mkdir(parents=True)
+        notes = reconcile_stub.write_synesthesia_notes(home, synesthesia_records)
+        log = Path(root) / "stub-log.jsonl"
+        env = {
+            **os.environ,
+            "LEDGER_BIN": str(STUB_BIN / "ledger"),
+            "MEMORY_NOTE_BIN": str(STUB_BIN / "memory-note"),
+            "RECONCILE_STUB_RECORDS": str(size),
+            "RECONCILE_STUB_SYNESTHESIA_RECORDS": str(synesthesia_records),
+            "RECONCILE_STUB_LOG": str(log),
+        }
+        config = {
+            "argv": [
+                "--repo",
+                str(repo),
+                "--codex-home",
+                str(home),
+                "--limit",
+                str(options.limit),
+            ],
+            "trace_memory": options.trace_memory,
+            "ndjson": options.ndjson,
+        }
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, __file__, "--child", json.dumps(config)],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        elapsed = time.perf_counter() - started
+        if proc.returncode:
+            raise SystemExit(f"benchmark child failed: {proc.stderr.strip()}")
+        result = json.loads(proc.stdout)
+        return {
+            "records_per_source": size,
+            "synesthesia_records": synesthesia_records,
+            "synesthesia_notes": notes,
+            "end_to_end_sec": elapsed,
+            **result,
+            "subprocesses": subprocess_accounting(log),
+        }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark source-memory reconciliation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument(
+        "--synesthesia-records",
+        type=int,
+        help="Synesthesia records per tier (default: the tier size)",
+    )
+    parser.add_argument("--limit", type=int, default=100_000)
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Record per-stage tracemalloc peaks (slows every stage)",
+    )
+    parser.add_argument("--ndjson", action="store_true", help="Stream records instead of buffering")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    return parser
+
+
+def main() -> int:
+    options = build_parser().parse_args()
+    if options.child:
+        return run_child(json.loads(options.child))
+    tiers = [run_tier(size, options) for size in options.sizes]
+    print(json.dumps({"source_memory_reconcile_benchmark": tiers}, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
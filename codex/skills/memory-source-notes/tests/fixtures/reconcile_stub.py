@@ -0,0 +1,309 @@
+"""Deterministic stand-ins for `ledger` and `memory-note` in reconciliation runs.
+
+The stubs honour only the argv and JSON result contracts that
+`source-memory-reconcile.py` and the Synesthesia and Negative Ledger adapters
+consume. Store size is synthesized from the environment instead of read from a
+live store:
+
+- `RECONCILE_STUB_RECORDS`: canonical records per source (default 10)
+- `RECONCILE_STUB_SYNESTHESIA_RECORDS`: Synesthesia override
+- `RECONCILE_STUB_LOG`: optional JSONL invocation log for benchmarks
+- `RECONCILE_STUB_STAGE`: stage label copied into each log row
+- `RECONCILE_STUB_MISSING_IDS`: comma-separated ids whose projection fails
+
+Every tenth canonical record has no admission note, so reports contain both
+`admitted` and `needs-source-review` rows. Synesthesia notes are the files in
+`<codex-home>/memories/extensions/synesthesia/notes`; write them with
+`write_synesthesia_notes` before running the reconciler.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+LEDGER_ABI = "ledger-artifact-abi/v1"
+SCRIPTS = Path(__file__).resolve().parents[2] / "scripts"
+DEFINITION_IDS = {
+    "learnings-protocol.json": "learnings/protocol",
+    "negative-evidence-protocol.json": "negative-ledger/negative-evidence-protocol",
+    "synesthesia-protocol.json": "synesthesia/protocol",
+    "source-memory-eligibility.json": "memory-source-notes/source-memory-eligibility",
+    "synesthesia-memory-note-payload.json": (
+        "memory-source-notes/synesthesia-memory-note-payload"
+    ),
+    "negative-ledger-memory-note-payload.json": (
+        "memory-source-notes/negative-ledger-memory-note-payload"
+    ),
+}
+SOURCE_BY_DEFINITION = {
+    "learnings/protocol": "learnings",
+    "negative-ledger/negative-evidence-protocol": "negative-ledger",
+    "synesthesia/protocol": "synesthesia",
+}
+NOTE_KINDS = {"learnings": "learning-admission", "negative-ledger": "ledger-projection"}
+
+
+def record_count(source: str) -> int:
+    if source == "synesthesia" and os.environ.get("RECONCILE_STUB_SYNESTHESIA_RECORDS"):
+        return int(os.environ["RECONCILE_STUB_SYNESTHESIA_RECORDS"])
+    return int(os.environ.get("RECONCILE_STUB_RECORDS", "10"))
+
+
+def record_id(source: str, index: int) -> str:
+    prefix = {"learnings": "LRN", "negative-ledger": "NEG", "synesthesia": "SYN"}[source]
+    return f"{prefix}-{index:06d}"
+
+
+def has_note(index: int) -> bool:
+    return index % 10 != 0
+
+
+def note_id(source: str, index: int) -> str:
+    tag = hashlib.sha256(f"{source}:{index}".encode()).hexdigest()[:16]
+    return f"MSN-20260101T{index % 240000:06d}Z-{tag}"
+
+
+def index_row(source: str, index: int) -> dict[str, Any]:
+    field = {"learnings": "id", "negative-ledger": "neg_id", "synesthesia": "syn_id"}[source]
+    row: dict[str, Any] = {field: record_id(source, index)}
+    if source == "synesthesia":
+        row["logical_kind"] = "mapping-endorsement"
+    return row
+
+
+def export_payload(source: str, index: int) -> dict[str, Any]:
+    identifier = record_id(source, index)
+    if source == "learnings":
+        return {
+            "learning_id": identifier,
+            "summary": f"Synthetic learning {index}",
+            "scope": {"kind": "global", "repo": None},
+        }
+    if source == "negative-ledger":
+        return {
+            "neg_id": identifier,
+            "status": "active",
+            "projection_fingerprint": hashlib.sha256(identifier.encode()).hexdigest(),
+        }
+    return {
+        "operation": "assert",
+        "authority": "explicit-user-endorsement",
+        "summary": f"Synthetic mapping {index}",
+        "scope": {"kind": "global", "repo": None},
+        "source_refs": [
+            {"kind": "ledger", "ref": identifier, "summary": "synthetic source"}
+        ],
+        "related_ids": [],
+        "supersedes_id": None,
+        "payload": {
+            "sensory_phrase": f"phrase {index}",
+            "engineering_translation": f"translation {index}",
+            "activation_boundary": "synthetic activation",
+            "non_activation_boundary": "synthetic non-activation",
+            "verification": "synthetic verification",
+        },
+    }
+
+
+def export_bytes(payload: dict[str, Any]) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode() + b"\n"
+
+
+def writer_fingerprint(extension: str, kind: str, raw: bytes) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"{extension}\n{kind}\n".encode())
+    digest.update(raw)
+    return digest.hexdigest()
+
+
+def note_row(source: str, index: int) -> dict[str, Any]:
+    payload = export_payload(source, index)
+    kind = NOTE_KINDS[source]
+    return {
+        "id": note_id(source, index),
+        "extension": source,
+        "kind": kind,
+        "fingerprint": writer_fingerprint(source, kind, export_bytes(payload)),
+        "payload": payload,
+        "scope": {"kind": "global", "repo": None},
+    }
+
+
+def synesthesia_notes_directory(codex_home: Path) -> Path:
+    return codex_home / "memories/extensions/synesthesia/notes"
+
+
+def write_synesthesia_notes(codex_home: Path, count: int) -> int:
+    """Write stored notes whose fingerprints match the stub exports."""
+    spec = importlib.util.spec_from_file_location(
+        "synesthesia_memory_note", SCRIPTS / "synesthesia_memory_note.py"
+    )
+    assert spec is not None and spec.loader is not None
+    adapter = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(adapter)
+    directory = synesthesia_notes_directory(codex_home)
+    directory.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for index in range(count):
+        if not has_note(index):
+            continue
+        normalized = adapter._normalize_writer_input(export_payload("synesthesia", index))
+        identifier = note_id("synesthesia", index)
+        note = {
+            "id": identifier,
+            "captured_at": f"2026-01-01T00:00:{index % 60:02d}Z",
+            "kind": "mapping-endorsement",
+            **normalized,
+            "fingerprint": adapter.canonical_fingerprint("mapping-endorsement", normalized),
+        }
+        (directory / f"{identifier}.md").write_bytes(adapter.canonical_json_bytes(note))
+        written += 1
+    return written
+
+
+def argument(argv: list[str], name: str) -> str | None:
+    for position, value in enumerate(argv[:-1]):
+        if value == name:
+            return argv[position + 1]
+    return None
+
+
+def arguments(argv: list[str], name: str) -> list[str]:
+    return [argv[position + 1] for position, value in enumerate(argv[:-1]) if value == name]
+
+
+def definition_identity(path: str | None) -> dict[str, Any]:
+    definition = Path(path or "")
+    try:
+        digest = hashlib.sha256(definition.read_bytes()).hexdigest()
+    except OSError:
+        digest = "0" * 64
+    return {
+        "id": DEFINITION_IDS.get(definition.name, definition.stem),
+        "abi": LEDGER_ABI,
+        "digest": f"sha256:{digest}",
+    }
+
+
+def passive(schema: str, definition: dict[str, Any], **fields: Any) -> dict[str, Any]:
+    return {
+        "schema": schema,
+        "definition": definition,
+        "authority_granted": False,
+        "storage_mutated": False,
+        **fields,
+    }
+
+
+def ledger_main(argv: list[str]) -> int:
+    definition = definition_identity(argument(argv, "--definition"))
+    command = argv[0] if argv else ""
+    if command == "definition":
+        result = passive(
+            "ledger-definition-check-result/v1", definition, valid=True, passive=True
+        )
+    elif command == "doctor":
+        result = passive(
+            "ledger-doctor-result/v1",
+            definition,
+            healthy=True,
+            slots=[{"name": "events", "status": "current", "healthy": True}],
+        )
+    elif command == "validate":
+        for value in arguments(argv, "--input"):
+            target = value.split("=", 1)[-1]
+            if target == "-":
+                sys.stdin.buffer.read()
+            else:
+                Path(target).read_bytes()
+        result = passive("ledger-validation-result/v1", definition, valid=True, errors=[])
+    elif command == "project":
+        source = SOURCE_BY_DEFINITION[definition["id"]]
+        projection = argument(argv, "--projection")
+        params = dict(value.split("=", 1) for value in arguments(argv, "--param"))
+        if params.get("id") in os.environ.get("RECONCILE_STUB_MISSING_IDS", "").split(","):
+            print(f"ledger stub: no projection for {params['id']}", file=sys.stderr)
+            return 1
+        if projection == "reconciliation-index":
+            data: Any = [index_row(source, index) for index in range(record_count(source))]
+        else:
+            index = int(params["id"].rsplit("-", 1)[1])
+            data = export_payload(source, index)
+            if "--payload-only" in argv:
+                sys.stdout.buffer.write(export_bytes({"payload": data}))
+                return 0
+        result = passive(
+            "ledger-projection-result/v1", definition, projection=projection, data=data
+        )
+    else:
+        print(f"ledger stub: unsupported command {command!r}", file=sys.stderr)
+        return 64
+    sys.stdout.write(json.dumps(result, separators=(",", ":")) + "\n")
+    return 0
+
+
+def memory_note_main(argv: list[str]) -> int:
+    command = argv[0] if argv else ""
+    extension = argument(argv, "--extension")
+    codex_home = Path(argument(argv, "--codex-home") or ".")
+    if command == "doctor":
+        result: dict[str, Any] = {"command": "doctor", "issues": 0}
+    elif command == "list" and extension == "synesthesia":
+        rows = []
+        for path in sorted(synesthesia_notes_directory(codex_home).glob("*.md")):
+            note = json.loads(path.read_bytes())
+            rows.append(
+                {
+                    field: note.get(field)
+                    for field in ("id", "kind", "fingerprint", "payload", "scope")
+                }
+                | {"extension": extension}
+            )
+        result = {"command": "list", "extension": extension, "notes": rows, "total": len(rows)}
+    elif command == "append" and extension in NOTE_KINDS:
+        raw = sys.stdin.buffer.read()
+        kind = argument(argv, "--kind") or NOTE_KINDS[extension]
+        fingerprint = writer_fingerprint(extension, kind, raw)
+        result = {
+            "command": "append",
+            "extension": extension,
+            "kind": kind,
+            "id": f"MSN-20260101T000000Z-{fingerprint[:16]}",
+            "fingerprint": fingerprint,
+            "status": "dry-run" if "--dry-run" in argv else "created",
+        }
+    elif command == "list" and extension in NOTE_KINDS:
+        rows = [
+            note_row(extension, index)
+            for index in range(record_count(extension))
+            if has_note(index)
+        ]
+        result = {"command": "list", "extension": extension, "notes": rows, "total": len(rows)}
+    else:
+        print(f"memory-note stub: unsupported command {command!r}", file=sys.stderr)
+        return 64
+    sys.stdout.write(json.dumps(result, separators=(",", ":")) + "\n")
+    return 0
+
+
+def run(binary: str, main: Any) -> int:
+    started = time.perf_counter()
+    status = main(sys.argv[1:])
+    log = os.environ.get("RECONCILE_STUB_LOG")
+    if log:
+        row = {
+            "binary": binary,
+            "command": " ".join(sys.argv[1 : 3 if sys.argv[1:2] == ["definition"] else 2]),
+            "stage": os.environ.get("RECONCILE_STUB_STAGE", "unstaged"),
+            "elapsed_sec": round(time.perf_counter() - started, 6),
+        }
+        with open(log, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(row) + "\n")
+    return status
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import contextlib
+import errno
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts/negative_ledger_memory_note.py"
+SPEC = importlib.util.spec_from_file_location("negative_ledger_memory_note", SCRIPT)
+assert SPEC is not None and SPEC.loader is not None
+MODULE = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = MODULE
+SPEC.loader.exec_module(MODULE)
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+STUB_SPEC = importlib.util.spec_from_file_location(
+    "reconcile_stub", FIXTURES / "reconcile_stub.py"
+)
+assert STUB_SPEC is not None and STUB_SPEC.loader is not None
+reconcile_stub = importlib.util.module_from_spec(STUB_SPEC)
+STUB_SPEC.loader.exec_module(reconcile_stub)
+
+
+class AdmitBatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        self.repo = Path(self.root.name) / "repo"
+        self.home = Path(self.root.name) / "codex-home"
+        self.log = Path(self.root.name) / "stub-log.jsonl"
+        self.repo.mkdir()
+        self.home.mkdir()
+        environment = mock.patch.dict(
+            os.environ,
+            {
+                "LEDGER_BIN": str(FIXTURES / "bin/ledger"),
+                "MEMORY_NOTE_BIN": str(FIXTURES / "bin/memory-note"),
+                "RECONCILE_STUB_LOG": str(self.log),
+            },
+        )
+        environment.start()
+        self.addCleanup(environment.stop)
+
+    def run_command(self, *argv: str) -> tuple[int, list[dict[str, object]]]:
+        args = MODULE.build_parser().parse_args(
+            [*argv, "--repo", str(self.repo), "--codex-home", str(self.home)]
+        )
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        with contextlib.redirect_stdout(stdout):
+            status = args.func(args)
+        stdout.flush()
+        lines = stdout.buffer.getvalue().decode("utf-8").splitlines()
+        return status, [json.loads(line) for line in lines]
+
+    def invocations(self) -> list[str]:
+        return [
+            f"{row['binary']} {row['command']}"
+            for row in map(json.loads, self.log.read_text(encoding="utf-8").splitlines())
+        ]
+
+    def test_batch_runs_doctor_once_and_streams_receipts(self) -> None:
+        ids = [f"NEG-{index:06d}" for index in range(1, 5)]
+        status, lines = self.run_command(
+            "admit-batch", *(value for neg_id in ids for value in ("--id", neg_id))
+        )
+        self.assertEqual(status, 0)
+        receipts, summary = lines[:-1], lines[-1]
+        self.assertEqual([receipt["neg_id"] for receipt in receipts], ids)
+        self.assertTrue(all(receipt["verdict"] == "admitted" for receipt in receipts))
+        for receipt in receipts:
+            self.assertEqual(receipt["result"]["fingerprint"], receipt["writer_fingerprint"])
+        self.assertEqual(summary["schema"], MODULE.BATCH_SCHEMA)
+        self.assertEqual(summary["admitted"], 4)
+        invocations = self.invocations()
+        self.assertEqual(invocations.count("ledger doctor"), 1)
+        self.assertEqual(invocations.count("ledger project"), 4)
+        self.assertEqual(invocations.count("memory-note append"), 4)
+
+    def test_failed_export_blocks_only_its_receipt(self) -> None:
+        with mock.patch.dict(os.environ, {"RECONCILE_STUB_MISSING_IDS": "NEG-000002"}):
+            status, lines = self.run_command(
+                "admit-batch",
+                *("--id", "NEG-000001", "--id", "NEG-000002", "--id", "NEG-000003"),
+            )
+        self.assertEqual(status, 2)
+        verdicts = {line["neg_id"]: line["verdict"] for line in lines[:-1]}
+        self.assertEqual(
+            verdicts,
+            {"NEG-000001": "admitted", "NEG-000002": "blocked", "NEG-000003": "admitted"},
+        )
+        self.assertEqual(lines[-1]["blocked"], 1)
+        self.assertEqual(self.invocations().count("memory-note append"), 2)
+
+    def test_pipeline_bounds_exports_and_keeps_append_order(self) -> None:
+        ids = [f"NEG-{index:06d}" for index in range(1, 9)]
+        export = MODULE.export_projection
+        lock = threading.Lock()
+        active, peak = 0, 0
+
+        def slow_export(neg_id: str, **kwargs: object) -> bytes:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02 * (len(ids) - int(neg_id[-2:])))
+            try:
+                return export(neg_id, **kwargs)
+            finally:
+                with lock:
+                    active -= 1
+
+        with mock.patch.object(MODULE, "export_projection", side_effect=slow_export):
+            status, lines = self.run_command(
+                "admit-batch",
+                "--workers",
+                "3",
+                *(value for neg_id in ids for value in ("--id", neg_id)),
+            )
+        self.assertEqual(status, 0)
+        self.assertEqual([line["neg_id"] for line in lines[:-1]], ids)
+        self.assertGreater(peak, 1)
+        self.assertLessEqual(peak, 3)
+
+    def test_doctor_verdict_is_reused_until_the_store_changes(self) -> None:
+        store = self.repo / MODULE.SOURCE_STORE
+        store.mkdir(parents=True)
+        (store / "events.jsonl").write_text("{}\n", encoding="utf-8")
+        cached = []
+        for extra in ((), (), ("--fresh-doctor",), ()):
+            _, lines = self.run_command("admit-batch", "--id", "NEG-000001", *extra)
+            cached.append(lines[-1]["doctor_cached"])
+        with (store / "events.jsonl").open("a", encoding="utf-8") as handle:
+            handle.write("{}\n")
+        _, lines = self.run_command("admit-batch", "--id", "NEG-000001")
+        cached.append(lines[-1]["doctor_cached"])
+        self.assertEqual(cached, [False, True, False, True, False])
+        self.assertEqual(self.invocations().count("ledger doctor"), 3)
+        cache = MODULE.doctor_cache_path(self.home)
+        self.assertEqual(cache.stat().st_mode & 0o777, 0o600)
+
+    def test_streamed_export_reaches_append_unchanged(self) -> None:
+        for spool_bytes in (MODULE.SPOOL_MAX_BYTES, 8):
+            with self.subTest(spool_bytes=spool_bytes), mock.patch.object(
+                MODULE, "SPOOL_MAX_BYTES", spool_bytes
+            ):
+                export = MODULE.export_projection(
+                    "NEG-000003",
+                    kind="ledger-projection",
+                    ledger=os.environ["LEDGER_BIN"],
+                    repo=self.repo,
+                )
+                self.addCleanup(export.close)
+                raw = reconcile_stub.export_bytes(
+                    {"payload": reconcile_stub.export_payload("negative-ledger", 3)}
+                )
+                self.assertEqual(export.size, len(raw))
+                self.assertEqual(
+                    export.writer_fingerprint,
+                    MODULE.expected_writer_fingerprint("ledger-projection", raw),
+                )
+                self.assertIn(
+                    "stdin" if spool_bytes == 8 else "input_bytes",
+                    export.stdin_arguments(),
+                )
+                status, lines = self.run_command("admit", "--id", "NEG-000003")
+                self.assertEqual(status, 0)
+                self.assertEqual(lines[0]["fingerprint"], export.writer_fingerprint)
+
+    def test_invalid_export_is_blocked_after_validation(self) -> None:
+        with mock.patch.dict(
+            os.environ, {"RECONCILE_STUB_MISSING_IDS": "NEG-000004"}
+        ), self.assertRaisesRegex(MODULE.AdapterError, "ledger project: ledger stub"):
+            MODULE.export_projection(
+                "NEG-000004",
+                kind="ledger-projection",
+                ledger=os.environ["LEDGER_BIN"],
+                repo=self.repo,
+            )
+
+    def test_stdin_is_not_read_for_both_id_sources(self) -> None:
+        with self.assertRaisesRegex(MODULE.AdapterError, "cannot both read stdin"):
+            self.run_command("admit-batch", "--ids-file", "-", "--from-reconcile", "-")
+        self.assertFalse(self.log.exists())
+
+    def spawned(self, replace: dict[str, list[str]]) -> tuple[list[object], object]:
+        """Patch ``_spawn`` to record children, swapping commands by subcommand."""
+        spawn = MODULE._spawn
+        children: list[object] = []
+
+        def record(argv: list[str], **kwargs: object) -> object:
+            proc = spawn(replace.get(argv[1], argv), **kwargs)
+            children.append(proc)
+            return proc
+
+        return children, mock.patch.object(MODULE, "_spawn", side_effect=record)
+
+    def export(self) -> object:
+        return MODULE.export_projection(
+            "NEG-000001",
+            kind="ledger-projection",
+            ledger=os.environ["LEDGER_BIN"],
+            repo=self.repo,
+        )
+
+    def test_stalled_validator_times_out_and_children_are_reaped(self) -> None:
+        flood = "import sys; sys.stdout.buffer.write(b'x' * (4 << 20))"
+        children, patch = self.spawned(
+            {
+                "project": [sys.executable, "-c", flood],
+                "validate": [sys.executable, "-c", "import time; time.sleep(60)"],
+            }
+        )
+        started = time.monotonic()
+        with patch, mock.patch.object(
+            MODULE, "EXPORT_TIMEOUT_SEC", 0.5
+        ), self.assertRaisesRegex(MODULE.AdapterError, "timed out"):
+            self.export()
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertEqual(len(children), 2)
+        self.assertTrue(all(child.returncode is not None for child in children))
+
+    def test_interrupted_stream_kills_and_reaps_children(self) -> None:
+        children, patch = self.spawned({})
+        with patch, mock.patch.object(
+            MODULE, "_writer_hasher", side_effect=KeyboardInterrupt
+        ), self.assertRaises(KeyboardInterrupt):
+            self.export()
+        self.assertEqual(len(children), 2)
+        self.assertTrue(all(child.returncode is not None for child in children))
+
+    def test_spool_write_failure_blocks_each_receipt(self) -> None:
+        full = OSError(errno.ENOSPC, "No space left on device")
+        with mock.patch.object(
+            MODULE.tempfile.SpooledTemporaryFile, "write", side_effect=full
+        ):
+            status, lines = self.run_command(
+                "admit-batch", *("--id", "NEG-000001", "--id", "NEG-000002")
+            )
+        self.assertEqual(status, 2)
+        self.assertEqual([line["verdict"] for line in lines[:-1]], ["blocked"] * 2)
+        self.assertIn("No space left", lines[0]["error"])
+        self.assertEqual(lines[-1]["blocked"], 2)
+        self.assertNotIn("memory-note append", self.invocations())
+
+    def test_early_exit_closes_exports_still_in_flight(self) -> None:
+        export = MODULE.export_projection
+        exports: list[object] = []
+
+        def record(neg_id: str, **kwargs: object) -> object:
+            exports.append(export(neg_id, **kwargs))
+            return exports[-1]
+
+        ids = [f"NEG-{index:06d}" for index in range(1, 5)]
+        with mock.patch.object(
+            MODULE, "export_projection", side_effect=record
+        ), mock.patch.object(
+            MODULE, "_emit_receipt", side_effect=KeyboardInterrupt
+        ), self.assertRaises(KeyboardInterrupt):
+            self.run_command(
+                "admit-batch",
+                "--workers",
+                "3",
+                *(value for neg_id in ids for value in ("--id", neg_id)),
+            )
+        self.assertGreater(len(exports), 1)
+        self.assertTrue(all(item.spool.closed for item in exports))
+
+    def test_reconcile_rows_select_eligible_unadmitted_ids(self) -> None:
+        rows = [
+            {
+                "schema": MODULE.RECONCILE_RECORD_SCHEMA,
+                "source": source,
+                "record_id": record_id,
+                "status": status,
+            }
+            for source, record_id, status in (
+                ("negative-ledger", "NEG-000010", "eligible-unadmitted"),
+                ("negative-ledger", "NEG-000011", "admitted"),
+                ("learnings", "LRN-000010", "eligible-unadmitted"),
+                ("negative-ledger", "NEG-000020", "eligible-unadmitted"),
+            )
+        ]
+        stream = "".join(json.dumps(row) + "\n" for row in rows)
+        stream += json.dumps({"schema": "source-memory-reconciliation/v2"}) + "\n"
+        self.assertEqual(
+            MODULE.reconcile_eligible_ids(stream), ["NEG-000010", "NEG-000020"]
+        )
+        records = [row for row in rows if row["source"] == "negative-ledger"]
+        report = {"sources": {"negative-ledger": {"records": records}}}
+        self.assertEqual(
+            MODULE.reconcile_eligible_ids(json.dumps(report, indent=2)),
+            ["NEG-000010", "NEG-000020"],
+        )
+        compact = json.dumps({"schema": MODULE.RECONCILE_SCHEMA, **report})
+        self.assertEqual(
+            MODULE.reconcile_eligible_ids(compact), ["NEG-000010", "NEG-000020"]
+        )
+
+    def test_summary_only_reconcile_stream_has_no_ids(self) -> None:
+        summary = {
+            "schema": MODULE.RECONCILE_SCHEMA,
+            "sources": {"negative-ledger": {"canonical_records": 0, "counts": {}}},
+        }
+        self.assertEqual(MODULE.reconcile_eligible_ids(json.dumps(summary) + "\n"), [])
+        with self.assertRaisesRegex(MODULE.AdapterError, "no negative-ledger records"):
+            MODULE.reconcile_eligible_ids(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import contextlib
 import importlib.util
+import io
+import json
+import os
 import sys
+import tempfile
+import time
 import unittest
 from pathlib import Path
+from unittest import mock
 
 SCRIPT = Path(__file__).resolve().parents[1] / "scripts/source-memory-reconcile.py"
 SPEC = importlib.util.spec_from_file_location("source_memory_reconcile", SCRIPT)
@@ -11,6 +18,16 @@ assert SPEC is not None and SPEC.loader is not None
 MODULE = importlib.util.module_from_spec(SPEC)
 sys.modules[SPEC.name] = MODULE
 SPEC.loader.exec_module(MODULE)
+ADAPTER = MODULE.load_synesthesia_adapter(
+    SCRIPT.parent / "synesthesia_memory_note.py"
+)
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+STUB_SPEC = importlib.util.spec_from_file_location(
+    "reconcile_stub", FIXTURES / "reconcile_stub.py"
+)
+assert STUB_SPEC is not None and STUB_SPEC.loader is not None
+reconcile_stub = importlib.util.module_from_spec(STUB_SPEC)
+STUB_SPEC.loader.exec_module(reconcile_stub)
 
 
 class CompiledCorpusTests(unittest.TestCase):
@@ -43,6 +60,74 @@ class CompiledCorpusTests(unittest.TestCase):
         self.assertEqual(row["phase2_status"], "unknown")
         self.assertIsNone(row["compiled_memory_visible"])
 
+    def test_mapped_corpus_matches_exact_tokens_at_byte_level(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            memories = Path(root) / "memories"
+            (memories / "skills/nested").mkdir(parents=True)
+            (memories / "MEMORY.md").write_text("See NEG-000001.\n")
+            (memories / "skills/nested/notes.md").write_bytes(
+                b"\xff not utf-8 MSN-1 \xfe"
+            )
+            (memories / "skills/empty.md").write_bytes(b"")
+            with ADAPTER.load_compiled_corpus(Path(root)) as corpus:
+                self.assertEqual(len(corpus), 3)
+                self.assertEqual(corpus.unreadable, [])
+                self.assertTrue(MODULE.contains_token(corpus, "NEG-000001"))
+                self.assertTrue(MODULE.contains_token(corpus, "MSN-1"))
+                self.assertFalse(MODULE.contains_token(corpus, "NEG-00000"))
+
+            (memories / "skills/added.md").write_text("NEG-000002")
+            with ADAPTER.load_compiled_corpus(Path(root)) as corpus:
+                self.assertTrue(MODULE.contains_token(corpus, "NEG-000002"))
+
+    def test_documents_beyond_the_map_budget_are_mapped_per_scan(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            skills = Path(root) / "memories/skills"
+            skills.mkdir(parents=True)
+            for index in range(6):
+                (skills / f"skill-{index}.md").write_text(f"NEG-00000{index}\n")
+            with mock.patch.object(ADAPTER, "MAX_OPEN_MAPS", 2):
+                corpus = ADAPTER.load_compiled_corpus(Path(root))
+            with corpus:
+                self.assertEqual((len(corpus), corpus.unreadable), (6, []))
+                self.assertEqual(sum(buffer is not None for buffer in corpus._buffers), 2)
+                self.assertTrue(MODULE.contains_token(corpus, "NEG-000005"))
+                self.assertEqual(corpus.terms_in(4, [b"NEG-000004", b"NEG-000001"]), [0])
+            self.assertEqual(len(corpus), 0)
+
+
+    def test_visible_tokens_map_each_document_once_per_batch(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            skills = Path(root) / "memories/skills"
+            skills.mkdir(parents=True)
+            for index in range(6):
+                (skills / f"skill-{index}.md").write_text(
+                    f"NEG-00000{index} and NEG-10x, see a.b\n"
+                )
+            with mock.patch.object(ADAPTER, "MAX_OPEN_MAPS", 2):
+                corpus = ADAPTER.load_compiled_corpus(Path(root))
+            values = [f"NEG-00000{index}" for index in range(3, 9)]
+            with corpus, mock.patch.object(
+                ADAPTER, "_map_file", side_effect=ADAPTER._map_file
+            ) as mapped:
+                found = MODULE.visible_tokens(corpus, [*values, "NEG-10", None])
+                self.assertEqual(found, {"NEG-000003", "NEG-000004", "NEG-000005"})
+                self.assertEqual(mapped.call_count, 4)
+                self.assertEqual(MODULE.visible_tokens(corpus, ["a.b", "b.c"]), {"a.b"})
+
+    def test_precomputed_tokens_decide_visibility(self) -> None:
+        row = MODULE.classify_record(
+            record_id="NEG-000001",
+            note={"id": "MSN-1", "fingerprint": "abc"},
+            expected_fingerprint="abc",
+            export_error=None,
+            eligibility=None,
+            compiled_corpus=[],
+            unreadable_phase2=[],
+            compiled_tokens={"MSN-1"},
+        )
+        self.assertEqual(row["phase2_status"], "visible")
+
 
 class RepositoryIdentityTests(unittest.TestCase):
     def test_normalizes_git_remote_forms_to_owner_repo(self) -> None:
@@ -101,5 +186,536 @@ class InventoryTests(unittest.TestCase):
         self.assertFalse(MODULE.inventory_is_truncated({}, 9, 10))
 
 
+class StreamingReportTests(unittest.TestCase):
+    def test_emitted_rows_are_not_retained(self) -> None:
+        emitted: list[dict[str, object]] = []
+        report = MODULE.source_report(
+            "learnings",
+            [{"id": "LRN-1"}, {"id": "LRN-2"}],
+            [],
+            ledger="ledger",
+            cwd=Path("."),
+            eligibility={},
+            compiled_corpus=[],
+            unreadable_phase2=[],
+            synesthesia_adapter=None,
+            repository_identity="tkersey/dotfiles",
+            standalone_note_ids=set(),
+            fallback_show_count=0,
+            emit=emitted.append,
+        )
+        self.assertNotIn("records", report)
+        self.assertEqual(report["canonical_records"], 2)
+        self.assertEqual(report["counts"]["needs-source-review"], 2)
+        self.assertEqual([row["record_id"] for row in emitted], ["LRN-1", "LRN-2"])
+        self.assertEqual(
+            {row["schema"] for row in emitted}, {MODULE.RECORD_SCHEMA}
+        )
+        self.assertEqual({row["source"] for row in emitted}, {"learnings"})
+
+
+class StubStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        self.repo = Path(self.root.name) / "repo"
+        self.home = Path(self.root.name) / "codex-home"
+        self.repo.mkdir()
+        (self.home / "memories").mkdir(parents=True)
+        reconcile_stub.write_synesthesia_notes(self.home, 6)
+        self.directory = reconcile_stub.synesthesia_notes_directory(self.home)
+        environment = mock.patch.dict(
+            os.environ,
+            {
+                "LEDGER_BIN": str(FIXTURES / "bin/ledger"),
+                "MEMORY_NOTE_BIN": str(FIXTURES / "bin/memory-note"),
+                "RECONCILE_STUB_RECORDS": "6",
+                "SYNESTHESIA_DIGEST_QUIET_SEC": "0",
+                "SYNESTHESIA_DIGEST_MAX_DELAY_SEC": "5",
+            },
+        )
+        environment.start()
+        self.addCleanup(environment.stop)
+
+    def reconcile(self, *extra: str, **kwargs: object) -> dict[str, object]:
+        args = MODULE.build_parser().parse_args(
+            ["--repo", str(self.repo), "--codex-home", str(self.home), *extra]
+        )
+        return MODULE.reconcile(args, **kwargs)
+
+    def add_note(self, note_id: str, captured_at: str, **fields: object) -> None:
+        template = json.loads(next(iter(sorted(self.directory.glob("*.md")))).read_bytes())
+        note = {**template, "id": note_id, "captured_at": captured_at, **fields}
+        (self.directory / f"{note_id}.md").write_bytes(ADAPTER.canonical_json_bytes(note))
+
+    def project(self) -> tuple[dict[str, object], int]:
+        state = ADAPTER.ProjectionState.open(self.home)
+        with mock.patch.object(
+            ADAPTER, "_fold_note", side_effect=ADAPTER._fold_note
+        ) as fold:
+            projection = ADAPTER.build_digest_projection(self.home, projection_state=state)
+        state.save()
+        return projection, fold.call_count
+
+    def summary(self, projection: dict[str, object]) -> object:
+        return (
+            [(row["root_id"], row["state"]) for row in projection["active_mappings"]],
+            [(row["root_id"], row["state"]) for row in projection["inactive_entries"]],
+            projection["unresolved_events"],
+        )
+
+    def shard_index(self) -> dict[str, object]:
+        return json.loads((ADAPTER.shards_directory(self.home) / "index.json").read_bytes())
+
+    def test_reconciles_synthesized_stores(self) -> None:
+        report = self.reconcile()
+        self.assertEqual(report["verdict"], "ok")
+        for source in MODULE.SOURCES:
+            counts = report["sources"][source]["counts"]
+            self.assertEqual(report["sources"][source]["canonical_records"], 6)
+            self.assertEqual(counts["admitted"], 5, source)
+            self.assertEqual(counts["phase2-lag"], 5, source)
+            self.assertEqual(report["sources"][source]["orphan_note_ids"], [])
+
+    def test_streamed_rows_match_buffered_rows(self) -> None:
+        buffered = self.reconcile()
+        emitted: list[dict[str, object]] = []
+        streamed = self.reconcile(emit=emitted.append)
+        for source in MODULE.SOURCES:
+            rows = [
+                {key: value for key, value in row.items() if key not in ("schema", "source")}
+                for row in emitted
+                if row["source"] == source
+            ]
+            self.assertEqual(rows, buffered["sources"][source]["records"])
+            self.assertEqual(
+                streamed["sources"][source]["counts"],
+                buffered["sources"][source]["counts"],
+            )
+
+    def test_timings_account_for_every_subprocess(self) -> None:
+        self.assertNotIn("timings", self.reconcile())
+        timings = self.reconcile("--timings")["timings"]
+        self.assertTrue(
+            {"doctors", "list", "records", "exports", "adapter-validation", "classification"}
+            <= set(timings["stages"])
+        )
+        # 3 ledger doctors, 3 index projections, 5 learnings exports,
+        # 6 negative-ledger and 6 synesthesia exports; 1 definition check,
+        # 6 synesthesia submissions and 5 stored notes validated by the adapter.
+        self.assertEqual(timings["binaries"]["ledger"]["invocations"], 35)
+        self.assertEqual(timings["binaries"]["memory-note"]["invocations"], 4)
+        self.assertGreater(timings["binaries"]["ledger"]["bytes_read"], 0)
+        slowest = timings["slowest_invocations"]
+        self.assertEqual(len(slowest), MODULE.SLOWEST_INVOCATIONS)
+        self.assertEqual(
+            [row["wall_sec"] for row in slowest],
+            sorted((row["wall_sec"] for row in slowest), reverse=True),
+        )
+
+    def test_cached_verdicts_skip_stored_note_validation(self) -> None:
+        cache_path = (
+            self.home / "memories/extensions/synesthesia/resources/.validation-cache.json"
+        )
+        ADAPTER.generate_memory_digest(self.home)
+        self.assertTrue(cache_path.is_file())
+        before = cache_path.read_bytes()
+        timings = self.reconcile("--timings")["timings"]
+        self.assertEqual(timings["binaries"]["ledger"]["invocations"], 30)
+        self.assertEqual(cache_path.read_bytes(), before)
+
+    def test_batched_validation_maps_verdicts_back_to_notes(self) -> None:
+        directory = reconcile_stub.synesthesia_notes_directory(self.home)
+        paths = sorted(directory.glob("*.md"))
+        rejected = paths[1].stem
+        (directory / "MSN-0-broken.md").write_text("{")
+        run_process = ADAPTER._run_process
+
+        def reject_one(argv: list[str], **kwargs: object) -> object:
+            proc = run_process(argv, **kwargs)
+            if rejected.encode() in kwargs.get("input", b""):
+                result = json.loads(proc.stdout)
+                result.update(valid=False, errors=[{"message": "rejected"}])
+                proc.stdout = json.dumps(result).encode()
+            return proc
+
+        with mock.patch.object(ADAPTER, "_run_process", side_effect=reject_one):
+            notes, invalid, _, total = ADAPTER.load_stored_notes(self.home)
+        self.assertEqual(total, len(paths) + 1)
+        self.assertEqual(len(notes), len(paths) - 1)
+        self.assertNotIn(rejected, {note.id for note in notes})
+        self.assertEqual(
+            [Path(row["path"]).stem for row in invalid], ["MSN-0-broken", rejected]
+        )
+        self.assertIn("rejected", invalid[1]["error"])
+
+    def test_validator_os_error_marks_pending_notes_invalid(self) -> None:
+        with mock.patch.object(
+            ADAPTER, "_validate_stored_batch", side_effect=OSError(28, "No space left")
+        ):
+            notes, invalid, _, total = ADAPTER.load_stored_notes(self.home)
+        self.assertEqual((notes, len(invalid)), ([], total))
+        self.assertTrue(all("No space left" in row["error"] for row in invalid))
+
+    def test_pooled_loading_matches_serial_loading(self) -> None:
+        (reconcile_stub.synesthesia_notes_directory(self.home) / "MSN-0-broken.md").write_bytes(
+            b"\xff"
+        )
+        results = []
+        for workers in (1, 4):
+            with mock.patch.multiple(ADAPTER, LOAD_WORKERS=workers, VALIDATION_WORKERS=workers):
+                notes, invalid, fingerprint, total = ADAPTER.load_stored_notes(self.home)
+            results.append(([note.id for note in notes], invalid, fingerprint, total))
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(len(results[0][0]), 5)
+        self.assertIsNotNone(results[0][1][0]["file_sha256"])
+
+    def test_definition_change_invalidates_cached_verdicts(self) -> None:
+        ADAPTER.generate_memory_digest(self.home)
+        self.assertEqual(len(ADAPTER.ValidationCache.open(self.home, "sha256:old")), 0)
+
+    def test_cache_keys_verdicts_by_profile_and_keeps_rejections(self) -> None:
+        cache = ADAPTER.ValidationCache.open(self.home, "sha256:definition")
+        rejection = ADAPTER.StructuralRejection("structurally invalid under x@y: bad")
+        cache.record("a" * 64, "stored-v1")
+        cache.record("b" * 64, "stored-v1", rejection)
+        cache.save()
+        cache = ADAPTER.ValidationCache.open(self.home, "sha256:definition")
+        self.assertEqual(cache.lookup("a" * 64, "stored-v1"), (True, None))
+        self.assertEqual(cache.lookup("a" * 64, "stored-legacy-corridor-v1"), (False, None))
+        hit, cached = cache.lookup("b" * 64, "stored-v1")
+        self.assertTrue(hit)
+        self.assertEqual(str(cached), str(rejection))
+
+    def test_doctor_reuses_cached_verdicts(self) -> None:
+        ADAPTER.generate_memory_digest(self.home)
+        validations: list[list[str]] = []
+        run_process = ADAPTER._run_process
+
+        def observe(argv: list[str], **kwargs: object) -> object:
+            if argv[1:2] == ["validate"]:
+                validations.append(argv)
+            return run_process(argv, **kwargs)
+
+        with mock.patch.object(ADAPTER, "_run_process", side_effect=observe):
+            report = ADAPTER.doctor(self.home, self.repo)
+        self.assertEqual(validations, [])
+        self.assertEqual(report["synesthesia_memory_doctor"]["notes"]["valid_count"], 5)
+
+    def test_appended_notes_fold_on_saved_state(self) -> None:
+        _, folded = self.project()
+        self.assertEqual(folded, 5)
+        _, folded = self.project()
+        self.assertEqual(folded, 0)
+        root = sorted(self.directory.glob("*.md"))[0].stem
+        self.add_note(
+            "MSN-20260102T000000Z-confirm", "2026-01-02T00:00:00Z",
+            operation="confirm", related_ids=[root],
+        )
+        self.add_note(
+            "MSN-20260102T000001Z-orphan", "2026-01-02T00:00:01Z",
+            operation="retract", related_ids=["MSN-missing"],
+        )
+        incremental, folded = self.project()
+        self.assertEqual(folded, 2)
+        replayed = ADAPTER.build_digest_projection(self.home)
+        self.assertEqual(self.summary(incremental), self.summary(replayed))
+        self.assertEqual(len(incremental["unresolved_events"]), 1)
+
+    def test_backdated_note_replays_from_scratch(self) -> None:
+        self.project()
+        self.add_note("MSN-20251231T000000Z-early", "2025-12-31T00:00:00Z")
+        _, folded = self.project()
+        self.assertEqual(folded, 6)
+
+    def test_changed_generator_or_definition_replays_from_scratch(self) -> None:
+        self.project()
+        for key in ("generator_sha256", "definition_sha256"):
+            with self.subTest(key=key):
+                generator = {**ADAPTER._digest_generator_key(), key: "sha256:other"}
+                with mock.patch.object(
+                    ADAPTER, "_digest_generator_key", return_value=generator
+                ):
+                    _, folded = self.project()
+                self.assertEqual(folded, 5)
+                _, folded = self.project()
+                self.assertEqual(folded, 5)
+
+    def test_unchanged_listing_reports_current_without_projection(self) -> None:
+        self.assertEqual(ADAPTER.generate_memory_digest(self.home)["status"], "written")
+        with mock.patch.object(ADAPTER, "build_digest_projection") as build:
+            result = ADAPTER.generate_memory_digest(self.home)
+        build.assert_not_called()
+        self.assertEqual(result["status"], "current")
+        self.assertEqual(result["source_notes"], 5)
+
+        path = sorted(self.directory.glob("*.md"))[0]
+        stamp = path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(path, ns=(stamp, stamp))
+        with mock.patch.object(
+            ADAPTER, "build_digest_projection", side_effect=ADAPTER.build_digest_projection
+        ) as build:
+            self.assertEqual(ADAPTER.generate_memory_digest(self.home)["status"], "current")
+        build.assert_called_once()
+
+    def test_edited_digest_misses_the_manifest(self) -> None:
+        ADAPTER.generate_memory_digest(self.home)
+        digest = ADAPTER.default_digest_path(self.home)
+        digest.write_text(digest.read_text() + "\n")
+        self.assertEqual(ADAPTER.generate_memory_digest(self.home)["status"], "written")
+
+    def test_streamed_digest_matches_rendered_text(self) -> None:
+        result = ADAPTER.generate_memory_digest(self.home, generated_at="2026-01-03T00:00:00Z")
+        projection = ADAPTER.build_digest_projection(self.home)
+        chunks = list(ADAPTER.iter_memory_digest(projection, result["generated_at"]))
+        self.assertGreater(len(chunks), 5)
+        rendered = ADAPTER.render_memory_digest(projection, result["generated_at"])
+        self.assertEqual("".join(chunks), rendered)
+        self.assertEqual(
+            ADAPTER.default_digest_path(self.home).read_bytes(), rendered.encode("utf-8")
+        )
+        self.assertEqual(ADAPTER.inspect_digest(self.home, projection)["status"], "current")
+
+    def test_definition_check_runs_once_per_process(self) -> None:
+        ADAPTER._VALIDATOR_SESSIONS.clear()
+        commands: list[list[str]] = []
+        run_process = ADAPTER._run_process
+
+        def observe(argv: list[str], **kwargs: object) -> object:
+            commands.append(argv[1:3])
+            return run_process(argv, **kwargs)
+
+        with mock.patch.object(ADAPTER, "_run_process", side_effect=observe):
+            ADAPTER.generate_memory_digest(self.home)
+            ADAPTER.generate_memory_digest(self.home, force=True)
+            ADAPTER.doctor(self.home, Path(self.root.name))
+            ADAPTER.validate_and_normalize(
+                "mapping-endorsement", reconcile_stub.export_payload("synesthesia", 1)
+            )
+        self.assertEqual(commands.count(["definition", "check"]), 1)
+        self.assertEqual(len(ADAPTER._VALIDATOR_SESSIONS), 1)
+
+    def test_verdict_for_another_definition_is_rejected(self) -> None:
+        session = ADAPTER.validator_session()
+        session.check_definition()
+        with mock.patch.object(
+            ADAPTER.ValidatorSession, "_expected_digest", return_value="sha256:other"
+        ), self.assertRaisesRegex(ADAPTER.ValidationError, "digest changed"):
+            session.validate({"source": {}})
+
+    def spawn_in_process(self, home: Path, worker_lock: int) -> int:
+        """Stand in for the detached worker by keeping the worker lock held."""
+        self.worker_lock = os.dup(worker_lock)
+        self.addCleanup(self.run_worker, refresh=False)
+        return os.getpid()
+
+    def run_worker(self, refresh: bool = True) -> dict[str, object] | None:
+        """Run the refresh as the stand-in worker, handing over its lock."""
+        worker_lock = self.__dict__.pop("worker_lock", None)
+        if refresh:
+            return ADAPTER.run_digest_refresh(self.home, worker_lock)
+        if worker_lock is not None:
+            os.close(worker_lock)
+        return None
+
+    def test_burst_of_appends_schedules_one_worker(self) -> None:
+        with mock.patch.object(
+            ADAPTER, "_spawn_digest_refresh", side_effect=self.spawn_in_process
+        ) as spawn:
+            statuses = [ADAPTER.schedule_digest_refresh(self.home)["status"] for _ in range(3)]
+        spawn.assert_called_once()
+        self.assertEqual(statuses, ["scheduled", "coalesced", "coalesced"])
+        with mock.patch.object(
+            ADAPTER, "generate_memory_digest", side_effect=ADAPTER.generate_memory_digest
+        ) as generate:
+            self.assertEqual(self.run_worker()["status"], "written")
+        generate.assert_called_once_with(self.home)
+        self.assertIsNone(ADAPTER.run_digest_refresh(self.home))
+
+    def test_append_during_refresh_runs_another_pass(self) -> None:
+        generate = ADAPTER.generate_memory_digest
+        with mock.patch.object(
+            ADAPTER, "_spawn_digest_refresh", side_effect=self.spawn_in_process
+        ):
+            ADAPTER.schedule_digest_refresh(self.home)
+
+            def append_midway(home: Path) -> dict[str, object]:
+                if not calls:
+                    self.add_note("MSN-20260102T000000Z-late", "2026-01-02T00:00:00Z")
+                    ADAPTER.schedule_digest_refresh(home)
+                calls.append(home)
+                return generate(home)
+
+            calls: list[Path] = []
+            with mock.patch.object(ADAPTER, "generate_memory_digest", side_effect=append_midway):
+                result = self.run_worker()
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(result["source_notes"], 6)
+        self.assertIsNone(ADAPTER._read_dirty_marker(self.home))
+
+    def test_append_after_the_final_marker_clear_spawns_a_worker(self) -> None:
+        # Append right after the worker's last queue-lock release, while it
+        # is still running: its worker lock must already be free.
+        queue_lock = ADAPTER._resource_lock
+        statuses: list[str] = []
+
+        @contextlib.contextmanager
+        def append_after_release(home: Path, name: str):
+            with queue_lock(home, name):
+                yield
+            if (
+                name == ADAPTER.DIGEST_QUEUE_LOCK_FILENAME
+                and not statuses
+                and ADAPTER._read_dirty_marker(home) is None
+            ):
+                statuses.append(ADAPTER.schedule_digest_refresh(home)["status"])
+
+        with mock.patch.object(
+            ADAPTER, "_spawn_digest_refresh", side_effect=self.spawn_in_process
+        ) as spawn:
+            ADAPTER.schedule_digest_refresh(self.home)
+            with mock.patch.object(ADAPTER, "_resource_lock", side_effect=append_after_release):
+                self.run_worker()
+        self.assertEqual(statuses, ["scheduled"])
+        self.assertEqual(spawn.call_count, 2)
+
+    def test_exited_worker_is_replaced_despite_a_live_pid(self) -> None:
+        # The recorded pid (this process) stays alive, but the worker that
+        # held the lock is gone, so the next append must spawn a new one.
+        with mock.patch.object(
+            ADAPTER, "_spawn_digest_refresh", return_value=os.getpid()
+        ) as spawn:
+            statuses = [ADAPTER.schedule_digest_refresh(self.home)["status"] for _ in range(2)]
+        self.assertEqual(statuses, ["scheduled", "scheduled"])
+        self.assertEqual(spawn.call_count, 2)
+
+    def test_detached_worker_refreshes_the_digest(self) -> None:
+        self.assertEqual(ADAPTER.schedule_digest_refresh(self.home)["status"], "scheduled")
+        digest = ADAPTER.default_digest_path(self.home)
+        for _ in range(200):
+            if ADAPTER._read_dirty_marker(self.home) is None and digest.exists():
+                break
+            time.sleep(0.05)
+        self.assertTrue(digest.exists())
+        self.assertIsNone(ADAPTER._read_dirty_marker(self.home))
+
+    def test_shard_keys_follow_scope_specificity(self) -> None:
+        self.assertEqual(ADAPTER.digest_shard_key({"kind": "tool", "repo": None}), "global")
+        self.assertEqual(
+            ADAPTER.digest_shard_key({"kind": "repo", "repo": "o/r"}), "repo:o/r"
+        )
+        self.assertEqual(
+            ADAPTER.digest_shard_key(
+                {"kind": "path-family", "repo": "o/r", "paths": ["src/a", "src/b/c"]}
+            ),
+            "repo:o/r:path:src",
+        )
+        self.assertEqual(
+            ADAPTER.digest_shard_key(
+                {"kind": "path-family", "repo": "o/r", "paths": ["src/a", "docs"]}
+            ),
+            "repo:o/r",
+        )
+
+    def test_append_rewrites_only_the_affected_shard(self) -> None:
+        scope = {"kind": "repo", "repo": "tkersey/dotfiles", "paths": []}
+        self.add_note("MSN-20260102T000000Z-repo", "2026-01-02T00:00:00Z", scope=scope)
+        ADAPTER.generate_memory_digest(self.home)
+        before = {row["key"]: row for row in self.shard_index()["shards"]}
+        self.assertEqual(set(before), {"global", "repo:tkersey/dotfiles"})
+        self.assertEqual(before["global"]["active_mappings"], 5)
+
+        self.add_note("MSN-20260103T000000Z-repo", "2026-01-03T00:00:00Z", scope=scope)
+        with mock.patch.object(
+            ADAPTER, "iter_memory_digest", side_effect=ADAPTER.iter_memory_digest
+        ) as render:
+            ADAPTER.generate_memory_digest(self.home)
+        self.assertEqual(
+            [call.kwargs.get("shard") for call in render.call_args_list],
+            [None, "repo:tkersey/dotfiles"],
+        )
+        after = {row["key"]: row for row in self.shard_index()["shards"]}
+        self.assertEqual(after["global"], before["global"])
+        self.assertEqual(after["repo:tkersey/dotfiles"]["active_mappings"], 2)
+
+        relevant = ADAPTER.relevant_shards(self.home, "tkersey/dotfiles")
+        self.assertEqual([row["key"] for row in relevant], ["repo:tkersey/dotfiles", "global"])
+        self.assertEqual(
+            [row["key"] for row in ADAPTER.relevant_shards(self.home, "other/repo")], ["global"]
+        )
+        text = Path(relevant[0]["path"]).read_text()
+        self.assertIn("shard: repo:tkersey/dotfiles", text)
+        self.assertIn(after["repo:tkersey/dotfiles"]["source_fingerprint"], text)
+
+    def test_queries_answer_from_the_index(self) -> None:
+        root = sorted(self.directory.glob("*.md"))[0].stem
+        self.add_note(
+            "MSN-20260102T000000Z-confirm", "2026-01-02T00:00:00Z",
+            operation="confirm", related_ids=[root],
+        )
+        self.add_note(
+            "MSN-20260103T000000Z-orphan", "2026-01-03T00:00:00Z",
+            operation="retract", related_ids=["MSN-missing"],
+        )
+        with contextlib.closing(ADAPTER.open_lineage_index(self.home)) as connection:
+            lineage = ADAPTER.query_lineage(connection, "MSN-20260102T000000Z-confirm")
+            self.assertEqual(lineage["root_id"], root)
+            self.assertEqual(lineage["state"], "confirmed")
+            self.assertEqual(
+                [event["operation"] for event in lineage["events"]], ["assert", "confirm"]
+            )
+            active = ADAPTER.query_active(connection, scope_kind="global", category="mapping")
+            self.assertEqual(len(active), 5)
+            self.assertEqual(ADAPTER.query_active(connection, scope_repo="tkersey/dotfiles"), [])
+            self.assertEqual(
+                [row["id"] for row in ADAPTER.query_unresolved(connection, since="2026-01-03")],
+                ["MSN-20260103T000000Z-orphan"],
+            )
+            self.assertEqual(ADAPTER.query_unresolved(connection, since="2026-01-04"), [])
+            with self.assertRaises(ADAPTER.ValidationError):
+                ADAPTER.query_lineage(connection, "MSN-20260103T000000Z-orphan")
+
+    def test_index_is_reused_until_the_listing_changes(self) -> None:
+        (self.directory / "MSN-z-broken.md").write_text("{")
+        ADAPTER.open_lineage_index(self.home).close()
+        with mock.patch.object(ADAPTER, "build_digest_projection") as build:
+            ADAPTER.open_lineage_index(self.home).close()
+        build.assert_not_called()
+        self.add_note("MSN-20260102T000000Z-late", "2026-01-02T00:00:00Z")
+        with mock.patch.object(
+            ADAPTER, "build_digest_projection", side_effect=ADAPTER.build_digest_projection
+        ) as build, contextlib.closing(ADAPTER.open_lineage_index(self.home)) as connection:
+            self.assertEqual(len(ADAPTER.query_active(connection)), 6)
+        build.assert_called_once()
+
+    def test_index_built_during_a_validator_failure_is_rebuilt(self) -> None:
+        with mock.patch.object(
+            ADAPTER, "_validate_stored_batch", side_effect=OSError(28, "No space left")
+        ), contextlib.closing(ADAPTER.open_lineage_index(self.home)) as connection:
+            self.assertEqual(ADAPTER.query_active(connection), [])
+        with mock.patch.object(
+            ADAPTER, "build_digest_projection", side_effect=ADAPTER.build_digest_projection
+        ) as build, contextlib.closing(ADAPTER.open_lineage_index(self.home)) as connection:
+            self.assertEqual(len(ADAPTER.query_active(connection)), 5)
+        build.assert_called_once()
+
+    def test_active_subcommand_prints_json(self) -> None:
+        args = ADAPTER.build_parser().parse_args(
+            ["active", "--codex-home", str(self.home), "--category", "boundary"]
+        )
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            self.assertEqual(args.func(args), 0)
+        self.assertEqual(json.loads(stdout.getvalue()), {"synesthesia_active": []})
+
+    def test_index_database_error_is_reported_cleanly(self) -> None:
+        argv = ["synesthesia_memory_note.py", "active", "--codex-home", str(self.home)]
+        with mock.patch.object(sys, "argv", argv), mock.patch.object(
+            ADAPTER, "open_lineage_index", side_effect=ADAPTER.sqlite3.DatabaseError("malformed")
+        ), mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            self.assertEqual(ADAPTER.main(), 3)
+        error = json.loads(stderr.getvalue())["synesthesia_memory_note"]
+        self.assertEqual(error, {"verdict": "fail", "error": "malformed"})
+
+
 if __name__ == "__main__":
     unittest.main()